@@ -15,6 +15,8 @@ bl_info = {
     "category": "Node",
 }
 
+import time
+
 import bpy
 from bpy.props import (
     BoolProperty,
@@ -25,6 +27,9 @@ from bpy.props import (
 from . import operators, preferences, interface, node_switch_menu
 modules = (operators, preferences, interface, node_switch_menu)
 
+# module name -> seconds its register() took, printed when Blender runs with --debug-python
+register_times = {}
+
 def register():
     # props
     bpy.types.Scene.NWBusyDrawing = StringProperty(
@@ -48,8 +53,15 @@ def register():
         default=False,
         description="An internal property used to determine if a socket is generated by the addon")
 
+    register_times.clear()
     for module in modules:
+        start = time.perf_counter()
         module.register()
+        register_times[module.__name__] = time.perf_counter() - start
+
+    if bpy.app.debug_python:
+        for name, seconds in register_times.items():
+            print(f"Node Wrangler: {name}.register() took {seconds * 1000:.2f}ms")
 
 
 def unregister():
@@ -22,6 +22,9 @@ from .utils.constants import (
     boolean_operations_menu_dict
     )
 from .utils.nodes import get_nodes_links, fw_check, NWBase
+from .utils import attributes, prefetchers, viewer_saves
+from .node_switch_menu.utils import draw_switch_menu
+from .node_switch_menu.search import NWSwitchNodeTypeSearch
 from .addon_utils  import fetch_user_preferences
 import itertools
 
@@ -54,14 +57,7 @@ def drawlayout(context, layout, mode='non-panel'):
     col = layout.column(align=True)
     #col.menu(NWSwitchNodeTypeMenu.bl_idname, text="Switch Node Type")
     tree_type = context.space_data.tree_type
-    if tree_type == 'GeometryNodeTree':
-        col.menu("NODE_MT_geometry_node_switch_all")
-    elif tree_type == 'CompositorNodeTree':
-        col.menu("NODE_MT_compositor_node_switch_all")
-    elif tree_type == 'ShaderNodeTree':
-        col.menu("NODE_MT_shader_node_switch_all")
-    elif tree_type == 'TextureNodeTree':
-        col.menu("NODE_MT_texture_node_switch_all")
+    draw_switch_menu(col, tree_type)
 
     col.separator()
 
@@ -69,12 +65,15 @@ def drawlayout(context, layout, mode='non-panel'):
         col = layout.column(align=True)
         col.operator(operators.NWAddTextureSetup.bl_idname, text="Add Texture Setup", icon='NODE_SEL')
         col.operator(operators.NWAddPrincipledSetup.bl_idname, text="Add Principled Setup", icon='NODE_SEL')
+        col.operator(operators.NWAddPrincipledLibrarySetup.bl_idname, text="Add Principled from Library", icon='ASSET_MANAGER')
+        col.operator(operators.NWAddPrincipledBatchSetup.bl_idname, text="Batch Principled Materials", icon='MATERIAL')
         col.separator()
 
     col = layout.column(align=True)
     col.operator(operators.NWDetachOutputs.bl_idname, icon='UNLINKED')
     col.operator(operators.NWSwapLinks.bl_idname)
     col.menu(NWAddReroutesMenu.bl_idname, text="Add Reroutes", icon='LAYER_USED')
+    col.menu(NWExposeSocketsMenu.bl_idname, text="Expose Sockets")
     col.separator()
 
     col = layout.column(align=True)
@@ -101,6 +100,18 @@ def drawlayout(context, layout, mode='non-panel'):
         col.operator(operators.NWResetBG.bl_idname, icon='ZOOM_PREVIOUS')
     if tree_type != 'GeometryNodeTree':
         col.operator(operators.NWReloadImages.bl_idname, icon='FILE_REFRESH')
+        col.operator(operators.NWReloadImages.bl_idname, text="Reload Images in File").scope = 'FILE'
+        col.operator(operators.NWMergeDuplicateImages.bl_idname, icon='IMAGE_DATA')
+    if tree_type == 'ShaderNodeTree':
+        col.operator(operators.NWPackChannels.bl_idname, icon='IMAGE_RGB')
+    if mode == 'panel' and operators.NWPrefetchSequence.poll(context):
+        prefetcher = prefetchers.get_prefetcher(context, context.active_node)
+        if prefetcher is None:
+            col.operator(operators.NWPrefetchSequence.bl_idname, icon='SEQUENCE')
+        else:
+            box = col.box()
+            box.label(text=f"Prefetch: {prefetcher.hits} hits, {prefetcher.misses} misses ({prefetcher.hit_ratio():.0%})")
+            box.operator(operators.NWPrefetchSequence.bl_idname, text="Stop Prefetching", icon='CANCEL').stop = True
     col.separator()
 
     col = layout.column(align=True)
@@ -461,6 +472,19 @@ class NWAddReroutesMenu(Menu, NWBase):
         layout.operator(operators.NWAddReroutes.bl_idname, text="to Linked Outputs").option = 'LINKED'
 
 
+class NWExposeSocketsMenu(Menu, NWBase):
+    bl_idname = "NODE_MT_fw_expose_sockets_menu"
+    bl_label = "Expose Sockets"
+    bl_description = "Link the sockets of the selected nodes to new group or zone sockets"
+
+    def draw(self, context):
+        layout = self.layout
+        layout.operator(operators.NWExposeSockets.bl_idname, text="to Group Input").target = 'GROUP_INPUT'
+        layout.operator(operators.NWExposeSockets.bl_idname, text="to Group Output").target = 'GROUP_OUTPUT'
+        if context.space_data.tree_type == 'GeometryNodeTree':
+            layout.operator(operators.NWExposeSockets.bl_idname, text="through Active Zone").target = 'ZONE'
+
+
 class NWLinkActiveToSelectedMenu(Menu, NWBase):
     bl_idname = "NODE_MT_fw_link_active_to_selected_menu"
     bl_label = "Link Active to Selected"
@@ -535,42 +559,80 @@ class NWAttributeMenu(bpy.types.Menu):
         mat = context.object.active_material
         deps = context.evaluated_depsgraph_get()
 
+        # Thousands of objects and instances can share a mesh,
+        # so material use and attributes are only looked at once per datablock.
+        uses_material = {}
+        scanned_data = set()
+
         def is_valid(obj):
             mesh = obj.data
-            return hasattr(mesh, "materials") and hasattr(mesh, "attributes") and mat.name in mesh.materials
-        
+            if mesh is None:
+                return False
+            key = mesh.as_pointer()
+            valid = uses_material.get(key)
+            if valid is None:
+                valid = hasattr(mesh, "materials") and hasattr(mesh, "attributes") and mat.name in mesh.materials
+                uses_material[key] = valid
+            return valid
+
+        def data_attributes(obj):
+            key = obj.data.as_pointer()
+            if key in scanned_data:
+                return
+            scanned_data.add(key)
+            for attr in obj.data.attributes:
+                yield ("GEOMETRY", attr.name)
+
         valid_objects = tuple(obj for obj in deps.objects if is_valid(obj))
 
         for obj in valid_objects:
-            for attr in obj.data.attributes:
-                yield ("GEOMETRY", attr.name)
+            yield from data_attributes(obj)
+
+        valid_parents = {obj.as_pointer() for obj in valid_objects}
+        # Only instancers and objects with geometry nodes can add instances
+        remaining_parents = {obj.as_pointer() for obj in valid_objects
+                             if obj.is_instancer or any(m.type == 'NODES' for m in obj.modifiers)}
+
+        if remaining_parents:
+            for inst in deps.object_instances:
+                if not inst.is_instance:
+                    # The instances of an object directly follow it, once the last
+                    # valid parent has been walked no new datablocks can appear.
+                    if not remaining_parents:
+                        break
+                    continue
+
+                parent = inst.parent.as_pointer()
+                if parent not in valid_parents:
+                    continue
+                remaining_parents.discard(parent)
 
-        for inst in deps.object_instances:
-            if inst.is_instance and inst.parent in valid_objects:
                 obj = inst.object
                 if is_valid(obj):
-                    for attr in obj.data.attributes:
-                        yield ("GEOMETRY", attr.name)
+                    yield from data_attributes(obj)
 
+        scanned_trees = set()
         for obj in valid_objects:
             nodetrees = (m.node_group for m in obj.modifiers if m.type == 'NODES')
             for tree in nodetrees:
-                for node in getattr(tree, "nodes", []):
-                    if node.bl_label != "Store Named Attribute" or node.mute is True:
-                        continue
-
-                    attr_name = node.inputs["Name"].default_value
-                    if attr_name == "":
-                        continue
-                    
-                    domain = "INSTANCER" if node.domain == "INSTANCE" else "GEOMETRY"
+                if tree is None or tree.name_full in scanned_trees:
+                    continue
+                scanned_trees.add(tree.name_full)
+
+                for attr_name, domain, data_type in attributes.named_attributes(tree):
+                    domain = "INSTANCER" if domain == "INSTANCE" else "GEOMETRY"
                     yield (domain, attr_name)
 
 
     def draw(self, context):
         layout = self.layout
         row = layout.row()
-        attrs = sorted(list(set(self.fetch_attributes(context))), key=lambda x: (x[0], x[1].startswith("."), x[1]))
+
+        material = context.object.active_material
+        if material is not None:
+            attrs = attributes.cached_material_attributes(context, material, lambda: self.fetch_attributes(context))
+        else:
+            attrs = ()
 
         icon_dict = {
             'GEOMETRY': 'CUBE',
@@ -628,18 +690,14 @@ class NWNamedAttributeMenu(bpy.types.Menu):
         nodetrees = (m.node_group for m in obj.modifiers if m.type == 'NODES')
 
         for tree in nodetrees:
-            for node in getattr(tree, "nodes", []):
-                if node.bl_label != "Store Named Attribute" or node.mute is True:
-                    continue
-
-                attr_name = node.inputs["Name"].default_value
-                if attr_name == "":
-                    continue
+            if tree is None:
+                continue
 
-                is_instance = node.domain == 'INSTANCE'
+            for attr_name, domain, data_type in attributes.named_attributes(tree):
+                is_instance = domain == 'INSTANCE'
                 is_hidden = attr_name.startswith(".")
 
-                yield (attr_name, (is_instance, is_hidden, node.data_type))
+                yield (attr_name, (is_instance, is_hidden, data_type))
 
             if tree == active_tree:
                 break
@@ -708,7 +766,7 @@ class NWSwitchNodeTypeMenu(Menu, NWBase):
 
         if layout.operator_context == 'EXEC_REGION_WIN':
             layout.operator_context = 'INVOKE_REGION_WIN'
-            layout.operator("WM_OT_search_single_menu", text="Search...", icon='VIEWZOOM').menu_idname = self.bl_idname
+            layout.operator(NWSwitchNodeTypeSearch.bl_idname, text="Search...", icon='VIEWZOOM')
             layout.separator()
 
         layout.operator_context = 'INVOKE_REGION_WIN'
@@ -720,15 +778,7 @@ class NWSwitchNodeTypeMenu(Menu, NWBase):
         layout.operator_context = 'INVOKE_REGION_WIN'
 
         tree_type = context.space_data.tree_type
-        if tree_type == 'GeometryNodeTree':
-            layout.menu_contents("NODE_MT_geometry_node_switch_all")
-        elif tree_type == 'CompositorNodeTree':
-            layout.menu_contents("NODE_MT_compositor_node_switch_all")
-        elif tree_type == 'ShaderNodeTree':
-            layout.menu_contents("NODE_MT_shader_node_switch_all")
-        elif tree_type == 'TextureNodeTree':
-            layout.menu_contents("NODE_MT_texture_node_switch_all")
-        else:
+        if not draw_switch_menu(layout, tree_type, contents=True):
             layout.label(icon='WARNING', text="Switch Nodes not available in this editor.")
 
 #
@@ -774,6 +824,10 @@ def save_viewer_menu_func(self, context):
             if context.scene.node_tree.nodes.active:
                 if context.scene.node_tree.nodes.active.type == "VIEWER":
                     self.layout.operator(operators.NWSaveViewer.bl_idname, icon='FILE_IMAGE')
+                    if viewer_saves.queued_count():
+                        self.layout.label(text=f"Saving {viewer_saves.queued_count()} viewer images...", icon='TIME')
+                    if viewer_saves.last_error:
+                        self.layout.label(text=viewer_saves.last_error, icon='ERROR')
 
 
 def reset_nodes_button(self, context):
@@ -814,6 +868,7 @@ classes = (
     NWCopyToSelectedMenu,
     NWCopyLabelMenu,
     NWAddReroutesMenu,
+    NWExposeSocketsMenu,
     NWLinkActiveToSelectedMenu,
     NWLinkStandardMenu,
     NWLinkUseNodeNameMenu,
@@ -829,6 +884,8 @@ def register():
     for cls in classes:
         register_class(cls)
 
+    attributes.register()
+
     # menu items
     bpy.types.NODE_MT_select.append(select_parent_children_buttons)
     bpy.types.NODE_MT_category_shader_input.prepend(attr_nodes_menu_func)
@@ -842,6 +899,8 @@ def register():
 
 
 def unregister():
+    attributes.unregister()
+
     # menu items
     bpy.types.NODE_MT_select.remove(select_parent_children_buttons)
     bpy.types.NODE_MT_category_shader_input.remove(attr_nodes_menu_func)
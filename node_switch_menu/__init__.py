@@ -1,13 +1,14 @@
 # SPDX-FileCopyrightText: 2022-2023 Blender Authors
 #
 # SPDX-License-Identifier: GPL-2.0-or-later
-from . import compositor, geometry, shader, texture, utils
-modules = compositor, geometry, shader, texture, utils
+from . import compositor, geometry, shader, texture, search, utils
+tree_modules = compositor, geometry, shader, texture
 
 def register():
-    for module in modules:
-        module.register()
+    # Menu classes are only created when a node editor first shows their tree type
+    utils.register({module.tree_type: module.menus for module in tree_modules})
+    search.register()
 
 def unregister():
-    for module in modules:
-        module.unregister()
+    search.unregister()
+    utils.unregister()
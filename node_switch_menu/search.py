@@ -0,0 +1,171 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import bpy
+from bpy.types import Operator
+from bpy.props import StringProperty
+
+from ..utils.nodes import NWBase
+from ..utils.search import SearchIndex
+from .utils import resolve_items, switch_menu_tables, node_type_info
+
+
+# Extra search terms for node types, on top of their label and menu path
+ALIASES = {
+    "ShaderNodeMix": ("Blend", "Lerp", "Interpolate"),
+    "CompositorNodeMixRGB": ("Blend",),
+    "TextureNodeMixRGB": ("Blend",),
+    "ShaderNodeValToRGB": ("Gradient",),
+    "CompositorNodeValToRGB": ("Gradient",),
+    "FunctionNodeCompare": ("Equal", "Greater", "Less"),
+    "GeometryNodeSwitch": ("If", "Condition"),
+    "NodeReroute": ("Dot", "Wire"),
+    "GeometryNodeTransform": ("Move", "Rotate", "Scale"),
+}
+
+# Node properties whose values get their own search entries, like "Math > Add"
+PRESET_PROPERTIES = ("operation",)
+
+# tree type -> (SearchIndex, display string -> (node type, settings, poll))
+search_indices = {}
+
+
+def preset_settings(node_type):
+    """Yield (label, settings) for every value of the preset properties of node_type."""
+    bl_rna = bpy.types.Node.bl_rna_get_subclass(node_type)
+    if bl_rna is None:
+        return
+
+    for prop_name in PRESET_PROPERTIES:
+        prop = bl_rna.properties.get(prop_name)
+        if prop is None or prop.type != 'ENUM' or prop.is_enum_flag:
+            continue
+        for item in prop.enum_items:
+            yield item.name, ((prop_name, repr(item.identifier)),)
+
+
+def switch_entries(tree_type):
+    """
+    Yield (path, label, node type, settings, poll) for every node type in the switch menus
+    of tree_type, following submenus from the root menu.
+    """
+    menus = {menu.idname: menu for menu in switch_menu_tables.get(tree_type, ())}
+    if not menus:
+        return
+
+    root = next(iter(menus.values()))
+    stack = [((), root)]
+    while stack:
+        path, menu = stack.pop()
+        submenus = []
+        for kind, poll, data in resolve_items(menu.items):
+            if kind == 'NODE':
+                node_type, label, _translation_context, settings = data
+                yield path, label, node_type, settings, poll
+            elif kind == 'MENU' and data in menus:
+                submenus.append((path + (menus[data].label,), menus[data]))
+        stack.extend(reversed(submenus))
+
+    info = node_type_info("NodeReroute")
+    if info is not None:
+        yield ("Layout",), info[0], "NodeReroute", (), None
+
+
+def build_search_index(tree_type):
+    index_entries = []
+    lookup = {}
+
+    def add(path, label, node_type, settings, poll):
+        display = " > ".join(path + (label,))
+        if display in lookup:
+            return
+        lookup[display] = (node_type, settings, poll)
+        index_entries.append((label, path + ALIASES.get(node_type, ()), display))
+
+    seen = set()
+    for path, label, node_type, settings, poll in switch_entries(tree_type):
+        # Nodes listed in several menus are only indexed at their first location
+        if (node_type, settings) in seen:
+            continue
+        seen.add((node_type, settings))
+        add(path, label, node_type, settings, poll)
+
+        if not settings:
+            for preset_label, preset in preset_settings(node_type):
+                add(path + (label,), preset_label, node_type, preset, poll)
+
+    return SearchIndex(index_entries), lookup
+
+
+def get_search_index(tree_type):
+    """Return the search index of tree_type, it is built the first time it is needed."""
+    index = search_indices.get(tree_type)
+    if index is None:
+        index = build_search_index(tree_type)
+        search_indices[tree_type] = index
+    return index
+
+
+def search_node_types(self, context, edit_text):
+    index, lookup = get_search_index(context.space_data.tree_type)
+    results = []
+    for display in index.search(edit_text):
+        poll = lookup[display][2]
+        if poll is None or poll(context):
+            results.append(display)
+            if len(results) == NWSwitchNodeTypeSearch.max_results:
+                break
+    return results
+
+
+class NWSwitchNodeTypeSearch(Operator, NWBase):
+    """Search for a node type to switch the selected nodes to"""
+    bl_idname = "node.fw_switch_node_type_search"
+    bl_label = "Search Node Type"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    max_results = 50
+
+    query: StringProperty(
+        name="Node Type",
+        search=search_node_types,
+        search_options=set(),
+        options={'SKIP_SAVE'},
+    )
+
+    def draw(self, context):
+        self.layout.prop(self, "query", text="", icon='VIEWZOOM')
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        _index, lookup = get_search_index(context.space_data.tree_type)
+        entry = lookup.get(self.query)
+        if entry is None:
+            # Typed text that wasn't picked from the list, take the best match
+            results = search_node_types(self, context, self.query)
+            if not results:
+                self.report({'WARNING'}, f"No node type matches \"{self.query}\"")
+                return {'CANCELLED'}
+            entry = lookup[results[0]]
+
+        node_type, settings, _poll = entry
+        return bpy.ops.node.fw_swtch_node_type(
+            to_type=node_type,
+            settings=[{"name": name, "value": value} for name, value in settings])
+
+
+classes = (
+    NWSwitchNodeTypeSearch,
+)
+
+
+def register():
+    for cls in classes:
+        bpy.utils.register_class(cls)
+
+
+def unregister():
+    search_indices.clear()
+    for cls in classes:
+        bpy.utils.unregister_class(cls)
@@ -1,21 +1,68 @@
+import time
+from dataclasses import dataclass
+from functools import cache, partial
 
 import bpy
 from bpy.types import Menu
 from .. import operators
+from ..utils import groups
 from bpy.app.translations import (
     pgettext_iface as iface_,
     contexts as i18n_contexts,
 )
 
 
+@dataclass(frozen=True, slots=True)
+class SwitchItem:
+    """A node type entry that needs more than its idname."""
+    node_type: str
+    label: str = None
+    settings: tuple = ()
+    poll: callable = None
+
+
+@dataclass(frozen=True, slots=True)
+class Separator:
+    poll: callable = None
+
+
+@dataclass(frozen=True, slots=True)
+class Submenu:
+    idname: str
+
+
+@dataclass(frozen=True, slots=True)
+class SwitchMenu:
+    """
+    A switch menu as data. Items are node idnames, or SwitchItem, Separator
+    and Submenu entries.
+    """
+    idname: str
+    label: str
+    items: tuple
+    translation_context: str = None
+
+
+SEPARATOR = Separator()
+
+
+@cache
+def node_type_info(node_type):
+    """Return the (label, translation context) of a node type, None if it doesn't exist in this Blender."""
+    bl_rna = bpy.types.Node.bl_rna_get_subclass(node_type)
+    if bl_rna is None:
+        return None
+    return bl_rna.name, bl_rna.translation_context
+
+
 def switch_node_type(layout, node_type, *, label=None, poll=None):
     """Add a node type to a menu."""
-    bl_rna = bpy.types.Node.bl_rna_get_subclass(node_type)
+    info = node_type_info(node_type)
     if not label:
-        label = bl_rna.name if bl_rna else iface_("Unknown")
+        label = info[0] if info else iface_("Unknown")
 
     if poll is True or poll is None:
-        translation_context = bl_rna.translation_context if bl_rna else i18n_contexts.default
+        translation_context = info[1] if info else i18n_contexts.default
         props = layout.operator(operators.NWSwitchNodeType.bl_idname, text=label, text_ctxt=translation_context)
         props.to_type = node_type
         return props
@@ -36,20 +83,17 @@ class NODE_MT_NWSwitchNodes_category_group(Menu):
 
     @classmethod
     def valid_groups(cls, context):
-        node_tree = context.space_data.edit_tree
-        valid_groups = tuple(
-                group for group in context.blend_data.node_groups
-                if (group.bl_idname == node_tree.bl_idname and
-                    not group.contains_tree(node_tree) and
-                    not group.name.startswith('.')))
+        return groups.valid_groups(context.space_data.edit_tree)
 
-        return valid_groups
+    @staticmethod
+    def is_nodegroup(node_tree):
+        # Material, world and scene trees are embedded, node groups aren't
+        return node_tree is not None and not node_tree.is_embedded_data
 
     @classmethod
     def poll(cls, context):
-        is_nodegroup = context.space_data.edit_tree in context.blend_data.node_groups.values()
-        has_other_nodegroups = len(cls.valid_groups(context)) > 0
-        return is_nodegroup and has_other_nodegroups
+        node_tree = context.space_data.edit_tree
+        return cls.is_nodegroup(node_tree) and len(cls.valid_groups(context)) > 0
 
     @staticmethod
     def group_node_id(tree):
@@ -61,22 +105,181 @@ class NODE_MT_NWSwitchNodes_category_group(Menu):
         """Add items to the layout used for interacting with node groups."""
         space_node = context.space_data
         node_tree = space_node.edit_tree
-        all_node_groups = context.blend_data.node_groups
 
-        if node_tree in all_node_groups.values():
+        if self.is_nodegroup(node_tree):
             layout.separator()
             switch_node_type(layout, "NodeGroupInput")
             switch_node_type(layout, "NodeGroupOutput")
 
         if node_tree is not None:
-            groups = self.valid_groups(context)
-            if len(groups) > 0:
+            group_names = self.valid_groups(context)
+            if len(group_names) > 0:
                 layout.separator()
-                for group in groups:
-                    props = switch_node_type(layout, self.group_node_id(group.bl_idname), label=group.name)
+                group_node_type = self.group_node_id(node_tree.bl_idname)
+                for name in group_names:
+                    props = switch_node_type(layout, group_node_type, label=name)
                     ops = props.settings.add()
                     ops.name = "node_tree"
-                    ops.value = "bpy.data.node_groups[%r]" % group.name
+                    ops.value = "bpy.data.node_groups[%r]" % name
+
+
+def resolve_items(items):
+    """
+    Turn the items of a SwitchMenu into (kind, poll, data) entries that can be drawn
+    without any RNA lookups. Node entries hold (idname, label, translation context, settings).
+
+    Node types that don't exist in the running Blender are left out.
+    """
+    entries = []
+    for item in items:
+        if isinstance(item, str):
+            item = SwitchItem(item)
+
+        if isinstance(item, Submenu):
+            entries.append(('MENU', None, item.idname))
+        elif isinstance(item, Separator):
+            entries.append(('SEPARATOR', item.poll, None))
+        else:
+            info = node_type_info(item.node_type)
+            if info is None:
+                if bpy.app.debug_python:
+                    print(f"Node Wrangler: skipping unknown node type {item.node_type} in switch menus")
+                continue
+
+            label, translation_context = info
+            if item.label:
+                # Custom labels are translated on their own, not in the context of the node
+                label, translation_context = item.label, i18n_contexts.default
+            entries.append(('NODE', item.poll, (item.node_type, label, translation_context, item.settings)))
+    return tuple(entries)
+
+
+def draw_switch_entries(layout, context, entries):
+    operator = operators.NWSwitchNodeType.bl_idname
+    for kind, poll, data in entries:
+        if poll is not None and not poll(context):
+            continue
+
+        if kind == 'NODE':
+            node_type, label, translation_context, settings = data
+            props = layout.operator(operator, text=label, text_ctxt=translation_context)
+            props.to_type = node_type
+            for name, value in settings:
+                ops = props.settings.add()
+                ops.name = name
+                ops.value = value
+        elif kind == 'MENU':
+            layout.menu(data)
+        else:
+            layout.separator()
+
+
+def menu_class(menu):
+    """Create the Menu class that draws a SwitchMenu, its entries are resolved once here."""
+    entries = resolve_items(menu.items)
+
+    def draw(self, context):
+        draw_switch_entries(self.layout, context, entries)
+
+    attrs = {
+        "bl_idname": menu.idname,
+        "bl_label": menu.label,
+        "bl_options": {'SEARCH_ON_KEY_PRESS'},
+        "draw": draw,
+    }
+    if menu.translation_context is not None:
+        attrs["bl_translation_context"] = menu.translation_context
+    return type(menu.idname, (Menu,), attrs)
+
+
+#
+#  LAZY REGISTRATION
+#
+# The menus of a tree type are only registered the first time a node editor shows
+# that tree type, so sessions that never open a node editor don't pay for them.
+
+# tree type -> SwitchMenu table, the first menu is the root "Switch Node Type" menu
+switch_menu_tables = {}
+# tree type -> registered Menu classes
+registered_menus = {}
+# tree type -> timer callback that will register its menus
+pending_registrations = {}
+# tree type -> seconds spent creating and registering its menus
+registration_times = {}
+
+
+def root_menu_idname(tree_type):
+    menus = switch_menu_tables.get(tree_type)
+    return menus[0].idname if menus else None
+
+
+def ensure_switch_menus(tree_type):
+    """Register the switch menus of tree_type if needed, return whether they are available."""
+    if tree_type in registered_menus:
+        return True
+
+    menus = switch_menu_tables.get(tree_type)
+    if menus is None:
+        return False
+
+    start = time.perf_counter()
+    classes = [menu_class(menu) for menu in menus]
+    for cls in classes:
+        bpy.utils.register_class(cls)
+    registered_menus[tree_type] = classes
+    registration_times[tree_type] = time.perf_counter() - start
+
+    if bpy.app.debug_python:
+        print(f"Node Wrangler: registered {len(classes)} {tree_type} switch menus "
+              f"in {registration_times[tree_type] * 1000:.2f}ms")
+    return True
+
+
+def register_pending_menus(tree_type):
+    pending_registrations.pop(tree_type, None)
+    ensure_switch_menus(tree_type)
+
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'NODE_EDITOR':
+                area.tag_redraw()
+    return None
+
+
+def request_switch_menus(tree_type):
+    """
+    Schedule the registration of the switch menus of tree_type.
+
+    Classes can't be registered while drawing, so draw code defers it to a timer.
+    """
+    if (tree_type in registered_menus or tree_type in pending_registrations
+            or tree_type not in switch_menu_tables):
+        return
+
+    callback = partial(register_pending_menus, tree_type)
+    pending_registrations[tree_type] = callback
+    bpy.app.timers.register(callback, first_interval=0)
+
+
+def draw_switch_menu(layout, tree_type, *, contents=False):
+    """Draw the root switch menu of tree_type, return False if the tree type has none."""
+    idname = root_menu_idname(tree_type)
+    if idname is None:
+        return False
+
+    if tree_type not in registered_menus:
+        request_switch_menus(tree_type)
+        layout.label(text="Loading...", icon='TIME')
+    elif contents:
+        layout.menu_contents(idname)
+    else:
+        layout.menu(idname)
+    return True
+
+
+def request_editor_switch_menus(self, context):
+    # Appended to the node editor header, draws nothing
+    request_switch_menus(context.space_data.tree_type)
 
 
 classes = (
@@ -85,11 +288,32 @@ classes = (
 )
 
 
-def register():
+def register(tables):
+    switch_menu_tables.update(tables)
+
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    groups.register()
+    bpy.types.NODE_HT_header.append(request_editor_switch_menus)
+
 
 def unregister():
+    bpy.types.NODE_HT_header.remove(request_editor_switch_menus)
+    groups.unregister()
+
+    for callback in pending_registrations.values():
+        if bpy.app.timers.is_registered(callback):
+            bpy.app.timers.unregister(callback)
+    pending_registrations.clear()
+
+    for menu_classes in registered_menus.values():
+        for cls in reversed(menu_classes):
+            bpy.utils.unregister_class(cls)
+    registered_menus.clear()
+    registration_times.clear()
+    switch_menu_tables.clear()
+    node_type_info.cache_clear()
+
     for cls in classes:
-        bpy.utils.unregister_class(cls)
\ No newline at end of file
+        bpy.utils.unregister_class(cls)
@@ -5,7 +5,10 @@
 
 import itertools
 import functools
+import hashlib
+import os
 import bpy
+import numpy as np
 
 from bpy.types import Operator, PropertyGroup, NodeSocketVirtual
 from bpy.props import (
@@ -21,7 +24,7 @@ from bpy.props import (
 from bpy_extras.io_utils import ImportHelper, ExportHelper
 from mathutils import Vector
 from os import path
-from glob import glob
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 from itertools import chain, islice, zip_longest
 
@@ -45,20 +48,32 @@ from .utils.constants import (
     rl_outputs
     )
 from .utils.draw import draw_callback_nodeoutline
-from .utils.paths import match_files_to_socket_names, split_into_components
+from .utils.paths import (
+    DIRECTX_TAGS,
+    is_directx,
+    match_files_to_socket_names,
+    replace_component,
+    split_into_components,
+)
+from .utils.library import IMAGE_EXTENSIONS, TextureLibrary
+from .utils.image_probe import probe_file, probe_images
+from .utils.image_writers import encode_exr, encode_png_data, write_file
+from .utils import corrections, images, packing, prefetchers, viewer_saves
+from .utils.sequences import directory_sequences, find_sequences, find_tile_sets, sequence_of
+from .utils.search import SearchIndex
 from .utils.nodes import (
     is_virtual_socket,
     n_wise_iter,
     next_in_list,
     prev_in_list,
     filter_nodes_by_type,
-    node_mid_pt, 
     get_bounds, 
     autolink, 
     node_at_pos, 
     get_active_tree, 
     get_nodes_links, 
     connect_sockets,
+    LinkBuilder,
     is_viewer_socket,
     is_viewer_link, 
     get_group_output_node, 
@@ -947,7 +962,21 @@ class NWFrameSelected(Operator, NWBase):
 class NWReloadImages(Operator):
     bl_idname = "node.fw_reload_images"
     bl_label = "Reload Images"
-    bl_description = "Update all the image nodes to match their files on disk"
+    bl_description = "Update the image nodes whose files changed on disk"
+
+    scope: EnumProperty(
+        name="Scope",
+        items=(
+            ('TREE', "This Tree", "Reload the images used in the current node tree"),
+            ('FILE', "All Trees in File", "Reload the images used in any node tree of the file"),
+        ),
+        default='TREE',
+    )
+    force: BoolProperty(
+        name="Reload Unchanged",
+        description="Also reload images whose files didn't change since they were last read",
+        default=False,
+    )
 
     @classmethod
     def poll(cls, context):
@@ -961,31 +990,204 @@ class NWReloadImages(Operator):
         return valid
 
     def execute(self, context):
-        nodes, links = get_nodes_links(context)
-        image_types = ["IMAGE", "TEX_IMAGE", "TEX_ENVIRONMENT", "TEXTURE"]
-        num_reloaded = 0
-        for node in nodes:
-            if node.type in image_types:
-                if node.type == "TEXTURE":
-                    if node.texture:  # node has texture assigned
-                        if node.texture.type in ['IMAGE', 'ENVIRONMENT_MAP']:
-                            if node.texture.image:  # texture has image assigned
-                                node.texture.image.reload()
-                                num_reloaded += 1
-                else:
-                    if node.image:
-                        node.image.reload()
-                        num_reloaded += 1
-
-        if num_reloaded:
-            self.report({'INFO'}, "Reloaded images")
-            print("Reloaded " + str(num_reloaded) + " images")
-            force_update(context)
-            return {'FINISHED'}
+        if self.scope == 'FILE':
+            used_images = chain.from_iterable(images.node_images(tree.nodes) for tree in images.all_node_trees())
         else:
+            nodes, links = get_nodes_links(context)
+            used_images = images.node_images(nodes)
+
+        # An image used by many nodes is only checked and reloaded once
+        used_images = list({image.as_pointer(): image for image in used_images}.values())
+        if not used_images:
             self.report({'WARNING'}, "No images found to reload in this node tree")
             return {'CANCELLED'}
 
+        reloaded = images.reload_images(used_images, force=self.force)
+        if not reloaded:
+            self.report({'INFO'}, "All images are up to date")
+            return {'FINISHED'}
+
+        self.report({'INFO'}, "Reloaded images")
+        print(f"Reloaded {len(reloaded)} of {len(used_images)} images")
+        force_update(context)
+        return {'FINISHED'}
+
+
+class NWMergeDuplicateImages(Operator):
+    """Merge images that read the same file with the same settings into a single image"""
+    bl_idname = "node.fw_merge_duplicate_images"
+    bl_label = "Merge Duplicate Images"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Groups of duplicates listed in the confirmation dialog
+    max_listed = 15
+
+    @classmethod
+    def poll(cls, context):
+        return fw_check(context) and context.space_data.tree_type != 'GeometryNodeTree'
+
+    def draw(self, context):
+        col = self.layout.column(align=True)
+        duplicates = images.duplicate_images()
+        for keep, *others in duplicates[:self.max_listed]:
+            col.label(text=f"{keep.name}: {', '.join(image.name for image in others)}", icon='IMAGE_DATA')
+        if len(duplicates) > self.max_listed:
+            col.label(text=f"... and {len(duplicates) - self.max_listed} more")
+
+    def invoke(self, context, event):
+        if not images.duplicate_images():
+            self.report({'INFO'}, "No duplicate images found")
+            return {'CANCELLED'}
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        for keep, *others in images.duplicate_images():
+            print(f"Merging {', '.join(image.name for image in others)} into {keep.name}")
+        removed = images.merge_duplicate_images()
+        if not removed:
+            self.report({'INFO'}, "No duplicate images found")
+            return {'CANCELLED'}
+
+        self.report({'INFO'}, f"Merged {removed} duplicate images")
+        return {'FINISHED'}
+
+
+def packing_role(node):
+    """Return the socket the color of an image texture node feeds, if it has a channel in packed maps."""
+    for link in node.outputs['Color'].links:
+        if link.to_socket.name in packing.PACKED_CHANNELS:
+            return link.to_socket.name
+    # Gloss maps go through an Invert node, Principled setup labels them anyway
+    return node.label if node.label in packing.PACKED_CHANNELS else None
+
+
+class NWPackChannels(Operator, NWBase):
+    """Pack the selected grayscale image textures into the channels of a single image, split by a Separate Color node"""
+    bl_idname = "node.fw_pack_channels"
+    bl_label = "Pack Grayscale Images"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    use_16_bit: BoolProperty(
+        name="16 Bit",
+        description="Save the packed image with 16 bits per channel instead of 8",
+        default=False,
+    )
+    relative_path: BoolProperty(
+        name='Relative Path',
+        description='Set the file path relative to the blend file, when possible',
+        default=True
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return fw_check(context) and context.space_data.tree_type == 'ShaderNodeTree'
+
+    def execute(self, context):
+        nodes, links = get_nodes_links(context)
+        texture_nodes = [n for n in nodes if n.select and n.bl_idname == 'ShaderNodeTexImage' and n.image]
+        if len(texture_nodes) < 2:
+            self.report({'INFO'}, "Select at least two Image Texture nodes")
+            return {'CANCELLED'}
+
+        # AO, roughness, metallic and alpha go where ORM maps have them
+        roles = [packing_role(n) for n in texture_nodes]
+        channels = packing.assign_channels(roles)
+        if channels is None:
+            self.report({'INFO'}, "At most four images can be packed together")
+            return {'CANCELLED'}
+
+        sources = [n.image for n in texture_nodes]
+        width, height = sources[0].size
+        file_paths = []
+        for image in sources:
+            if image.source != 'FILE' or not image.filepath:
+                self.report({'ERROR'}, f"{image.name} isn't read from a single file")
+                return {'CANCELLED'}
+            file_path = bpy.path.abspath(image.filepath, library=image.library)
+            info, error = probe_file(file_path)
+            if error is not None:
+                self.report({'ERROR'}, f"{image.name}: {error}")
+                return {'CANCELLED'}
+            # Only the red channel is kept
+            if info is not None and not info.is_grayscale:
+                self.report({'ERROR'}, f"{image.name} isn't a grayscale image")
+                return {'CANCELLED'}
+            if tuple(image.size) != (width, height):
+                self.report({'ERROR'}, f"{image.name} isn't {width}x{height} like {sources[0].name}")
+                return {'CANCELLED'}
+            # The packed image is Non-Color, the pixels of color images would shade differently in it
+            if not image.colorspace_settings.is_data:
+                self.report({'ERROR'}, f"{image.name} isn't a Non-Color image, set its color space first")
+                return {'CANCELLED'}
+            file_paths.append(file_path)
+
+        packed = np.zeros((height, width, 4 if 3 in channels else 3),
+                          dtype=np.uint16 if self.use_16_bit else np.uint8)
+        # A single float copy of one image at a time, the packed pixels are integers
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        for image, channel in zip(sources, channels):
+            image.pixels.foreach_get(pixels)
+            packing.pack_channel(pixels, packed, channel)
+        del pixels
+
+        # Never overwrite a file, or the file of an image, that is there already
+        filepath = packing.unused_file_path(
+            path.dirname(file_paths[0]), packing.packed_file_name(file_paths),
+            lambda file_path: (path.exists(file_path) or images.find_image(file_path) is not None
+                               or images.find_image(file_path, is_data=True) is not None))
+        try:
+            write_file(filepath, encode_png_data(packed))
+        except OSError as error:
+            self.report({'ERROR'}, f"Couldn't save {filepath}: {error}")
+            return {'CANCELLED'}
+
+        import_path = filepath
+        if self.relative_path and bpy.data.filepath:
+            try:
+                import_path = bpy.path.relpath(filepath)
+            except ValueError:
+                pass
+        image = images.load_image(import_path, is_data=True)
+        image.alpha_mode = 'CHANNEL_PACKED'
+
+        first = texture_nodes[0]
+        packed_node = nodes.new(type='ShaderNodeTexImage')
+        packed_node.image = image
+        packed_node.label = packing.packed_label(roles, channels)
+        packed_node.parent = first.parent
+        packed_node.location = first.location
+        packed_node.interpolation = first.interpolation
+        packed_node.projection = first.projection
+        packed_node.extension = first.extension
+        if first.inputs['Vector'].is_linked:
+            connect_sockets(packed_node.inputs['Vector'], first.inputs['Vector'].links[0].from_socket)
+
+        separate_node = nodes.new(type='ShaderNodeSeparateColor')
+        separate_node.parent = first.parent
+        separate_node.location = first.location + Vector((300, 0))
+        connect_sockets(separate_node.inputs[0], packed_node.outputs['Color'])
+        outputs = (separate_node.outputs['Red'], separate_node.outputs['Green'],
+                   separate_node.outputs['Blue'], packed_node.outputs['Alpha'])
+
+        for node, channel in zip(texture_nodes, channels):
+            for link in list(node.outputs['Color'].links):
+                connect_sockets(link.to_socket, outputs[channel])
+            nodes.remove(node)
+
+        for node in nodes:
+            node.select = False
+        packed_node.select = True
+        separate_node.select = True
+        nodes.active = packed_node
+
+        bytes_before = sum(width * height * 4 * (4 if image.is_float else 1) for image in sources)
+        bytes_after = width * height * 4 * (4 if self.use_16_bit else 1)
+        print(f"Packed {', '.join(path.basename(f) for f in file_paths)} into {filepath}, "
+              f"{bytes_before >> 20} MB of pixels down to {bytes_after >> 20} MB")
+        self.report({'INFO'}, f"Packed {len(sources)} images into {path.basename(filepath)}")
+        force_update(context)
+        return {'FINISHED'}
+
 
 class NWSwitchNodeType(Operator, NWBase):
     """Switch type of selected nodes """
@@ -1019,6 +1221,7 @@ class NWSwitchNodeType(Operator, NWBase):
                          'use_alpha', 'use_clamp', 'use_custom_color', 'location'
                          )
         selected = [n for n in nodes if n.select]
+        builder = LinkBuilder(links.id_data)
         reselect = []
         for node in [n for n in selected if
                      n.rna_type.identifier not in src_excludes and
@@ -1176,36 +1379,45 @@ class NWSwitchNodeType(Operator, NWBase):
                             # Set Fac of MIX_RGB to 1.0
                             new_node.inputs[0].default_value = 1.0
                     # make link only when dst matching input is not linked already.
-                    if node.inputs[src_i].links and not new_node.inputs[dst_i].links:
+                    if node.inputs[src_i].links and not builder.is_linked(new_node.inputs[dst_i]):
                         in_src_link = node.inputs[src_i].links[0]
                         in_dst_socket = new_node.inputs[dst_i]
-                        connect_sockets(in_src_link.from_socket, in_dst_socket)
+                        builder.add(in_src_link.from_socket, in_dst_socket)
                         links.remove(in_src_link)
                 # OUTPUTS: Base on matches in proper order.
+                # Output links stay on the old node until the links are built,
+                # so targets that were already relinked are skipped.
                 for (src_i, src_dval), (dst_i, dst_dval) in matches['OUTPUTS'][tp]:
                     for out_src_link in node.outputs[src_i].links:
-                        out_dst_socket = new_node.outputs[dst_i]
-                        connect_sockets(out_dst_socket, out_src_link.to_socket)
+                        if not builder.is_pending(out_src_link.to_socket):
+                            out_dst_socket = new_node.outputs[dst_i]
+                            builder.add(out_dst_socket, out_src_link.to_socket)
             # relink rest inputs if possible, no criteria
             for src_inp in node.inputs:
                 for dst_inp in new_node.inputs:
-                    if src_inp.links and not dst_inp.links:
+                    if src_inp.links and not builder.is_linked(dst_inp):
                         src_link = src_inp.links[0]
-                        connect_sockets(src_link.from_socket, dst_inp)
+                        builder.add(src_link.from_socket, dst_inp)
                         links.remove(src_link)
             # relink rest outputs if possible, base on node kind if any left.
             for src_o in node.outputs:
                 for out_src_link in src_o.links:
+                    to_socket = out_src_link.to_socket
+                    if builder.is_pending(to_socket):
+                        continue
                     for dst_o in new_node.outputs:
                         if src_o.type == dst_o.type:
-                            connect_sockets(dst_o, out_src_link.to_socket)
+                            builder.add(dst_o, to_socket)
             # relink rest outputs no criteria if any left. Link all from first output.
             for src_o in node.outputs:
                 for out_src_link in src_o.links:
-                    if new_node.outputs:
-                        connect_sockets(new_node.outputs[0], out_src_link.to_socket)
+                    if new_node.outputs and not builder.is_pending(out_src_link.to_socket):
+                        builder.add(new_node.outputs[0], out_src_link.to_socket)
+            # Links have to exist before the old node goes, other selected nodes are relinked from them
+            builder.build(update=False)
             nodes.remove(node)
 
+        builder.report(self)
         force_update(context)
         return {'FINISHED'}
 
@@ -1266,7 +1478,7 @@ class NWMergeNodes(Operator, NWBase):
     # be connected. The last one is assumed to be a multi input socket.
     # For convenience the node is returned.
     @staticmethod
-    def merge_with_multi_input(nodes_list, merge_position, do_hide, loc_x, links, nodes, node_name, socket_indices):
+    def merge_with_multi_input(nodes_list, merge_position, do_hide, loc_x, builder, nodes, node_name, socket_indices):
         # The y-location of the last node
         loc_y = nodes_list[-1][2]
         if merge_position == 'CENTER':
@@ -1294,16 +1506,16 @@ class NWMergeNodes(Operator, NWBase):
             # outputs to the multi input socket.
             if i < len(socket_indices) - 1:
                 ind = socket_indices[i]
-                connect_sockets(node.outputs[0], new_node.inputs[ind])
+                builder.add(node.outputs[0], new_node.inputs[ind])
             else:
                 outputs_for_multi_input.insert(0, node.outputs[0])
         if outputs_for_multi_input != []:
             ind = socket_indices[-1]
             for output in outputs_for_multi_input:
-                connect_sockets(output, new_node.inputs[ind])
+                builder.add(output, new_node.inputs[ind])
         if prev_links != []:
             for link in prev_links:
-                connect_sockets(new_node.outputs[0], link.to_node.inputs[0])
+                builder.add(new_node.outputs[0], link.to_node.inputs[0])
         return new_node
 
     def execute(self, context):
@@ -1329,6 +1541,7 @@ class NWMergeNodes(Operator, NWBase):
         elif tree_type == 'TEXTURE':
             node_type = 'TextureNode'
         nodes, links = get_nodes_links(context)
+        builder = LinkBuilder(links.id_data)
         mode = self.mode
         merge_type = self.merge_type
         # Prevent trying to add Z-Combine in not 'COMPOSITING' node tree.
@@ -1497,16 +1710,16 @@ class NWMergeNodes(Operator, NWBase):
                     if mode in ('JOIN', 'MIX'):
                         add_type = node_type + 'JoinGeometry'
                         add = self.merge_with_multi_input(
-                            nodes_list, merge_position, do_hide, loc_x, links, nodes, add_type, [0])
+                            nodes_list, merge_position, do_hide, loc_x, builder, nodes, add_type, [0])
                     elif mode == 'INSTANCES':
                         add_type = node_type + 'GeometryToInstance'
                         add = self.merge_with_multi_input(
-                            nodes_list, merge_position, do_hide, loc_x, links, nodes, add_type, [0])
+                            nodes_list, merge_position, do_hide, loc_x, builder, nodes, add_type, [0])
                     else:
                         add_type = node_type + 'MeshBoolean'
                         indices = [0, 1] if mode == 'DIFFERENCE' else [1]
                         add = self.merge_with_multi_input(
-                            nodes_list, merge_position, do_hide, loc_x, links, nodes, add_type, indices)
+                            nodes_list, merge_position, do_hide, loc_x, builder, nodes, add_type, indices)
                         add.operation = mode
                     was_multi = True
                     break
@@ -1563,19 +1776,19 @@ class NWMergeNodes(Operator, NWBase):
                         # Prevent cyclic dependencies when nodes to be merged are linked to one another.
                         # Link only if "to_node" index not in invalid indexes list.
                         if not self.link_creates_cycle(ss_link, invalid_nodes):
-                            connect_sockets(get_first_enabled_output(last_add), ss_link.to_socket)
+                            builder.add(get_first_enabled_output(last_add), ss_link.to_socket)
             # add links from last_add to all links 'to_socket' of out links of first selected.
             for fs_link in first_selected_output.links:
                 # Link only if "to_node" index not in invalid indexes list.
                 if not self.link_creates_cycle(fs_link, invalid_nodes):
-                    connect_sockets(get_first_enabled_output(last_add), fs_link.to_socket)
+                    builder.add(get_first_enabled_output(last_add), fs_link.to_socket)
             # add link from "first" selected and "first" add node
             node_to = nodes[count_after - 1]
-            connect_sockets(first_selected_output, node_to.inputs[first])
+            builder.add(first_selected_output, node_to.inputs[first])
             if node_to.type == 'ZCOMBINE':
                 for fs_out in first_selected.outputs:
                     if fs_out != first_selected_output and fs_out.name in ('Z', 'Depth'):
-                        connect_sockets(fs_out, node_to.inputs[1])
+                        builder.add(fs_out, node_to.inputs[1])
                         break
             # add links between added ADD nodes and between selected and ADD nodes
             for i in range(count_adds):
@@ -1584,27 +1797,29 @@ class NWMergeNodes(Operator, NWBase):
                     node_to = nodes[index - 1]
                     node_to_input_i = first
                     node_to_z_i = 1  # if z combine - link z to first z input
-                    connect_sockets(get_first_enabled_output(node_from), node_to.inputs[node_to_input_i])
+                    builder.add(get_first_enabled_output(node_from), node_to.inputs[node_to_input_i])
                     if node_to.type == 'ZCOMBINE':
                         for from_out in node_from.outputs:
                             if from_out != get_first_enabled_output(node_from) and from_out.name in ('Z', 'Depth'):
-                                connect_sockets(from_out, node_to.inputs[node_to_z_i])
+                                builder.add(from_out, node_to.inputs[node_to_z_i])
                 if len(nodes_list) > 1:
                     node_from = nodes[nodes_list[i + 1][0]]
                     node_to = nodes[index]
                     node_to_input_i = second
                     node_to_z_i = 3  # if z combine - link z to second z input
-                    connect_sockets(get_first_enabled_output(node_from), node_to.inputs[node_to_input_i])
+                    builder.add(get_first_enabled_output(node_from), node_to.inputs[node_to_input_i])
                     if node_to.type == 'ZCOMBINE':
                         for from_out in node_from.outputs:
                             if from_out != get_first_enabled_output(node_from) and from_out.name in ('Z', 'Depth'):
-                                connect_sockets(from_out, node_to.inputs[node_to_z_i])
+                                builder.add(from_out, node_to.inputs[node_to_z_i])
                 index -= 1
             # set "last" of added nodes as active
             nodes.active = last_add
             for i, x, y, dx, h in nodes_list:
                 nodes[i].select = False
 
+        builder.build()
+        builder.report(self)
         return {'FINISHED'}
 
 class NWMergeNodesRefactored(Operator, NWBase):
@@ -1775,7 +1990,7 @@ class NWMergeNodesRefactored(Operator, NWBase):
             node.location.x = align_offset_x
             node.location.y += align_offset_y
 
-    def group_merge(self, context, selected_nodes, data, group_size):
+    def group_merge(self, context, builder, selected_nodes, data, group_size):
         nodes, links = get_nodes_links(context)
         operation_type = self.operation
 
@@ -1795,14 +2010,14 @@ class NWMergeNodesRefactored(Operator, NWBase):
                 if node is not None:
                     from_socket = self.get_valid_socket(node, mode='Outputs', data_types=data.preferred_input_type)
                     to_socket = self.get_valid_socket(new_node, mode='Inputs', data_types=data.socket_data_type, target_index=index)
-                    connect_sockets(from_socket, to_socket)
+                    builder.add(from_socket, to_socket)
 
             new_nodes.append(new_node)
 
         context.space_data.edit_tree.nodes.active = new_node
         return new_nodes
 
-    def chain_merge(self, context, selected_nodes, data, group_size):
+    def chain_merge(self, context, builder, selected_nodes, data, group_size):
         nodes, links = get_nodes_links(context)
         operation_type = self.operation
         max_index = group_size - 1
@@ -1821,7 +2036,7 @@ class NWMergeNodesRefactored(Operator, NWBase):
             for index, node in enumerate(selected_nodes):
                 from_socket = self.get_valid_socket(node, mode='Outputs', data_types=data.preferred_input_type)
                 to_socket = self.get_valid_socket(new_node, mode='Inputs', data_types=data.socket_data_type, target_index=index)
-                connect_sockets(from_socket, to_socket)
+                builder.add(from_socket, to_socket)
 
             context.space_data.edit_tree.nodes.active = new_node
             return [new_node, ]
@@ -1848,18 +2063,18 @@ class NWMergeNodesRefactored(Operator, NWBase):
                 if node is not None:
                     from_socket = self.get_valid_socket(node, mode='Outputs', data_types=data.preferred_input_type)
                     to_socket = self.get_valid_socket(new_node, mode='Inputs', data_types=data.socket_data_type, target_index=index)
-                    connect_sockets(from_socket, to_socket)
+                    builder.add(from_socket, to_socket)
 
             chain_index = 0 if data.prefer_first_socket else max_index
 
             if prev_socket is not None:
                 from_socket = prev_socket
                 to_socket = self.get_valid_socket(new_node, mode='Inputs', data_types=data.socket_data_type, target_index=chain_index)
-                connect_sockets(from_socket, to_socket)
+                builder.add(from_socket, to_socket)
             else:
                 from_socket = self.get_valid_socket(first_node, mode='Outputs', data_types=data.preferred_input_type)
                 to_socket = self.get_valid_socket(new_node, mode='Inputs', data_types=data.socket_data_type, target_index=chain_index)
-                connect_sockets(from_socket, to_socket)
+                builder.add(from_socket, to_socket)
 
             prev_socket = self.get_valid_socket(new_node, mode='Outputs', data_types=data.preferred_input_type)
             new_nodes.append(new_node)
@@ -1867,7 +2082,7 @@ class NWMergeNodesRefactored(Operator, NWBase):
         context.space_data.edit_tree.nodes.active = new_node
         return new_nodes
 
-    def batch_merge(self, context, selected_nodes, data):
+    def batch_merge(self, context, builder, selected_nodes, data):
         nodes, links = get_nodes_links(context)
         operation_type = self.operation
 
@@ -1884,19 +2099,19 @@ class NWMergeNodesRefactored(Operator, NWBase):
         if not data.isolate_first_socket:
             for node in reversed(selected_nodes):
                 from_socket = self.get_valid_socket(node, mode='Outputs', data_types=data.preferred_input_type)
-                connect_sockets(from_socket, batch_socket)
+                builder.add(from_socket, batch_socket)
         else:
             first_node = selected_nodes.pop(0)
 
             for node in reversed(selected_nodes):
                 from_socket = self.get_valid_socket(node, mode='Outputs', data_types=data.preferred_input_type)
-                connect_sockets(from_socket, batch_socket)
+                builder.add(from_socket, batch_socket)
 
             first_to_socket = self.get_valid_socket(new_node, mode='Inputs', 
                 data_types=data.socket_data_type, target_index=data.first_socket_index)
             first_from_socket = self.get_valid_socket(first_node, mode='Outputs', data_types=data.preferred_input_type)
 
-            connect_sockets(first_from_socket, first_to_socket)
+            builder.add(first_from_socket, first_to_socket)
 
         context.space_data.edit_tree.nodes.active = new_node
         return [new_node, ]
@@ -2112,28 +2327,32 @@ class NWMergeNodesRefactored(Operator, NWBase):
         selected_nodes.sort(key=lambda n: n.location.y - (n.dimensions.y / 2), reverse=True)
 
         data = self.setup_function_data(context, function_type, operation_type)
+        builder = LinkBuilder(links.id_data)
 
         if function_type == 'UNARY':
-            new_nodes = self.group_merge(context, selected_nodes, data, group_size=1)
+            new_nodes = self.group_merge(context, builder, selected_nodes, data, group_size=1)
 
         elif function_type == 'BATCH':
-            new_nodes = self.batch_merge(context, selected_nodes, data)
+            new_nodes = self.batch_merge(context, builder, selected_nodes, data)
 
         elif function_type == 'TERNARY_MERGE':
-            new_nodes = self.group_merge(context, selected_nodes, data, group_size=3)
+            new_nodes = self.group_merge(context, builder, selected_nodes, data, group_size=3)
 
         elif function_type == 'BINARY_MERGE':
-            new_nodes = self.group_merge(context, selected_nodes, data, group_size=2)
+            new_nodes = self.group_merge(context, builder, selected_nodes, data, group_size=2)
                 
         elif function_type == 'TERNARY':
-            new_nodes = self.chain_merge(context, selected_nodes, data, group_size=3)
+            new_nodes = self.chain_merge(context, builder, selected_nodes, data, group_size=3)
 
         elif function_type == 'BINARY':
-            new_nodes = self.chain_merge(context, selected_nodes, data, group_size=2)
+            new_nodes = self.chain_merge(context, builder, selected_nodes, data, group_size=2)
         
         else:
             raise NotImplementedError(f"Function type '{function_type}', does not have a supported implementation")
 
+        builder.build()
+        builder.report(self)
+
         self.arrange_nodes(new_nodes, align_point=align_point)
         return {'FINISHED'}
 
@@ -2550,6 +2769,398 @@ class NWAddTextureSetup(Operator, NWBase):
         return {'FINISHED'}
 
 
+def principled_sockets(tags):
+    """
+    Return the sockets filled in by the Principled Setup, in the format of match_files_to_socket_names()
+    [Socket Name, [abbreviations and keyword list], Filename placeholder]
+    """
+    return [
+        ['Displacement', tags.displacement.split(' '), None],
+        ['Base Color', tags.base_color.split(' '), None],
+        ['Metallic', tags.metallic.split(' '), None],
+        ['Specular IOR Level', tags.specular.split(' '), None],
+        ['Roughness', tags.rough.split(' ') + tags.gloss.split(' '), None],
+        ['Normal', tags.normal.split(' ') + tags.bump.split(' '), None],
+        ['Transmission Weight', tags.transmission.split(' '), None],
+        ['Emission Color', tags.emission.split(' '), None],
+        ['Alpha', tags.alpha.split(' '), None],
+        ['Ambient Occlusion', tags.ambient_occlusion.split(' '), None],
+        ['AO Roughness Metallic', tags.ao_rough_metal.split(' '), None],
+    ]
+
+
+# Channels of packed AO Roughness Metallic maps -> Principled BSDF input they fill
+PACKED_CHANNELS = (('Green', 'Roughness'), ('Blue', 'Metallic'))
+
+
+# Reading image headers is mostly waiting on the file system
+PROBE_WORKERS = 8
+
+
+def probe_files(file_paths):
+    """Read the headers of the image files on a thread pool, see probe_images()."""
+    with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+        return probe_images(file_paths, executor)
+
+
+def report_broken_files(operator, errors, limit=5):
+    for file_path, error in islice(errors.items(), limit):
+        operator.report({'WARNING'}, f"Skipped {path.basename(file_path)}: {error}")
+    if len(errors) > limit:
+        operator.report({'WARNING'}, f"Skipped {len(errors) - limit} more files that aren't valid images")
+
+
+# library root -> TextureLibrary, the stored index is only read once per session
+texture_libraries = {}
+# library root -> SearchIndex over the keys of its texture sets
+texture_set_indices = {}
+
+
+def get_texture_library():
+    """Return the TextureLibrary of the folder set in the preferences, or None if there is none."""
+    root = bpy.path.abspath(fetch_user_preferences("texture_library_path"))
+    if not root or not path.isdir(root):
+        return None
+
+    sockets = principled_sockets(fetch_user_preferences().principled_tags)
+    root = path.normpath(root)
+    index_name = hashlib.sha1(root.encode("utf-8")).hexdigest()[:16] + ".json"
+    index_path = path.join(bpy.utils.user_resource('CONFIG', path="node_wrangler"), "texture_libraries", index_name)
+    library = TextureLibrary(root, sockets, index_path)
+
+    cached = texture_libraries.get(root)
+    if cached is not None and cached.sockets == library.sockets:
+        return cached
+
+    library.load()
+    texture_libraries[root] = library
+    texture_set_indices.pop(root, None)
+    return library
+
+
+# Folder next to the textures the baked corrections are saved in, only ever written by
+# bake_texture_correction(). Hidden, so neither the texture library nor matching sees the copies.
+BAKED_FOLDER = '.nw_baked'
+
+
+def bake_texture_correction(directory, fname, target_name, correct):
+    """
+    Save a copy of the image file fname with correct() applied to its pixels in the
+    BAKED_FOLDER next to it, as target_name with the extension picked here, and return
+    the name of the copy relative to directory. A copy newer than the file is reused.
+    Returns None if the copy can't be made.
+    """
+    source_path = path.join(directory, fname)
+    info, error = probe_file(source_path)
+    if error is not None:
+        return None
+    stem = path.splitext(target_name)[0]
+    # Float and 16 bit files keep their precision, formats that can't be probed go by the loaded image
+    extensions = ['.exr' if info.is_float or info.bit_depth > 8 else '.png'] if info else ['.png', '.exr']
+    for extension in extensions:
+        baked_name = path.join(BAKED_FOLDER, stem + extension)
+        if corrections.is_cached(source_path, path.join(directory, baked_name)):
+            return baked_name
+
+    try:
+        image = bpy.data.images.load(source_path, check_existing=False)
+    except RuntimeError:
+        return None
+    try:
+        image.colorspace_settings.is_data = True
+        width, height = image.size
+        is_float = image.is_float if info is None else extensions[0] == '.exr'
+        pixels = np.empty(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+
+    correct(pixels)
+    if is_float:
+        data = encode_exr(pixels, width, height, half=info is not None and info.bit_depth <= 16)
+    else:
+        data = encode_png_data(corrections.quantize(pixels, width, height))
+    baked_name = path.join(BAKED_FOLDER, stem + ('.exr' if is_float else '.png'))
+    try:
+        os.makedirs(path.join(directory, BAKED_FOLDER), exist_ok=True)
+        write_file(path.join(directory, baked_name), data)
+    except OSError:
+        return None
+    return baked_name
+
+
+def shipped_file(directory, target_name):
+    """Return the name of an image file in directory named like target_name with any extension, or None."""
+    stem = path.splitext(target_name)[0].lower()
+    try:
+        with os.scandir(directory) as entries:
+            return next((entry.name for entry in entries if entry.is_file()
+                         and path.splitext(entry.name)[0].lower() == stem
+                         and path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS), None)
+    except OSError:
+        return None
+
+
+def bake_principled_corrections(directory, socketnames, tags, tile_sets):
+    """
+    Swap the gloss and DirectX normal maps of socketnames for roughness and OpenGL normal
+    maps baked from them, so no nodes are needed to correct them while shading. Roughness
+    and OpenGL normal maps that come with the textures are used instead of baking.
+    Returns the names of the files that couldn't be baked, DirectX normal maps among
+    them are removed from socketnames.
+    """
+    gloss_abbr = tags.gloss.split(' ')
+    rough_abbr = tags.rough.split(' ')
+    failed = []
+    for sname in socketnames:
+        fname = sname[2]
+        # UDIM tiles are left as they are
+        if not fname or fname in tile_sets:
+            continue
+        fname_components = set(split_into_components(fname))
+        if (sname[0] == 'Roughness' and fname_components.intersection(gloss_abbr)
+                and not fname_components.intersection(rough_abbr)):
+            # The roughness tag makes the copy be matched and connected as a roughness map
+            target_name = replace_component(fname, gloss_abbr, rough_abbr[0])
+            correct = corrections.invert_colors
+        elif sname[0] == 'Normal' and is_directx(fname):
+            target_name = replace_component(fname, DIRECTX_TAGS, 'gl')
+            correct = corrections.flip_green
+        else:
+            continue
+
+        shipped = shipped_file(directory, target_name)
+        if shipped is not None:
+            print(f"Using {shipped} instead of correcting {fname}")
+            sname[2] = shipped
+            continue
+
+        baked = bake_texture_correction(directory, fname, target_name, correct)
+        if baked is None:
+            failed.append(fname)
+            # Without the flip DirectX normal maps are skipped, like before
+            if sname[0] == 'Normal':
+                sname[2] = None
+        else:
+            print(f"Baked {fname} into {baked}")
+            sname[2] = baked
+    return failed
+
+
+def load_texture_image(import_path, fname, is_data, tile_sets):
+    """Load a single image, or the tiled image of the UDIM tile set fname is the first file of."""
+    tile_set = tile_sets.get(fname)
+    if tile_set is not None:
+        return images.load_tiled_image(path.join(import_path, fname), tile_set.tiles, is_data=is_data)
+    return images.load_image(path.join(import_path, fname), is_data=is_data)
+
+
+def add_principled_textures(node_tree, active_node, socketnames, import_path, tags, file_infos=None, tile_sets=None):
+    """
+    Add image texture nodes for the matched socketnames and connect them to active_node,
+    a Principled BSDF node of node_tree. Images are loaded from import_path, or reused
+    when an image of the file already exists. file_infos maps file names to their
+    ImageInfo, when their headers were read. tile_sets maps the first file of UDIM
+    tile sets to their TileSet, those are loaded as one tiled image.
+    """
+    file_infos = file_infos or {}
+    tile_sets = tile_sets or {}
+    nodes, links = node_tree.nodes, node_tree.links
+    normal_abbr = tags.normal.split(' ')
+    bump_abbr = tags.bump.split(' ')
+    gloss_abbr = tags.gloss.split(' ')
+    rough_abbr = tags.rough.split(' ')
+
+    # Add found images
+    print('\nMatched Textures:')
+    texture_nodes = []
+    disp_texture = None
+    ao_texture = None
+    packed_texture = None
+    normal_node = None
+    roughness_node = None
+    for i, sname in enumerate(socketnames):
+        info = file_infos.get(sname[2])
+        print(i, sname[0], sname[2], info.describe() if info else '')
+
+        # DISPLACEMENT NODES
+        if sname[0] == 'Displacement':
+            disp_texture = nodes.new(type='ShaderNodeTexImage')
+            img = load_texture_image(import_path, sname[2], True, tile_sets)
+            disp_texture.image = img
+            disp_texture.label = 'Displacement'
+
+            # Add displacement offset nodes
+            disp_node = nodes.new(type='ShaderNodeDisplacement')
+            # Align the Displacement node under the active Principled BSDF node
+            disp_node.location = active_node.location + Vector((100, -700))
+            link = connect_sockets(disp_node.inputs[0], disp_texture.outputs[0])
+
+            # TODO Turn on true displacement in the material
+            # Too complicated for now
+
+            # Find output node
+            output_node = [n for n in nodes if n.bl_idname == 'ShaderNodeOutputMaterial']
+            if output_node:
+                if not output_node[0].inputs[2].is_linked:
+                    link = connect_sockets(output_node[0].inputs[2], disp_node.outputs[0])
+
+            continue
+
+        # AMBIENT OCCLUSION TEXTURE
+        if sname[0] == 'Ambient Occlusion':
+            ao_texture = nodes.new(type='ShaderNodeTexImage')
+            img = load_texture_image(import_path, sname[2], True, tile_sets)
+            ao_texture.image = img
+            ao_texture.label = sname[0]
+
+            continue
+
+        # PACKED AO ROUGHNESS METALLIC TEXTURE
+        if sname[0] == 'AO Roughness Metallic':
+            # Maps of their own win over the channels of the packed one
+            matched = {s[0] for s in socketnames}
+            channels = [(output, socket) for output, socket in PACKED_CHANNELS
+                        if socket not in matched and not active_node.inputs[socket].is_linked]
+            if not channels and 'Ambient Occlusion' in matched:
+                continue
+
+            # Loaded and sampled once, a Separate Color node splits the channels
+            packed_texture = nodes.new(type='ShaderNodeTexImage')
+            packed_texture.image = load_texture_image(import_path, sname[2], True, tile_sets)
+            packed_texture.label = sname[0]
+            separate_node = nodes.new(type='ShaderNodeSeparateColor')
+            link = connect_sockets(separate_node.inputs[0], packed_texture.outputs[0])
+            for output, socket in channels:
+                link = connect_sockets(active_node.inputs[socket], separate_node.outputs[output])
+
+            continue
+
+        if not active_node.inputs[sname[0]].is_linked:
+            # No texture node connected -> add texture node with new image
+            texture_node = nodes.new(type='ShaderNodeTexImage')
+            # Use non-color except for color inputs
+            is_data = sname[0] not in {'Base Color', 'Emission Color'}
+            img = load_texture_image(import_path, sname[2], is_data, tile_sets)
+            texture_node.image = img
+
+            # NORMAL NODES
+            if sname[0] == 'Normal':
+                # Test if new texture node is normal or bump map
+                fname_components = split_into_components(sname[2])
+                match_normal = set(normal_abbr).intersection(set(fname_components))
+                match_bump = set(bump_abbr).intersection(set(fname_components))
+                # A single channel image is a height map, whatever its name says
+                is_height = info is not None and info.is_grayscale
+                if match_normal and not is_height:
+                    # If Normal add normal node in between
+                    normal_node = nodes.new(type='ShaderNodeNormalMap')
+                    link = connect_sockets(normal_node.inputs[1], texture_node.outputs[0])
+                elif match_bump or is_height:
+                    # If Bump add bump node in between
+                    normal_node = nodes.new(type='ShaderNodeBump')
+                    link = connect_sockets(normal_node.inputs[2], texture_node.outputs[0])
+
+                link = connect_sockets(active_node.inputs[sname[0]], normal_node.outputs[0])
+                normal_node_texture = texture_node
+
+            elif sname[0] == 'Roughness':
+                # Test if glossy or roughness map
+                fname_components = split_into_components(sname[2])
+                match_rough = set(rough_abbr).intersection(set(fname_components))
+                match_gloss = set(gloss_abbr).intersection(set(fname_components))
+
+                if match_rough:
+                    # If Roughness nothing to to
+                    link = connect_sockets(active_node.inputs[sname[0]], texture_node.outputs[0])
+
+                elif match_gloss:
+                    # If Gloss Map add invert node
+                    invert_node = nodes.new(type='ShaderNodeInvert')
+                    link = connect_sockets(invert_node.inputs[1], texture_node.outputs[0])
+
+                    link = connect_sockets(active_node.inputs[sname[0]], invert_node.outputs[0])
+                    roughness_node = texture_node
+
+            else:
+                # This is a simple connection Texture --> Input slot
+                link = connect_sockets(active_node.inputs[sname[0]], texture_node.outputs[0])
+
+        else:
+            # If already texture connected. add to node list for alignment
+            texture_node = active_node.inputs[sname[0]].links[0].from_node
+
+        # This are all connected texture nodes
+        texture_nodes.append(texture_node)
+        texture_node.label = sname[0]
+
+    if packed_texture:
+        texture_nodes.append(packed_texture)
+
+    if disp_texture:
+        texture_nodes.append(disp_texture)
+
+    if ao_texture:
+        # We want the ambient occlusion texture to be the top most texture node
+        texture_nodes.insert(0, ao_texture)
+
+    # Alignment
+    for i, texture_node in enumerate(texture_nodes):
+        offset = Vector((-550, (i * -280) + 200))
+        texture_node.location = active_node.location + offset
+
+    if normal_node:
+        # Extra alignment if normal node was added
+        normal_node.location = normal_node_texture.location + Vector((300, 0))
+
+    if roughness_node:
+        # Alignment of invert node if glossy map
+        invert_node.location = roughness_node.location + Vector((300, 0))
+
+    if packed_texture:
+        separate_node.location = packed_texture.location + Vector((300, 0))
+
+    # Add texture input + mapping
+    mapping = nodes.new(type='ShaderNodeMapping')
+    mapping.location = active_node.location + Vector((-1050, 0))
+    if len(texture_nodes) > 1:
+        # If more than one texture add reroute node in between
+        reroute = nodes.new(type='NodeReroute')
+        texture_nodes.append(reroute)
+        tex_coords = Vector((texture_nodes[0].location.x,
+                             sum(n.location.y for n in texture_nodes) / len(texture_nodes)))
+        reroute.location = tex_coords + Vector((-50, -120))
+        for texture_node in texture_nodes:
+            link = connect_sockets(texture_node.inputs[0], reroute.outputs[0])
+        link = connect_sockets(reroute.inputs[0], mapping.outputs[0])
+    else:
+        link = connect_sockets(texture_nodes[0].inputs[0], mapping.outputs[0])
+
+    # Connect texture_coordiantes to mapping node
+    texture_input = nodes.new(type='ShaderNodeTexCoord')
+    texture_input.location = mapping.location + Vector((-200, 0))
+    link = connect_sockets(mapping.inputs[0], texture_input.outputs[2])
+
+    # Create frame around tex coords and mapping
+    frame = nodes.new(type='NodeFrame')
+    frame.label = 'Mapping'
+    mapping.parent = frame
+    texture_input.parent = frame
+    frame.update()
+
+    # Create frame around texture nodes
+    frame = nodes.new(type='NodeFrame')
+    frame.label = 'Textures'
+    for tnode in texture_nodes:
+        tnode.parent = frame
+    frame.update()
+
+    # Just to be sure
+    active_node.select = False
+    nodes.update()
+    links.update()
+
+
 class NWAddPrincipledSetup(Operator, NWBase, ImportHelper):
     bl_idname = "node.fw_add_textures_for_principled"
     bl_label = "Principled Texture Setup"
@@ -2572,6 +3183,18 @@ class NWAddPrincipledSetup(Operator, NWBase, ImportHelper):
         description='Set the file path relative to the blend file, when possible',
         default=True
     )
+    texture_set: StringProperty(
+        name='Texture Set',
+        description='Texture set of the texture library to use instead of the selected files',
+        default='',
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+    bake_corrections: BoolProperty(
+        name='Bake Corrections',
+        description='Save gloss maps inverted into roughness and DirectX normal maps flipped to OpenGL next to them, '
+                    'and use those instead of correcting the maps with nodes',
+        default=False
+    )
 
     order = [
         "filepath",
@@ -2583,6 +3206,7 @@ class NWAddPrincipledSetup(Operator, NWBase, ImportHelper):
         layout.alignment = 'LEFT'
 
         layout.prop(self, 'relative_path')
+        layout.prop(self, 'bake_corrections')
 
     @classmethod
     def poll(cls, context):
@@ -2595,12 +3219,13 @@ class NWAddPrincipledSetup(Operator, NWBase, ImportHelper):
 
     def execute(self, context):
         # Check if everything is ok
-        if not self.directory:
-            self.report({'INFO'}, 'No Folder Selected')
-            return {'CANCELLED'}
-        if not self.files[:]:
-            self.report({'INFO'}, 'No Files Selected')
-            return {'CANCELLED'}
+        if not self.texture_set:
+            if not self.directory:
+                self.report({'INFO'}, 'No Folder Selected')
+                return {'CANCELLED'}
+            if not self.files[:]:
+                self.report({'INFO'}, 'No Files Selected')
+                return {'CANCELLED'}
 
         nodes, links = get_nodes_links(context)
         active_node = nodes.active
@@ -2609,208 +3234,246 @@ class NWAddPrincipledSetup(Operator, NWBase, ImportHelper):
             return {'CANCELLED'}
 
         # Filter textures names for texturetypes in filenames
-        # [Socket Name, [abbreviations and keyword list], Filename placeholder]
         tags = fetch_user_preferences().principled_tags
-        normal_abbr = tags.normal.split(' ')
-        bump_abbr = tags.bump.split(' ')
-        gloss_abbr = tags.gloss.split(' ')
-        rough_abbr = tags.rough.split(' ')
-        socketnames = [
-            ['Displacement', tags.displacement.split(' '), None],
-            ['Base Color', tags.base_color.split(' '), None],
-            ['Metallic', tags.metallic.split(' '), None],
-            ['Specular IOR Level', tags.specular.split(' '), None],
-            ['Roughness', rough_abbr + gloss_abbr, None],
-            ['Normal', normal_abbr + bump_abbr, None],
-            ['Transmission Weight', tags.transmission.split(' '), None],
-            ['Emission Color', tags.emission.split(' '), None],
-            ['Alpha', tags.alpha.split(' '), None],
-            ['Ambient Occlusion', tags.ambient_occlusion.split(' '), None],
-        ]
-
-        match_files_to_socket_names(self.files, socketnames)
-        # Remove socketnames without found files
-        socketnames = [s for s in socketnames if s[2]
-                       and path.exists(self.directory + s[2])]
+        socketnames = principled_sockets(tags)
+
+        tile_sets = {}
+        if self.texture_set:
+            # Files were already matched and checked when the library was scanned
+            library = get_texture_library()
+            texture_set = library.get(self.texture_set, self.bake_corrections) if library else None
+            if texture_set is None:
+                self.report({'WARNING'}, f'Texture set "{self.texture_set}" not found in the texture library')
+                return {'CANCELLED'}
+            directory, set_files, tile_sets = texture_set
+            directory = path.join(directory, '')
+            for sname in socketnames:
+                sname[2] = set_files.get(sname[0])
+            socketnames = [s for s in socketnames if s[2]]
+        else:
+            directory = self.directory
+            # The tiles of a UDIM set only differ in their number, match their first file only
+            tile_sets = {tile_set.files[0]: tile_set for tile_set in find_tile_sets(f.name for f in self.files)}
+            tile_files = {fname for tile_set in tile_sets.values() for fname in tile_set.files[1:]}
+            match_files_to_socket_names([f for f in self.files if f.name not in tile_files], socketnames,
+                                        allow_directx=self.bake_corrections)
+            socketnames = [s for s in socketnames if s[2]]
+
+        if self.bake_corrections:
+            for fname in bake_principled_corrections(directory, socketnames, tags, tile_sets):
+                self.report({'WARNING'}, f"Couldn't bake the corrections of {fname}")
+            socketnames = [s for s in socketnames if s[2]]
+
+        # Remove socketnames whose files are missing or aren't valid images, before any image is loaded
+        file_infos, errors = probe_files(directory + s[2] for s in socketnames)
+        report_broken_files(self, errors)
+        socketnames = [s for s in socketnames if directory + s[2] in file_infos]
         if not socketnames:
             self.report({'INFO'}, 'No matching images found')
             print('No matching images found')
             return {'CANCELLED'}
 
         # Don't override path earlier as os.path is used to check the absolute path
-        import_path = self.directory
+        import_path = directory
         if self.relative_path:
             if bpy.data.filepath:
                 try:
-                    import_path = bpy.path.relpath(self.directory)
+                    import_path = bpy.path.relpath(directory)
                 except ValueError:
                     pass
 
-        # Add found images
-        print('\nMatched Textures:')
-        texture_nodes = []
-        disp_texture = None
-        ao_texture = None
-        normal_node = None
-        roughness_node = None
-        for i, sname in enumerate(socketnames):
-            print(i, sname[0], sname[2])
-
-            # DISPLACEMENT NODES
-            if sname[0] == 'Displacement':
-                disp_texture = nodes.new(type='ShaderNodeTexImage')
-                img = bpy.data.images.load(path.join(import_path, sname[2]))
-                disp_texture.image = img
-                disp_texture.label = 'Displacement'
-                if disp_texture.image:
-                    disp_texture.image.colorspace_settings.is_data = True
-
-                # Add displacement offset nodes
-                disp_node = nodes.new(type='ShaderNodeDisplacement')
-                # Align the Displacement node under the active Principled BSDF node
-                disp_node.location = active_node.location + Vector((100, -700))
-                link = connect_sockets(disp_node.inputs[0], disp_texture.outputs[0])
-
-                # TODO Turn on true displacement in the material
-                # Too complicated for now
-
-                # Find output node
-                output_node = [n for n in nodes if n.bl_idname == 'ShaderNodeOutputMaterial']
-                if output_node:
-                    if not output_node[0].inputs[2].is_linked:
-                        link = connect_sockets(output_node[0].inputs[2], disp_node.outputs[0])
+        file_infos = {s[2]: file_infos[directory + s[2]] for s in socketnames}
+        add_principled_textures(nodes.id_data, active_node, socketnames, import_path, tags, file_infos, tile_sets)
+        force_update(context)
+        return {'FINISHED'}
 
-                continue
 
-            # AMBIENT OCCLUSION TEXTURE
-            if sname[0] == 'Ambient Occlusion':
-                ao_texture = nodes.new(type='ShaderNodeTexImage')
-                img = bpy.data.images.load(path.join(import_path, sname[2]))
-                ao_texture.image = img
-                ao_texture.label = sname[0]
-                if ao_texture.image:
-                    ao_texture.image.colorspace_settings.is_data = True
+def search_texture_sets(self, context, edit_text):
+    library = get_texture_library()
+    index = texture_set_indices.get(library.root) if library else None
+    if index is None:
+        return []
+    return index.search(edit_text, limit=NWAddPrincipledLibrarySetup.max_results)
 
-                continue
 
-            if not active_node.inputs[sname[0]].is_linked:
-                # No texture node connected -> add texture node with new image
-                texture_node = nodes.new(type='ShaderNodeTexImage')
-                img = bpy.data.images.load(path.join(import_path, sname[2]))
-                texture_node.image = img
-
-                # NORMAL NODES
-                if sname[0] == 'Normal':
-                    # Test if new texture node is normal or bump map
-                    fname_components = split_into_components(sname[2])
-                    match_normal = set(normal_abbr).intersection(set(fname_components))
-                    match_bump = set(bump_abbr).intersection(set(fname_components))
-                    if match_normal:
-                        # If Normal add normal node in between
-                        normal_node = nodes.new(type='ShaderNodeNormalMap')
-                        link = connect_sockets(normal_node.inputs[1], texture_node.outputs[0])
-                    elif match_bump:
-                        # If Bump add bump node in between
-                        normal_node = nodes.new(type='ShaderNodeBump')
-                        link = connect_sockets(normal_node.inputs[2], texture_node.outputs[0])
-
-                    link = connect_sockets(active_node.inputs[sname[0]], normal_node.outputs[0])
-                    normal_node_texture = texture_node
-
-                elif sname[0] == 'Roughness':
-                    # Test if glossy or roughness map
-                    fname_components = split_into_components(sname[2])
-                    match_rough = set(rough_abbr).intersection(set(fname_components))
-                    match_gloss = set(gloss_abbr).intersection(set(fname_components))
-
-                    if match_rough:
-                        # If Roughness nothing to to
-                        link = connect_sockets(active_node.inputs[sname[0]], texture_node.outputs[0])
-
-                    elif match_gloss:
-                        # If Gloss Map add invert node
-                        invert_node = nodes.new(type='ShaderNodeInvert')
-                        link = connect_sockets(invert_node.inputs[1], texture_node.outputs[0])
-
-                        link = connect_sockets(active_node.inputs[sname[0]], invert_node.outputs[0])
-                        roughness_node = texture_node
+class NWAddPrincipledLibrarySetup(Operator, NWBase):
+    """Add the textures of a texture set from the texture library to the active Principled BSDF"""
+    bl_idname = "node.fw_add_textures_from_library"
+    bl_label = "Principled Setup from Library"
+    bl_options = {'REGISTER', 'UNDO'}
 
-                else:
-                    # This is a simple connection Texture --> Input slot
-                    link = connect_sockets(active_node.inputs[sname[0]], texture_node.outputs[0])
+    max_results = 50
 
-                # Use non-color except for color inputs
-                if sname[0] not in {'Base Color', 'Emission Color'} and texture_node.image:
-                    texture_node.image.colorspace_settings.is_data = True
+    texture_set: StringProperty(
+        name='Texture Set',
+        search=search_texture_sets,
+        search_options=set(),
+        options={'SKIP_SAVE'},
+    )
+    relative_path: BoolProperty(
+        name='Relative Path',
+        description='Set the file path relative to the blend file, when possible',
+        default=True
+    )
+    bake_corrections: BoolProperty(
+        name='Bake Corrections',
+        description='Save gloss maps inverted into roughness and DirectX normal maps flipped to OpenGL next to them, '
+                    'and use those instead of correcting the maps with nodes',
+        default=False
+    )
 
-            else:
-                # If already texture connected. add to node list for alignment
-                texture_node = active_node.inputs[sname[0]].links[0].from_node
-
-            # This are all connected texture nodes
-            texture_nodes.append(texture_node)
-            texture_node.label = sname[0]
-
-        if disp_texture:
-            texture_nodes.append(disp_texture)
-
-        if ao_texture:
-            # We want the ambient occlusion texture to be the top most texture node
-            texture_nodes.insert(0, ao_texture)
-
-        # Alignment
-        for i, texture_node in enumerate(texture_nodes):
-            offset = Vector((-550, (i * -280) + 200))
-            texture_node.location = active_node.location + offset
-
-        if normal_node:
-            # Extra alignment if normal node was added
-            normal_node.location = normal_node_texture.location + Vector((300, 0))
-
-        if roughness_node:
-            # Alignment of invert node if glossy map
-            invert_node.location = roughness_node.location + Vector((300, 0))
-
-        # Add texture input + mapping
-        mapping = nodes.new(type='ShaderNodeMapping')
-        mapping.location = active_node.location + Vector((-1050, 0))
-        if len(texture_nodes) > 1:
-            # If more than one texture add reroute node in between
-            reroute = nodes.new(type='NodeReroute')
-            texture_nodes.append(reroute)
-            tex_coords = Vector((texture_nodes[0].location.x,
-                                 sum(n.location.y for n in texture_nodes) / len(texture_nodes)))
-            reroute.location = tex_coords + Vector((-50, -120))
-            for texture_node in texture_nodes:
-                link = connect_sockets(texture_node.inputs[0], reroute.outputs[0])
-            link = connect_sockets(reroute.inputs[0], mapping.outputs[0])
-        else:
-            link = connect_sockets(texture_nodes[0].inputs[0], mapping.outputs[0])
-
-        # Connect texture_coordiantes to mapping node
-        texture_input = nodes.new(type='ShaderNodeTexCoord')
-        texture_input.location = mapping.location + Vector((-200, 0))
-        link = connect_sockets(mapping.inputs[0], texture_input.outputs[2])
-
-        # Create frame around tex coords and mapping
-        frame = nodes.new(type='NodeFrame')
-        frame.label = 'Mapping'
-        mapping.parent = frame
-        texture_input.parent = frame
-        frame.update()
-
-        # Create frame around texture nodes
-        frame = nodes.new(type='NodeFrame')
-        frame.label = 'Textures'
-        for tnode in texture_nodes:
-            tnode.parent = frame
-        frame.update()
-
-        # Just to be sure
-        active_node.select = False
-        nodes.update()
-        links.update()
-        force_update(context)
+    @classmethod
+    def poll(cls, context):
+        return fw_check(context) and context.space_data.tree_type == 'ShaderNodeTree'
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, 'texture_set', text="", icon='VIEWZOOM')
+        layout.prop(self, 'relative_path')
+        layout.prop(self, 'bake_corrections')
+
+    def invoke(self, context, event):
+        library = get_texture_library()
+        if library is None:
+            self.report({'WARNING'}, 'Set the Texture Library folder in the add-on preferences')
+            return {'CANCELLED'}
+
+        # Only the directories changed since the last scan are read again
+        changed = library.scan()
+        if changed or library.root not in texture_set_indices:
+            texture_set_indices[library.root] = SearchIndex(
+                (name, [relative], library.set_key(relative, name))
+                for relative, name, _sockets in library.texture_sets())
+        if not texture_set_indices[library.root]:
+            self.report({'INFO'}, 'No texture sets found in the texture library')
+            return {'CANCELLED'}
+
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        return bpy.ops.node.fw_add_textures_for_principled(
+            texture_set=self.texture_set,
+            relative_path=self.relative_path,
+            bake_corrections=self.bake_corrections)
+
+
+class NWAddPrincipledBatchSetup(Operator, NWBase, ImportHelper):
+    """Create one material with a Principled Texture Setup for every texture set found in a folder and its subfolders"""
+    bl_idname = "node.fw_add_principled_materials"
+    bl_label = "Batch Principled Materials"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    # Listing and classifying folders is mostly waiting on the file system
+    max_workers = 8
+
+    directory: StringProperty(
+        name='Directory',
+        subtype='DIR_PATH',
+        default='',
+        description='Folder to search in for texture sets, including its subfolders'
+    )
+    filter_folder: BoolProperty(
+        default=True,
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+    relative_path: BoolProperty(
+        name='Relative Path',
+        description='Set the file path relative to the blend file, when possible',
+        default=True
+    )
+    skip_existing: BoolProperty(
+        name='Skip Existing',
+        description='Don\'t create materials for texture sets that already have a material of the same name',
+        default=True
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.alignment = 'LEFT'
+
+        layout.prop(self, 'relative_path')
+        layout.prop(self, 'skip_existing')
+
+    @classmethod
+    def poll(cls, context):
+        return fw_check(context) and context.space_data.tree_type == 'ShaderNodeTree'
+
+    def execute(self, context):
+        if not self.directory or not path.isdir(self.directory):
+            self.report({'INFO'}, 'No Folder Selected')
+            return {'CANCELLED'}
+
+        tags = fetch_user_preferences().principled_tags
+        library = TextureLibrary(self.directory, principled_sockets(tags))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            library.scan(executor)
+
+        texture_sets = sorted(library.texture_sets())
+        if not texture_sets:
+            self.report({'INFO'}, 'No texture sets found')
+            return {'CANCELLED'}
+
+        # Broken files are skipped up front, rather than failing halfway through a material
+        file_infos, errors = probe_files(
+            path.join(library.root, relative, fname)
+            for relative, _name, set_files in texture_sets for fname in set_files.values())
+        report_broken_files(self, errors)
+
+        # Node and datablock creation has to happen on the main thread
+        wm = context.window_manager
+        wm.progress_begin(0, len(texture_sets))
+        created = 0
+        failed = 0
+        try:
+            for i, (relative, name, set_files) in enumerate(texture_sets):
+                wm.progress_update(i)
+                material_name = name or path.basename(relative) or path.basename(library.root)
+                if self.skip_existing and material_name in bpy.data.materials:
+                    continue
+
+                directory = path.join(library.root, relative, '')
+                import_path = directory
+                if self.relative_path and bpy.data.filepath:
+                    try:
+                        import_path = bpy.path.relpath(directory)
+                    except ValueError:
+                        pass
+
+                socketnames = principled_sockets(tags)
+                for sname in socketnames:
+                    sname[2] = set_files.get(sname[0])
+                socketnames = [s for s in socketnames if s[2] and path.join(directory, s[2]) in file_infos]
+                if not socketnames:
+                    failed += 1
+                    continue
+
+                material = bpy.data.materials.new(material_name)
+                material.use_nodes = True
+                node_tree = material.node_tree
+                principled = next(
+                    (n for n in node_tree.nodes if n.bl_idname == 'ShaderNodeBsdfPrincipled'), None)
+                if principled is None:
+                    principled = node_tree.nodes.new('ShaderNodeBsdfPrincipled')
+
+                set_infos = {s[2]: file_infos[path.join(directory, s[2])] for s in socketnames}
+                try:
+                    # Images used by several sets are loaded once
+                    add_principled_textures(node_tree, principled, socketnames, import_path, tags, set_infos,
+                                            library.tile_sets(relative))
+                except RuntimeError as error:
+                    # Blender couldn't read a file its header looked fine for
+                    bpy.data.materials.remove(material)
+                    self.report({'WARNING'}, f'Skipped {material_name}: {error}')
+                    failed += 1
+                    continue
+                created += 1
+        finally:
+            wm.progress_end()
+
+        message = f'Created {created} materials from {len(texture_sets)} texture sets'
+        if failed:
+            message += f', {failed} failed'
+        self.report({'INFO'}, message)
         return {'FINISHED'}
 
 
@@ -2852,6 +3515,7 @@ class NWAddReroutes(Operator, NWBase):
 
     def execute(self, context):
         tree = context.space_data.edit_tree
+        builder = LinkBuilder(tree)
         added_reroutes = [] 
 
         for node in self.has_outputs(context.selected_nodes):   
@@ -2877,8 +3541,8 @@ class NWAddReroutes(Operator, NWBase):
                     reroute = tree.nodes.new('NodeReroute')
 
                     for link in output.links:
-                        tree.links.new(reroute.outputs[0], link.to_socket)
-                    tree.links.new(output, reroute.inputs[0])
+                        builder.add(reroute.outputs[0], link.to_socket)
+                    builder.add(output, reroute.inputs[0])
 
                     reroute.location = (x, y_loc)
                     added_reroutes.append(reroute)
@@ -2886,6 +3550,9 @@ class NWAddReroutes(Operator, NWBase):
         if len(added_reroutes) <= 0:
             return {'CANCELLED'}
 
+        builder.build()
+        builder.report(self)
+
         bpy.ops.node.select_all(action='DESELECT')
         for node in added_reroutes:
             node.select = True
@@ -2920,6 +3587,7 @@ class NWLinkActiveToSelected(Operator, NWBase):
         use_outputs_names = self.use_outputs_names
         active = nodes.active
         selected = [node for node in nodes if node.select and node != active]
+        builder = LinkBuilder(active.id_data)
         outputs = []  # Only usable outputs of active nodes will be stored here.
         for out in active.outputs:
             if active.type != 'R_LAYERS':
@@ -2966,12 +3634,14 @@ class NWLinkActiveToSelected(Operator, NWBase):
                     if valid:
                         for input in node.inputs:
                             if input.type == out.type or node.type == 'REROUTE':
-                                if replace or not input.is_linked:
-                                    connect_sockets(out, input)
+                                if replace or not builder.is_linked(input):
+                                    builder.add(out, input)
                                     if not use_node_name and not use_outputs_names:
                                         doit = False
                                     break
 
+        builder.build()
+        builder.report(self)
         return {'FINISHED'}
 
 
@@ -3153,22 +3823,119 @@ class NWDetachOutputs(Operator, NWBase):
     bl_label = "Detach Outputs"
     bl_options = {'REGISTER', 'UNDO'}
 
+    @staticmethod
+    def passthrough_socket(socket, selected_names):
+        # Follow internal links back through the selection, the same way delete_reconnect would
+        while socket.node.name in selected_names:
+            internal = next((l for l in socket.node.internal_links if l.to_socket == socket), None)
+            if internal is None or not internal.from_socket.is_linked:
+                return None
+            socket = internal.from_socket.links[0].from_socket
+        return socket
+
     def execute(self, context):
         nodes, links = get_nodes_links(context)
-        selected = context.selected_nodes
-        bpy.ops.node.duplicate_move_keep_inputs()
-        new_nodes = context.selected_nodes
-        bpy.ops.node.select_all(action="DESELECT")
-        for node in selected:
-            node.select = True
-        bpy.ops.node.delete_reconnect()
-        for new_node in new_nodes:
-            new_node.select = True
+        selected = [n for n in context.selected_nodes if n.type != 'FRAME']
+        selected_names = {n.name for n in selected}
+
+        # Links between selected nodes are kept, only links leaving the selection are detached
+        outgoing = [link for node in selected for output in node.outputs for link in output.links
+                    if link.to_node.name not in selected_names]
+
+        for link in outgoing:
+            source = self.passthrough_socket(link.from_socket, selected_names)
+            to_socket = link.to_socket
+            links.remove(link)
+            if source is not None:
+                links.new(source, to_socket)
+
         bpy.ops.transform.translate('INVOKE_DEFAULT')
 
         return {'FINISHED'}
 
 
+class NWExposeSockets(Operator, NWBase):
+    """Link the sockets of selected nodes to new group or zone sockets, all created at once"""
+    bl_idname = "node.fw_expose_sockets"
+    bl_label = "Expose Sockets"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    target: EnumProperty(
+        name="Target",
+        items=(
+            ('GROUP_INPUT', "Group Input", "Link the unlinked inputs of the selected nodes to new Group Input sockets"),
+            ('GROUP_OUTPUT', "Group Output", "Link the unlinked outputs of the selected nodes to new Group Output sockets"),
+            ('ZONE', "Active Zone", "Pass the outputs of the selected nodes through the active simulation or repeat zone"),
+        ),
+    )
+
+    zone_types = ('SIMULATION_INPUT', 'SIMULATION_OUTPUT', 'REPEAT_INPUT', 'REPEAT_OUTPUT')
+
+    @staticmethod
+    def virtual_socket(sockets):
+        return next((s for s in reversed(sockets) if is_virtual_socket(s)), None)
+
+    def execute(self, context):
+        nodes, links = get_nodes_links(context)
+        tree = links.id_data
+        builder = LinkBuilder(tree)
+        target = self.target
+
+        ignored = {'FRAME', 'GROUP_INPUT', 'GROUP_OUTPUT'}
+        selected = [n for n in context.selected_nodes if n.type not in ignored]
+        if not selected:
+            self.report({'ERROR'}, "No valid node(s) in selection")
+            return {'CANCELLED'}
+
+        if target in {'GROUP_INPUT', 'GROUP_OUTPUT'}:
+            if tree not in context.blend_data.node_groups.values():
+                self.report({'ERROR'}, "Sockets can only be exposed inside a node group")
+                return {'CANCELLED'}
+
+            min_x, max_x, min_y, max_y = get_bounds(selected)
+            if target == 'GROUP_INPUT':
+                group_node = next((n for n in nodes if n.type == 'GROUP_INPUT'), None)
+                if group_node is None:
+                    group_node = nodes.new('NodeGroupInput')
+                    group_node.location = (min_x - 250, 0.5 * (min_y + max_y))
+                virtual = self.virtual_socket(group_node.outputs)
+                for node in selected:
+                    for socket in node.inputs:
+                        if is_visible_socket(socket) and not socket.is_linked:
+                            builder.add(virtual, socket)
+            else:
+                group_node = get_group_output_node(tree)
+                if group_node is None:
+                    group_node = nodes.new('NodeGroupOutput')
+                    group_node.location = (max_x + 250, 0.5 * (min_y + max_y))
+                virtual = self.virtual_socket(group_node.inputs)
+                for node in selected:
+                    for socket in node.outputs:
+                        if is_visible_socket(socket) and not socket.is_linked:
+                            builder.add(socket, virtual)
+        else:
+            zone_node = nodes.active
+            if zone_node is None or zone_node.type not in self.zone_types:
+                self.report({'ERROR'}, "Active node must be a simulation or repeat zone node")
+                return {'CANCELLED'}
+
+            virtual = self.virtual_socket(zone_node.inputs)
+            for node in selected:
+                if node.type in self.zone_types:
+                    continue
+                for socket in node.outputs:
+                    if is_visible_socket(socket):
+                        builder.add(socket, virtual)
+
+        if not builder.requests:
+            self.report({'INFO'}, "No sockets to expose")
+            return {'CANCELLED'}
+
+        builder.build()
+        builder.report(self)
+        return {'FINISHED'}
+
+
 class NWLinkToOutputNode(Operator):
     """Link to Composite node or Material Output node"""
     bl_idname = "node.fw_link_out"
@@ -3282,6 +4049,32 @@ class NWCallInputsMenu(Operator, NWBase):
         return {'FINISHED'}
 
 
+# Keeps the enum items of NWAddSequence.sequence alive, Blender doesn't copy them
+sequence_items = []
+
+
+def sequence_enum_items(self, context):
+    sequence_items[:] = [('SELECTED', "Selected File", "Import the sequence the selected file is part of")]
+    for sequence in directory_sequences(self.directory):
+        if len(sequence) > 1:
+            sequence_items.append((sequence.name_with_hashes, sequence.name_with_hashes, sequence.describe()))
+    return sequence_items
+
+
+def load_sequence_image(filepath, sequence):
+    img = images.load_image(filepath, source='SEQUENCE')
+    # Only name new images, reused ones may have been renamed by the user
+    if img.users == 0:
+        img.name = sequence.name_with_hashes
+    return img
+
+
+def use_sequence_frames(image_user, sequence):
+    image_user.frame_offset = sequence.first - 1
+    # Missing frames inside the range are shown as missing instead of cutting the end
+    image_user.frame_duration = sequence.last - sequence.first + 1
+
+
 class NWAddSequence(Operator, NWBase, ImportHelper):
     """Add an Image Sequence"""
     bl_idname = 'node.fw_add_sequence'
@@ -3303,12 +4096,25 @@ class NWAddSequence(Operator, NWBase, ImportHelper):
         description='Set the file path relative to the blend file, when possible',
         default=True
     )
+    sequence: EnumProperty(
+        name='Sequence',
+        description='Image sequence to import, out of the ones found in the folder',
+        items=sequence_enum_items,
+        options={'SKIP_SAVE'}
+    )
+    prefetch: BoolProperty(
+        name='Prefetch Frames',
+        description='Read the next frames ahead of the current one in the background, for smoother scrubbing',
+        default=False
+    )
 
     def draw(self, context):
         layout = self.layout
         layout.alignment = 'LEFT'
 
         layout.prop(self, 'relative_path')
+        layout.prop(self, 'prefetch')
+        layout.prop(self, 'sequence', text="")
 
     def execute(self, context):
         nodes, links = get_nodes_links(context)
@@ -3317,11 +4123,6 @@ class NWAddSequence(Operator, NWBase, ImportHelper):
         files = self.files
         tree = context.space_data.node_tree
 
-        # DEBUG
-        # print ("\nDIR:", directory)
-        # print ("FN:", filename)
-        # print ("Fs:", list(f.name for f in files), '\n')
-
         if tree.type == 'SHADER':
             node_type = "ShaderNodeTexImage"
         elif tree.type == 'COMPOSITING':
@@ -3330,60 +4131,63 @@ class NWAddSequence(Operator, NWBase, ImportHelper):
             self.report({'ERROR'}, "Unsupported Node Tree type!")
             return {'CANCELLED'}
 
-        if not files[0].name and not filename:
-            self.report({'ERROR'}, "No file chosen")
-            return {'CANCELLED'}
-        elif files[0].name and (not filename or not path.exists(directory + filename)):
-            # User has selected multiple files without an active one, or the active one is non-existent
-            filename = files[0].name
-
-        if not path.exists(directory + filename):
-            self.report({'ERROR'}, filename + " does not exist!")
-            return {'CANCELLED'}
-
-        without_ext = '.'.join(filename.split('.')[:-1])
-
-        # if last digit isn't a number, it's not a sequence
-        if not without_ext[-1].isdigit():
-            self.report({'ERROR'}, filename + " does not seem to be part of a sequence")
-            return {'CANCELLED'}
-
-        extension = filename.split('.')[-1]
-        reverse = without_ext[::-1]  # reverse string
-
-        count_numbers = 0
-        for char in reverse:
-            if char.isdigit():
-                count_numbers += 1
-            else:
-                break
-
-        without_num = without_ext[:count_numbers * -1]
-
-        files = sorted(glob(directory + without_num + "[0-9]" * count_numbers + "." + extension))
-
-        num_frames = len(files)
-
-        nodes_list = [node for node in nodes]
-        if nodes_list:
-            nodes_list.sort(key=lambda k: k.location.x)
-            xloc = nodes_list[0].location.x - 220  # place new nodes at far left
-            yloc = 0
-            for node in nodes:
-                node.select = False
-                yloc += node_mid_pt(node, 'y')
-            yloc = yloc / len(nodes)
+        # All sequences of the folder are found in a single pass over it
+        sequences = directory_sequences(directory)
+        if self.sequence != 'SELECTED':
+            sequence = next((s for s in sequences if s.name_with_hashes == self.sequence), None)
+            if sequence is None:
+                self.report({'ERROR'}, self.sequence + " does not exist!")
+                return {'CANCELLED'}
         else:
-            xloc = 0
-            yloc = 0
+            if not files[0].name and not filename:
+                self.report({'ERROR'}, "No file chosen")
+                return {'CANCELLED'}
+            elif files[0].name and (not filename or not path.exists(directory + filename)):
+                # User has selected multiple files without an active one, or the active one is non-existent
+                filename = files[0].name
+
+            if not path.exists(directory + filename):
+                self.report({'ERROR'}, filename + " does not exist!")
+                return {'CANCELLED'}
+
+            sequence = sequence_of(sequences, filename)
+            if sequence is None:
+                self.report({'ERROR'}, filename + " does not seem to be part of a sequence")
+                return {'CANCELLED'}
+
+        if sequence.gaps():
+            self.report({'WARNING'}, sequence.describe())
+        if sequence.duplicate_frames:
+            self.report({'WARNING'}, "Frames {} of {} also exist with a different padding".format(
+                ", ".join(map(str, sequence.duplicate_frames)), sequence.name_with_hashes))
+
+        # Check all frames before the image is created, Blender would only show broken frames once reached
+        file_infos, errors = probe_files(directory + fname for fname in sequence.files)
+        first_path = directory + sequence.files[0]
+        if first_path in errors:
+            self.report({'ERROR'}, sequence.files[0] + ": " + errors[first_path])
+            return {'CANCELLED'}
+        report_broken_files(self, errors)
+        first_info = file_infos[first_path]
+        if first_info is not None:
+            resized = []
+            for frame, fname in zip(sequence.frames, sequence.files):
+                info = file_infos.get(directory + fname)
+                if info is not None and (info.width, info.height) != (first_info.width, first_info.height):
+                    resized.append(frame)
+            if resized:
+                self.report({'WARNING'}, "Frames {} of {} aren't {}x{} like the first frame".format(
+                    ", ".join(map(str, resized[:10])) + (", ..." if len(resized) > 10 else ""),
+                    sequence.name_with_hashes, first_info.width, first_info.height))
 
-        name_with_hashes = without_num + "#" * count_numbers + '.' + extension
+        for node in nodes:
+            node.select = False
 
         bpy.ops.node.add_node('INVOKE_DEFAULT', use_transform=True, type=node_type)
         node = nodes.active
-        node.label = name_with_hashes
+        node.label = sequence.name_with_hashes
 
-        filepath = directory + (without_ext + '.' + extension)
+        filepath = directory + sequence.files[0]
         if self.relative_path:
             if bpy.data.filepath:
                 try:
@@ -3391,14 +4195,12 @@ class NWAddSequence(Operator, NWBase, ImportHelper):
                 except ValueError:
                     pass
 
-        img = bpy.data.images.load(filepath)
-        img.source = 'SEQUENCE'
-        img.name = name_with_hashes
-        node.image = img
+        node.image = load_sequence_image(filepath, sequence)
         image_user = node.image_user if tree.type == 'SHADER' else node
-        # separate the number from the file name of the first  file
-        image_user.frame_offset = int(files[0][len(without_num) + len(directory):-1 * (len(extension) + 1)]) - 1
-        image_user.frame_duration = num_frames
+        use_sequence_frames(image_user, sequence)
+
+        if self.prefetch:
+            bpy.ops.node.fw_prefetch_sequence()
 
         return {'FINISHED'}
 
@@ -3415,6 +4217,36 @@ class NWAddMultipleImages(Operator, NWBase, ImportHelper):
         type=bpy.types.OperatorFileListElement,
         options={'HIDDEN', 'SKIP_SAVE'}
     )
+    as_sequence: BoolProperty(
+        name='Import as Sequence',
+        description='Import selected files that only differ in their frame number as one image sequence',
+        default=False
+    )
+    as_tiles: BoolProperty(
+        name='Import UDIM Tiles',
+        description='Import selected files numbered like UDIM tiles (1001 and up) as one tiled image',
+        default=False
+    )
+
+    def selected_sequences(self):
+        return find_sequences((f.name for f in self.files), min_frames=2)
+
+    def selected_tile_sets(self, sequences=()):
+        sequence_files = {fname for sequence in sequences for fname in sequence.files}
+        return find_tile_sets(f.name for f in self.files if f.name not in sequence_files)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.alignment = 'LEFT'
+
+        layout.prop(self, 'as_sequence')
+        layout.prop(self, 'as_tiles')
+        sequences = self.selected_sequences() if self.as_sequence else ()
+        for sequence in sequences:
+            layout.label(text=sequence.describe(), icon='SEQUENCE')
+        if self.as_tiles:
+            for tile_set in self.selected_tile_sets(sequences):
+                layout.label(text=tile_set.describe(), icon='UV')
 
     def execute(self, context):
         nodes, links = get_nodes_links(context)
@@ -3429,20 +4261,57 @@ class NWAddMultipleImages(Operator, NWBase, ImportHelper):
             self.report({'ERROR'}, "Unsupported Node Tree type!")
             return {'CANCELLED'}
 
+        # Files that are missing or aren't valid images are skipped before any image is loaded
+        _file_infos, errors = probe_files(self.directory + f.name for f in self.files)
+        report_broken_files(self, errors)
+
+        # The files of an image sequence or of a UDIM tile set are loaded as one image
+        sequences = self.selected_sequences() if self.as_sequence else ()
+        file_sequences = {fname: sequence for sequence in sequences for fname in sequence.files}
+        file_tile_sets = {}
+        # Frame ranges like 'shot_1001.exr' look like tiles too, so tiles are only grouped on request.
+        # Compositor image nodes only show the first tile.
+        if self.as_tiles and node_type == "ShaderNodeTexImage":
+            for tile_set in self.selected_tile_sets(sequences):
+                for fname in tile_set.files:
+                    file_tile_sets[fname] = tile_set
+
         new_nodes = []
+        added_groups = set()
         for f in self.files:
             fname = f.name
+            sequence = file_sequences.get(fname)
+            tile_set = file_tile_sets.get(fname)
+            group = sequence or tile_set
+            if group is None and self.directory + fname in errors:
+                continue
+            if group is not None:
+                if group in added_groups:
+                    continue
+                added_groups.add(group)
 
             node = nodes.new(node_type)
             new_nodes.append(node)
-            node.label = fname
             node.hide = True
             node.location.x = xloc
             node.location.y = yloc
             yloc -= 40
 
-            img = bpy.data.images.load(self.directory + fname)
-            node.image = img
+            if sequence is not None:
+                node.label = sequence.name_with_hashes
+                node.image = load_sequence_image(self.directory + sequence.files[0], sequence)
+                use_sequence_frames(node.image_user if node_type == "ShaderNodeTexImage" else node, sequence)
+            elif tile_set is not None:
+                node.label = tile_set.name_with_token
+                node.image = images.load_tiled_image(self.directory + tile_set.files[0], tile_set.tiles)
+            else:
+                node.label = fname
+                img = images.load_image(self.directory + fname)
+                node.image = img
+
+        if not new_nodes:
+            self.report({'INFO'}, 'No valid images selected')
+            return {'CANCELLED'}
 
         # shift new nodes up to center of tree
         list_size = new_nodes[0].location.y - new_nodes[-1].location.y
@@ -3455,6 +4324,54 @@ class NWAddMultipleImages(Operator, NWBase, ImportHelper):
         return {'FINISHED'}
 
 
+class NWPrefetchSequence(Operator):
+    """Read the next frames of the active image sequence node ahead of the current frame, while the frame changes"""
+    bl_idname = "node.fw_prefetch_sequence"
+    bl_label = "Prefetch Sequence"
+    bl_options = {'REGISTER'}
+
+    frames_ahead: IntProperty(
+        name="Frames Ahead",
+        description="Number of frames read ahead of the current one",
+        default=8,
+        min=1,
+        soft_max=64
+    )
+    budget: IntProperty(
+        name="Memory Budget (MB)",
+        description="Most data read ahead of the current frame at any time",
+        default=512,
+        min=16
+    )
+    stop: BoolProperty(
+        name="Stop",
+        description="Stop prefetching the frames of the active node",
+        default=False,
+        options={'HIDDEN', 'SKIP_SAVE'}
+    )
+
+    @classmethod
+    def poll(cls, context):
+        if not fw_check(context):
+            return False
+        node = context.active_node
+        image = getattr(node, "image", None)
+        return image is not None and image.source == 'SEQUENCE'
+
+    def execute(self, context):
+        node = context.active_node
+        if self.stop:
+            prefetchers.stop_prefetching(context, node)
+            return {'FINISHED'}
+
+        prefetcher = prefetchers.start_prefetching(context, node, self.frames_ahead, self.budget << 20)
+        if prefetcher is None:
+            self.report({'WARNING'}, f"No frames found for {node.image.name}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Prefetching {self.frames_ahead} frames of {node.image.name}")
+        return {'FINISHED'}
+
+
 class NWViewerFocus(bpy.types.Operator):
     """Set the viewer tile center to the mouse position"""
     bl_idname = "node.fw_viewer_focus"
@@ -3535,6 +4452,31 @@ class NWSaveViewer(bpy.types.Operator, ExportHelper):
                ('.tif', 'TIFF', "")),
         default='.png',
     )
+    use_16_bit: BoolProperty(
+        name="16 Bit",
+        description="Save PNG files with 16 bits per channel instead of 8, "
+                    "when the scene uses the Standard view transform",
+        default=False,
+    )
+    use_half: BoolProperty(
+        name="Half Float",
+        description="Save OpenEXR files with 16 bit instead of 32 bit floats",
+        default=True,
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "filename_ext")
+        if self.filename_ext == '.png' and viewer_saves.uses_plain_srgb(context.scene):
+            layout.prop(self, "use_16_bit")
+        elif self.filename_ext == '.exr':
+            layout.prop(self, "use_half")
+
+    def saves_in_background(self, context):
+        """Linear OpenEXR files, and PNG files when the view transform is a plain sRGB curve, are written off the main thread."""
+        if self.filename_ext == '.exr':
+            return True
+        return self.filename_ext == '.png' and viewer_saves.uses_plain_srgb(context.scene)
 
     @classmethod
     def poll(cls, context):
@@ -3563,14 +4505,31 @@ class NWSaveViewer(bpy.types.Operator, ExportHelper):
                 '.hdr': 'HDR',
                 '.tiff': 'TIFF',
                 '.tif': 'TIFF'}
-            basename, ext = path.splitext(fp)
-            old_render_format = context.scene.render.image_settings.file_format
-            context.scene.render.image_settings.file_format = formats[self.filename_ext]
-            context.area.type = "IMAGE_EDITOR"
-            context.area.spaces[0].image = bpy.data.images['Viewer Node']
-            context.area.spaces[0].image.save_render(fp)
-            context.area.type = "NODE_EDITOR"
-            context.scene.render.image_settings.file_format = old_render_format
+            viewer = bpy.data.images['Viewer Node']
+            if self.saves_in_background(context):
+                if viewer_saves.queued_count() >= viewer_saves.MAX_QUEUED:
+                    self.report({'WARNING'}, "Too many viewer images are still being saved")
+                    return {'CANCELLED'}
+                width, height = viewer.size
+                # The only copy of the pixels made on the main thread
+                pixels = np.empty(width * height * 4, dtype=np.float32)
+                viewer.pixels.foreach_get(pixels)
+                if self.filename_ext == '.png':
+                    options = {'depth': 16 if self.use_16_bit else 8}
+                else:
+                    options = {'half': self.use_half}
+                viewer_saves.queue_save(bpy.path.abspath(fp), pixels, width, height, **options)
+                self.report({'INFO'}, f"Saving viewer image to {fp}")
+                return {'FINISHED'}
+
+            # Display referred files get the view transform and the output settings of the scene
+            image_settings = context.scene.render.image_settings
+            old_render_format = image_settings.file_format
+            image_settings.file_format = formats[self.filename_ext]
+            try:
+                viewer.save_render(fp, scene=context.scene)
+            finally:
+                image_settings.file_format = old_render_format
             return {'FINISHED'}
 
 
@@ -3585,6 +4544,127 @@ class NWResetNodes(bpy.types.Operator):
         space = context.space_data
         return space.type == 'NODE_EDITOR'
 
+    # Generic node properties that are reset along with the node specific ones.
+    # Everything else defined on bpy.types.Node (name, location, size, parent...) is kept.
+    node_props_to_reset = ('label', 'mute', 'hide', 'color', 'use_custom_color',
+                           'show_options', 'show_preview', 'show_texture')
+
+    @classmethod
+    def node_props_to_keep(cls):
+        return {p.identifier for p in bpy.types.Node.bl_rna.properties} - set(cls.node_props_to_reset)
+
+    @staticmethod
+    def can_reset_in_place(struct, skip=()):
+        # Collections (color ramp elements, curve points, zone items...) can't be copied
+        # from a template node, nodes that own one are re-created instead.
+        for prop in struct.bl_rna.properties:
+            if prop.identifier in skip or prop.identifier == 'rna_type':
+                continue
+            if prop.type == 'COLLECTION':
+                return False
+            if prop.type == 'POINTER' and prop.is_readonly:
+                nested = getattr(struct, prop.identifier)
+                if nested is not None and not NWResetNodes.can_reset_in_place(nested):
+                    return False
+        return True
+
+    @staticmethod
+    def copied_value(value):
+        # Arrays, vectors and colors still point into the node they were read from
+        if hasattr(value, '__len__') and not isinstance(value, (str, set)):
+            return value[:]
+        return value
+
+    @staticmethod
+    def property_values(struct, skip=()):
+        # Values of the writable properties, nested structs (texture mapping, image user...) as dicts.
+        # Writable pointers (images, scenes, objects...) are kept as they are, so they are left out.
+        values = {}
+        for prop in struct.bl_rna.properties:
+            identifier = prop.identifier
+            if identifier in skip or identifier == 'rna_type' or prop.type == 'COLLECTION':
+                continue
+            if prop.type == 'POINTER':
+                nested = getattr(struct, identifier)
+                if prop.is_readonly and nested is not None:
+                    values[identifier] = NWResetNodes.property_values(nested)
+            elif not prop.is_readonly:
+                values[identifier] = NWResetNodes.copied_value(getattr(struct, identifier))
+        return values
+
+    @staticmethod
+    def reset_properties(struct, values):
+        for identifier, value in values.items():
+            if isinstance(value, dict):
+                nested = getattr(struct, identifier, None)
+                if nested is not None:
+                    NWResetNodes.reset_properties(nested, value)
+                continue
+            try:
+                setattr(struct, identifier, value)
+            except (AttributeError, TypeError, ValueError):
+                pass
+
+    @staticmethod
+    def node_defaults(node, templates, skip=()):
+        # Defaults come from the node's init and declaration rather than its RNA,
+        # so they are read once per node type from a temporary node.
+        if node.bl_idname not in templates:
+            nodes = node.id_data.nodes
+            template = nodes.new(node.bl_idname)
+            socket_defaults = {
+                socket.identifier: NWResetNodes.copied_value(socket.default_value)
+                for socket in template.inputs if hasattr(socket, 'default_value')}
+            templates[node.bl_idname] = NWResetNodes.property_values(template, skip), socket_defaults
+            nodes.remove(template)
+        return templates[node.bl_idname]
+
+    @staticmethod
+    def reset_socket_defaults(node, defaults):
+        for socket in node.inputs:
+            if socket.is_linked or socket.identifier not in defaults:
+                continue
+            try:
+                socket.default_value = defaults[socket.identifier]
+            except (AttributeError, TypeError, ValueError):
+                pass
+
+    @staticmethod
+    def recreate_node(node):
+        parent = node.parent if node.parent else None
+        node_loc = [node.location.x, node.location.y]
+
+        node_tree = node.id_data
+        props_to_copy = 'bl_idname name location height width'.split(' ')
+
+        reconnections = []
+        mappings = chain.from_iterable([node.inputs, node.outputs])
+        for i in (i for i in mappings if i.is_linked):
+            for L in i.links:
+                reconnections.append([L.from_socket.path_from_id(), L.to_socket.path_from_id()])
+
+        props = {j: getattr(node, j) for j in props_to_copy}
+
+        new_node = node_tree.nodes.new(props['bl_idname'])
+        props_to_copy.pop(0)
+
+        for prop in props_to_copy:
+            setattr(new_node, prop, props[prop])
+
+        nodes = node_tree.nodes
+        nodes.remove(node)
+        new_node.name = props['name']
+
+        if parent:
+            new_node.parent = parent
+            new_node.location = node_loc
+
+        for str_from, str_to in reconnections:
+            node_tree.links.new(eval(str_from), eval(str_to))
+
+        new_node.select = False
+        return new_node
+
     def execute(self, context):
         node_active = context.active_node
         node_selected = context.selected_nodes
@@ -3633,41 +4713,20 @@ class NWResetNodes(bpy.types.Operator):
             i.select = False
 
         # Run through all valid nodes
+        props_to_keep = self.node_props_to_keep()
+        templates = {}
         for node in valid_nodes:
-
-            parent = node.parent if node.parent else None
-            node_loc = [node.location.x, node.location.y]
-
             node_tree = node.id_data
-            props_to_copy = 'bl_idname name location height width'.split(' ')
-
-            reconnections = []
-            mappings = chain.from_iterable([node.inputs, node.outputs])
-            for i in (i for i in mappings if i.is_linked):
-                for L in i.links:
-                    reconnections.append([L.from_socket.path_from_id(), L.to_socket.path_from_id()])
-
-            props = {j: getattr(node, j) for j in props_to_copy}
 
-            new_node = node_tree.nodes.new(props['bl_idname'])
-            props_to_copy.pop(0)
-
-            for prop in props_to_copy:
-                setattr(new_node, prop, props[prop])
-
-            nodes = node_tree.nodes
-            nodes.remove(node)
-            new_node.name = props['name']
-
-            if parent:
-                new_node.parent = parent
-                new_node.location = node_loc
-
-            for str_from, str_to in reconnections:
-                node_tree.links.new(eval(str_from), eval(str_to))
-
-            new_node.select = False
-            success_names.append(new_node.name)
+            if self.can_reset_in_place(node, skip=props_to_keep):
+                property_values, socket_defaults = self.node_defaults(node, templates, skip=props_to_keep)
+                self.reset_properties(node, property_values)
+                self.reset_socket_defaults(node, socket_defaults)
+                node.select = False
+                success_names.append(node.name)
+            else:
+                new_node = self.recreate_node(node)
+                success_names.append(new_node.name)
 
         # Reselect all nodes
         if selected_node_names and node_active_is_frame is False:
@@ -3694,6 +4753,8 @@ classes = (
     NWPreviewNode,
     NWFrameSelected,
     NWReloadImages,
+    NWMergeDuplicateImages,
+    NWPackChannels,
     NWSwitchNodeType,
     NWMergeNodes,
     NWMergeNodesRefactored,
@@ -3705,15 +4766,19 @@ classes = (
     NWModifyLabels,
     NWAddTextureSetup,
     NWAddPrincipledSetup,
+    NWAddPrincipledLibrarySetup,
+    NWAddPrincipledBatchSetup,
     NWAddReroutes,
     NWLinkActiveToSelected,
     NWAlignNodes,
     NWSelectParentChildren,
     NWDetachOutputs,
+    NWExposeSockets,
     NWLinkToOutputNode,
     NWMakeLink,
     NWCallInputsMenu,
     NWAddSequence,
+    NWPrefetchSequence,
     NWAddMultipleImages,
     NWViewerFocus,
     NWSaveViewer,
@@ -3726,9 +4791,16 @@ def register():
     for cls in classes:
         register_class(cls)
 
+    images.register()
+    prefetchers.register()
+
 
 def unregister():
     from bpy.utils import unregister_class
 
+    images.unregister()
+    prefetchers.unregister()
+    viewer_saves.unregister()
+
     for cls in classes:
         unregister_class(cls)
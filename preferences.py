@@ -3,12 +3,13 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 
 import bpy
-from bpy.props import EnumProperty, BoolProperty, StringProperty, IntVectorProperty
+from bpy.props import EnumProperty, BoolProperty, FloatProperty, StringProperty, IntVectorProperty
 
 from .keymap_defs import kmi_defs
 from . import interface
 
 from .utils.constants import nice_hotkey_name
+from .utils import watcher
 from rna_keymap_ui import _indented_layout as indented_layout
 from itertools import groupby
 
@@ -63,6 +64,17 @@ class NWPrincipledPreferences(bpy.types.PropertyGroup):
         name='Ambient Occlusion',
         default='ao ambient occlusion',
         description='Naming Components for AO maps')
+    ao_rough_metal: StringProperty(
+        name='AO Roughness Metallic',
+        default='orm arm',
+        description='Naming Components for packed maps with AO, roughness and metallic in the red, green and blue channels')
+
+
+def update_image_watcher(self, context):
+    if self.watch_images:
+        watcher.start(self.watch_interval)
+    else:
+        watcher.stop()
 
 
 # Addon prefs
@@ -158,6 +170,27 @@ class NWNodeWrangler(bpy.types.AddonPreferences):
         description='The amount of space between nodes during when the Align Nodes operator is called'
     )
     principled_tags: bpy.props.PointerProperty(type=NWPrincipledPreferences)
+    texture_library_path: StringProperty(
+        name="Texture Library",
+        subtype='DIR_PATH',
+        default="",
+        description="Folder containing texture sets, indexed for the Principled Setup from Library operator"
+    )
+    watch_images: BoolProperty(
+        name="Watch Image Files",
+        default=False,
+        description="Reload images automatically when their files change on disk",
+        update=update_image_watcher
+    )
+    watch_interval: FloatProperty(
+        name="Interval",
+        default=1.0,
+        min=0.1,
+        soft_max=10.0,
+        subtype='TIME_ABSOLUTE',
+        description="Seconds between two checks of the watched image files",
+        update=update_image_watcher
+    )
 
     def draw(self, context):
         layout = self.layout
@@ -195,6 +228,15 @@ class NWNodeWrangler(bpy.types.AddonPreferences):
             col.prop(tags, "emission")
             col.prop(tags, "alpha")
             col.prop(tags, "ambient_occlusion")
+            col.prop(tags, "ao_rough_metal")
+
+        col = layout.column()
+        col.prop(self, "texture_library_path")
+        row = col.row(heading="Watch Image Files")
+        row.prop(self, "watch_images", text="")
+        sub = row.row()
+        sub.active = self.watch_images
+        sub.prop(self, "watch_interval")
 
         box = layout.box()
         col = box.column(align=True)
@@ -257,6 +299,11 @@ def register():
     for cls in classes:
         register_class(cls)
 
+    # The add-on isn't in the preferences yet when it is enabled for the first time
+    addon = bpy.context.preferences.addons.get(__package__)
+    if addon is not None and addon.preferences.watch_images:
+        watcher.start(addon.preferences.watch_interval)
+
     # keymaps
     addon_keymaps.clear()
     kc = bpy.context.window_manager.keyconfigs.addon
@@ -287,6 +334,8 @@ def register():
 
 
 def unregister():
+    watcher.stop()
+
     for cat_types in switch_category_menus:
         bpy.utils.unregister_class(cat_types)
     switch_category_menus.clear()
@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import bpy
+from bpy.app.handlers import persistent
+
+
+# (scene name, view layer name, material name) -> sorted tuple of (domain, attribute name)
+material_attributes = {}
+
+# node group name -> (tuple of (attribute name, domain, data type) stored directly in the group,
+#                     tuple of the node groups used by group nodes inside it)
+group_named_attributes = {}
+
+
+def scan_node_group(tree):
+    """Return the cached Store Named Attribute entries and child groups of a single node group."""
+    key = tree.name_full
+    entry = group_named_attributes.get(key)
+    if entry is None:
+        attrs = []
+        children = {}
+        for node in tree.nodes:
+            if node.type == 'GROUP':
+                if node.node_tree is not None:
+                    children[node.node_tree.name_full] = node.node_tree
+                continue
+
+            if node.bl_label != "Store Named Attribute" or node.mute is True:
+                continue
+
+            attr_name = node.inputs["Name"].default_value
+            if attr_name == "":
+                continue
+
+            attrs.append((attr_name, node.domain, node.data_type))
+
+        entry = (tuple(attrs), tuple(children.values()))
+        group_named_attributes[key] = entry
+    return entry
+
+
+def named_attributes(tree):
+    """
+    Yield (attribute name, domain, data type) for every Store Named Attribute node
+    in tree and in the groups nested inside it.
+
+    Each group is visited once, and its contents come from the cache unless it has
+    been edited since it was last scanned.
+    """
+    visited = set()
+    stack = [tree]
+    while stack:
+        tree = stack.pop()
+        try:
+            key = tree.name_full
+        except ReferenceError:
+            # Group was removed, its users will be rescanned
+            continue
+        if key in visited:
+            continue
+        visited.add(key)
+
+        attrs, children = scan_node_group(tree)
+        yield from attrs
+        stack.extend(reversed(children))
+
+
+def cached_material_attributes(context, material, fetch):
+    """
+    Return the attributes available to material, calling fetch() only when they aren't cached.
+
+    The cache is cleared by the depsgraph handler below whenever something that
+    can add or remove attributes is changed.
+    """
+    key = (context.scene.name, context.view_layer.name, material.name_full)
+    attrs = material_attributes.get(key)
+    if attrs is None:
+        attrs = tuple(sorted(set(fetch()), key=lambda x: (x[0], x[1].startswith("."), x[1])))
+        material_attributes[key] = attrs
+    return attrs
+
+
+def is_attribute_update(update):
+    # Transform and shading changes can't add or remove attributes, geometry changes can.
+    # Modifier edits show up as geometry updates of their object.
+    id_data = update.id
+    if isinstance(id_data, (bpy.types.Mesh, bpy.types.Collection)):
+        return True
+    if isinstance(id_data, bpy.types.GeometryNodeTree):
+        return True
+    if isinstance(id_data, bpy.types.Object):
+        return update.is_updated_geometry
+    return False
+
+
+@persistent
+def invalidate_attribute_cache(scene, depsgraph):
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.GeometryNodeTree):
+            group_named_attributes.pop(update.id.original.name_full, None)
+
+    if material_attributes and any(is_attribute_update(update) for update in depsgraph.updates):
+        material_attributes.clear()
+
+
+@persistent
+def clear_attribute_cache(*args):
+    material_attributes.clear()
+    group_named_attributes.clear()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_attribute_cache)
+    bpy.app.handlers.load_post.append(clear_attribute_cache)
+    bpy.app.handlers.undo_post.append(clear_attribute_cache)
+    bpy.app.handlers.redo_post.append(clear_attribute_cache)
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_attribute_cache)
+    bpy.app.handlers.load_post.remove(clear_attribute_cache)
+    bpy.app.handlers.undo_post.remove(clear_attribute_cache)
+    bpy.app.handlers.redo_post.remove(clear_attribute_cache)
+    clear_attribute_cache()
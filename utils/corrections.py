@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import os
+
+import numpy as np
+
+
+# Rows quantized at once, keeps the float temporaries of 8K images around 128 MB
+CHUNK_ROWS = 1024
+
+
+def invert_colors(pixels):
+    """Turn gloss into roughness, 1 - value for the RGB channels of flat RGBA pixels, in place."""
+    rgb = pixels.reshape(-1, 4)[:, :3]
+    np.subtract(1.0, rgb, out=rgb)
+
+
+def flip_green(pixels):
+    """Turn a DirectX normal map into an OpenGL one, 1 - value for the green channel of flat RGBA pixels, in place."""
+    green = pixels[1::4]
+    np.subtract(1.0, green, out=green)
+
+
+def quantize_into(pixels, quantized, source_channels=slice(None), target_channels=slice(None),
+                  chunk_rows=CHUNK_ROWS):
+    """
+    Quantize source_channels of flat, bottom to top RGBA float pixels into target_channels
+    of quantized, top to bottom rows of unsigned integers shaped (height, width, channels).
+    Values are clipped to 0..1 and converted chunk_rows rows at a time, so no float copy
+    of the whole image is made.
+    """
+    height, width = quantized.shape[:2]
+    rows = pixels.reshape(height, width, 4)
+    max_value = np.iinfo(quantized.dtype).max
+    for start in range(0, height, chunk_rows):
+        end = min(start + chunk_rows, height)
+        values = np.clip(rows[start:end, :, source_channels], 0.0, 1.0)
+        values *= max_value
+        # Blender's first row is the bottom one
+        quantized[height - end:height - start, :, target_channels] = np.rint(values[::-1])
+
+
+def quantize(pixels, width, height, depth=8, chunk_rows=CHUNK_ROWS):
+    """
+    Return flat, bottom to top RGBA float pixels as top to bottom rows of 8 or 16 bit
+    integers, the way encode_png_data() takes them.
+    """
+    quantized = np.empty((height, width, 4), dtype=np.uint16 if depth == 16 else np.uint8)
+    quantize_into(pixels, quantized, chunk_rows=chunk_rows)
+    return quantized
+
+
+def is_cached(source_path, target_path):
+    """Return whether target_path was written after the last change of source_path."""
+    try:
+        return os.stat(target_path).st_mtime_ns >= os.stat(source_path).st_mtime_ns
+    except OSError:
+        return False
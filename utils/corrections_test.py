@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import os
+import tempfile
+import unittest
+from os import path
+
+import numpy as np
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == "__main__":
+    from corrections import flip_green, invert_colors, is_cached, quantize
+else:
+    from .corrections import flip_green, invert_colors, is_cached, quantize
+
+
+def pixels_fixture():
+    return np.array([0.25, 0.5, 1.0, 1.0,
+                     0.0, 0.75, 0.5, 0.5], dtype=np.float32)
+
+
+class TestCorrections(unittest.TestCase):
+    def test_invert_colors(self):
+        pixels = pixels_fixture()
+        invert_colors(pixels)
+        self.assertEqual(pixels.tolist(), [0.75, 0.5, 0.0, 1.0, 1.0, 0.25, 0.5, 0.5])
+
+    def test_flip_green(self):
+        pixels = pixels_fixture()
+        flip_green(pixels)
+        self.assertEqual(pixels.tolist(), [0.25, 0.5, 1.0, 1.0, 0.0, 0.25, 0.5, 0.5])
+
+
+class TestQuantize(unittest.TestCase):
+    def test_rows_flipped(self):
+        # One pixel per row, bottom row first
+        quantized = quantize(pixels_fixture(), 1, 2, chunk_rows=1)
+        self.assertEqual(quantized[:, 0].tolist(), [[0, 191, 128, 128], [64, 128, 255, 255]])
+
+    def test_16_bit(self):
+        quantized = quantize(np.array([2.0, -1.0, 0.5, 1.0], dtype=np.float32), 1, 1, depth=16)
+        self.assertEqual(quantized.dtype, np.uint16)
+        self.assertEqual(quantized[0, 0].tolist(), [65535, 0, 32768, 65535])
+
+
+class TestIsCached(unittest.TestCase):
+    def test_is_cached(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = path.join(directory, "gloss.png")
+            target = path.join(directory, "rough.png")
+            open(source, "wb").close()
+            self.assertFalse(is_cached(source, target))
+            open(target, "wb").close()
+            os.utime(source, ns=(0, 1_000_000_000))
+            os.utime(target, ns=(0, 2_000_000_000))
+            self.assertTrue(is_cached(source, target))
+            os.utime(source, ns=(0, 3_000_000_000))
+            self.assertFalse(is_cached(source, target))
+
+
+if __name__ == "__main__":
+    unittest.main()
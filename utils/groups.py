@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import bpy
+from bpy.app.handlers import persistent
+
+
+# node group name -> frozenset of the names of every group it contains, itself included
+group_reachability = {}
+# edit tree name -> names of the groups that can be added to it without recursion
+valid_group_names = {}
+# names of the node groups the caches above were built for
+cached_group_names = None
+
+
+def refresh_group_cache():
+    # Adding, removing or renaming groups changes the names, which drops the cache
+    global cached_group_names
+    names = tuple(bpy.data.node_groups.keys())
+    if names != cached_group_names:
+        clear_group_cache()
+        cached_group_names = names
+
+
+def contained_groups(group):
+    """Return the names of all groups used inside group at any depth, including its own."""
+    key = group.name_full
+    reach = group_reachability.get(key)
+    if reach is None:
+        reach = {key}
+        # Stored before recursing, so a dependency cycle can't recurse forever
+        group_reachability[key] = reach
+        for node in group.nodes:
+            if node.type == 'GROUP' and node.node_tree is not None:
+                reach |= contained_groups(node.node_tree)
+        reach = frozenset(reach)
+        group_reachability[key] = reach
+    return reach
+
+
+def valid_groups(node_tree):
+    """
+    Return the names of the node groups that can be used inside node_tree.
+
+    Same as checking group.contains_tree(node_tree) for every group, but answered from
+    the cached reachability sets, which are only rebuilt after groups have changed.
+    """
+    refresh_group_cache()
+
+    key = node_tree.name_full
+    names = valid_group_names.get(key)
+    if names is None:
+        names = tuple(
+            group.name for group in bpy.data.node_groups
+            if (group.bl_idname == node_tree.bl_idname and
+                not group.name.startswith('.') and
+                key not in contained_groups(group)))
+        valid_group_names[key] = names
+    return names
+
+
+@persistent
+def invalidate_group_cache(scene, depsgraph):
+    if valid_group_names and any(isinstance(update.id, bpy.types.NodeTree) for update in depsgraph.updates):
+        clear_group_cache()
+
+
+@persistent
+def clear_group_cache(*args):
+    group_reachability.clear()
+    valid_group_names.clear()
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(invalidate_group_cache)
+    bpy.app.handlers.load_post.append(clear_group_cache)
+    bpy.app.handlers.undo_post.append(clear_group_cache)
+    bpy.app.handlers.redo_post.append(clear_group_cache)
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(invalidate_group_cache)
+    bpy.app.handlers.load_post.remove(clear_group_cache)
+    bpy.app.handlers.undo_post.remove(clear_group_cache)
+    bpy.app.handlers.redo_post.remove(clear_group_cache)
+    clear_group_cache()
@@ -0,0 +1,334 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from dataclasses import dataclass
+import mmap
+import os
+from os import path
+import struct
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SIGNATURE = b"\xff\xd8"
+EXR_SIGNATURE = struct.pack("<i", 20000630)
+TIFF_SIGNATURES = (b"II*\0", b"MM\0*", b"II+\0", b"MM\0+")
+
+# Extensions of the formats read here, to Blender's file format identifiers
+FORMAT_EXTENSIONS = {
+    ".png": 'PNG',
+    ".jpg": 'JPEG',
+    ".jpeg": 'JPEG',
+    ".tif": 'TIFF',
+    ".tiff": 'TIFF',
+    ".tga": 'TARGA',
+    ".exr": 'OPEN_EXR',
+}
+
+# Names of the formats in messages
+FORMAT_NAMES = {'PNG': "PNG", 'JPEG': "JPEG", 'TIFF': "TIFF", 'TARGA': "TGA", 'OPEN_EXR': "OpenEXR"}
+
+# PNG color type -> number of channels
+PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+# JPEG start of frame markers, the others in that range aren't
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# JPEG markers without a length
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01}
+
+# TIFF tags and the byte size of the field types
+TIFF_WIDTH = 256
+TIFF_HEIGHT = 257
+TIFF_BITS_PER_SAMPLE = 258
+TIFF_SAMPLES_PER_PIXEL = 277
+TIFF_SAMPLE_FORMAT = 339
+TIFF_FLOAT_FORMAT = 3
+TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 6: 1, 7: 1, 8: 2, 9: 4, 10: 8, 11: 4, 12: 8, 16: 8, 17: 8, 18: 8}
+TIFF_INTEGER_TYPES = {1: "B", 3: "H", 4: "I", 16: "Q"}
+
+TGA_COLOR_MAPPED = {1, 9}
+TGA_GRAYSCALE = {3, 11}
+TGA_TRUE_COLOR = {2, 10}
+
+EXR_MULTIPART = 0x1000
+# OpenEXR pixel type -> bits per channel
+EXR_BIT_DEPTHS = {0: 32, 1: 16, 2: 32}
+EXR_UINT = 0
+
+
+@dataclass(frozen=True, slots=True)
+class ImageInfo:
+    """What the header of an image file tells about it, without decoding its pixels."""
+    # Blender's file format identifier, like 'PNG' or 'OPEN_EXR'
+    file_format: str
+    width: int
+    height: int
+    channels: int
+    # Bits per channel
+    bit_depth: int
+    is_float: bool = False
+    # Full channel names of OpenEXR files, like 'ViewLayer.Combined.R'
+    channel_names: tuple = ()
+
+    @property
+    def is_grayscale(self):
+        if self.channel_names:
+            return not {"R", "G", "B"} & {name.rpartition(".")[2] for name in self.channel_names}
+        return self.channels <= 2
+
+    @property
+    def is_multilayer(self):
+        return any("." in name for name in self.channel_names)
+
+    @property
+    def has_alpha(self):
+        if self.channel_names:
+            return any(name.rpartition(".")[2] == "A" for name in self.channel_names)
+        return self.channels in {2, 4}
+
+    def layers(self):
+        """Return {layer name: channel names} of an OpenEXR file, in file order, '' for the channels without layer."""
+        layers = {}
+        for name in self.channel_names:
+            layer, _dot, channel = name.rpartition(".")
+            layers.setdefault(layer, []).append(channel)
+        return {layer: tuple(channels) for layer, channels in layers.items()}
+
+    def memory_size(self):
+        """Bytes taken by the pixels once loaded, Blender keeps them as RGBA bytes or floats."""
+        bytes_per_channel = 4 if self.is_float or self.bit_depth > 8 else 1
+        return self.width * self.height * 4 * bytes_per_channel
+
+    def describe(self):
+        """'2048x2048 PNG, 4 channels, 8 bit'"""
+        if self.is_multilayer:
+            channels = f"{len(self.layers())} layers, {self.channels} channels"
+        else:
+            channels = f"{self.channels} channel{'s' if self.channels > 1 else ''}"
+        depth = f"{self.bit_depth} bit{' float' if self.is_float else ''}"
+        return f"{self.width}x{self.height} {FORMAT_NAMES[self.file_format]}, {channels}, {depth}"
+
+
+def read_png(data):
+    width, height, bit_depth, color_type = struct.unpack_from(">IIBB", data, 16)
+    if data[12:16] != b"IHDR" or color_type not in PNG_CHANNELS:
+        raise ValueError("Invalid PNG header")
+    channels = PNG_CHANNELS[color_type]
+
+    # A transparency chunk adds an alpha channel, it comes before the image data
+    position = 33
+    while channels in {1, 3}:
+        length, = struct.unpack_from(">I", data, position)
+        chunk_type = data[position + 4:position + 8]
+        if chunk_type == b"tRNS":
+            channels += 1
+        elif chunk_type in {b"IDAT", b"IEND"} or len(chunk_type) < 4:
+            break
+        position += 12 + length
+    return ImageInfo('PNG', width, height, channels, bit_depth)
+
+
+def read_jpeg(data):
+    position = 2
+    while True:
+        if data[position] != 0xFF:
+            raise ValueError("Invalid JPEG marker")
+        # Markers can be padded with any number of 0xFF bytes
+        while data[position] == 0xFF:
+            position += 1
+        marker = data[position]
+        position += 1
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker in {0xD9, 0xDA}:
+            raise ValueError("JPEG file without frame header")
+        length, = struct.unpack_from(">H", data, position)
+        if marker in JPEG_SOF_MARKERS:
+            precision, height, width, components = struct.unpack_from(">BHHB", data, position + 2)
+            return ImageInfo('JPEG', width, height, components, precision)
+        position += length
+
+
+def read_tiff(data):
+    order = "<" if data[:2] == b"II" else ">"
+    if data[2:4] in {b"*\0", b"\0*"}:
+        offset_format, count_format, entry_size, field_size = "I", "H", 12, 4
+        ifd_offset, = struct.unpack_from(order + "I", data, 4)
+    else:
+        # BigTIFF, with 64 bit offsets
+        offset_format, count_format, entry_size, field_size = "Q", "Q", 20, 8
+        ifd_offset, = struct.unpack_from(order + "Q", data, 8)
+
+    entry_count, = struct.unpack_from(order + count_format, data, ifd_offset)
+    position = ifd_offset + struct.calcsize(count_format)
+    tags = {}
+    for entry in range(entry_count):
+        entry_position = position + entry * entry_size
+        tag, field_type = struct.unpack_from(order + "HH", data, entry_position)
+        if field_type not in TIFF_INTEGER_TYPES:
+            continue
+        count, = struct.unpack_from(order + offset_format, data, entry_position + 4)
+        value_position = entry_position + 4 + field_size
+        # Values that don't fit in the entry are stored elsewhere
+        if count * TIFF_TYPE_SIZES[field_type] > field_size:
+            value_position, = struct.unpack_from(order + offset_format, data, value_position)
+        tags[tag] = struct.unpack_from(f"{order}{count}{TIFF_INTEGER_TYPES[field_type]}", data, value_position)
+
+    if TIFF_WIDTH not in tags or TIFF_HEIGHT not in tags:
+        raise ValueError("TIFF file without image size")
+    channels = tags.get(TIFF_SAMPLES_PER_PIXEL, (1,))[0]
+    bit_depth = max(tags.get(TIFF_BITS_PER_SAMPLE, (1,)))
+    is_float = TIFF_FLOAT_FORMAT in tags.get(TIFF_SAMPLE_FORMAT, ())
+    return ImageInfo('TIFF', tags[TIFF_WIDTH][0], tags[TIFF_HEIGHT][0], channels, bit_depth, is_float)
+
+
+def read_tga(data):
+    (_id_length, color_map_type, image_type, _map_start, _map_length, map_entry_size,
+     _x, _y, width, height, pixel_depth, descriptor) = struct.unpack_from("<BBBHHBHHHHBB", data)
+    if (color_map_type not in {0, 1} or pixel_depth not in {8, 15, 16, 24, 32}
+            or image_type not in TGA_COLOR_MAPPED | TGA_GRAYSCALE | TGA_TRUE_COLOR):
+        raise ValueError("Invalid TGA header")
+
+    has_alpha = bool(descriptor & 0x0F)
+    if image_type in TGA_GRAYSCALE:
+        channels = 2 if has_alpha or pixel_depth == 16 else 1
+    elif image_type in TGA_COLOR_MAPPED:
+        channels = 4 if map_entry_size == 32 else 3
+    else:
+        channels = 4 if has_alpha or pixel_depth == 32 else 3
+    bit_depth = 5 if image_type in TGA_TRUE_COLOR and pixel_depth in {15, 16} else 8
+    return ImageInfo('TARGA', width, height, channels, bit_depth)
+
+
+def read_string(data, position):
+    """Return the null terminated string at position and the position after it."""
+    end = data.find(b"\0", position)
+    if end < 0:
+        raise IndexError("Unterminated string")
+    return data[position:end].decode("utf-8", "replace"), end + 1
+
+
+def read_exr_channels(data, position):
+    channels = []
+    while True:
+        name, position = read_string(data, position)
+        if not name:
+            return channels
+        pixel_type, = struct.unpack_from("<i", data, position)
+        channels.append((name, pixel_type))
+        position += 16
+
+
+def read_exr(data):
+    version, = struct.unpack_from("<i", data, 4)
+    position = 8
+    parts = []
+    while True:
+        attributes = {}
+        name, position = read_string(data, position)
+        # An empty header ends the headers of multipart files
+        if not name:
+            break
+        while name:
+            attribute_type, position = read_string(data, position)
+            size, = struct.unpack_from("<i", data, position)
+            position += 4
+            if attribute_type in {"chlist", "box2i", "string"}:
+                attributes[name] = position, size
+            position += size
+            name, position = read_string(data, position)
+        parts.append(attributes)
+        if not version & EXR_MULTIPART:
+            break
+
+    if not parts or "channels" not in parts[0] or "dataWindow" not in parts[0]:
+        raise ValueError("Invalid OpenEXR header")
+    x_min, y_min, x_max, y_max = struct.unpack_from("<iiii", data, parts[0]["dataWindow"][0])
+
+    channels = []
+    for attributes in parts:
+        part_name = ""
+        if "name" in attributes and len(parts) > 1:
+            # Strings are sized by their attribute, they aren't null terminated
+            position, size = attributes["name"]
+            part_name = data[position:position + size].decode("utf-8", "replace")
+        for name, pixel_type in read_exr_channels(data, attributes["channels"][0]):
+            channels.append((f"{part_name}.{name}" if part_name else name, pixel_type))
+
+    if not channels or any(pixel_type not in EXR_BIT_DEPTHS for _name, pixel_type in channels):
+        raise ValueError("Invalid OpenEXR channels")
+    bit_depth = max(EXR_BIT_DEPTHS[pixel_type] for _name, pixel_type in channels)
+    is_float = any(pixel_type != EXR_UINT for _name, pixel_type in channels)
+    return ImageInfo('OPEN_EXR', x_max - x_min + 1, y_max - y_min + 1, len(channels), bit_depth, is_float,
+                     tuple(name for name, _pixel_type in channels))
+
+
+def read_header(data, extension):
+    """Return the ImageInfo of the file contents in data, or None when it isn't in a format read here."""
+    if data[:8] == PNG_SIGNATURE:
+        reader, file_format = read_png, 'PNG'
+    elif data[:2] == JPEG_SIGNATURE:
+        reader, file_format = read_jpeg, 'JPEG'
+    elif data[:4] in TIFF_SIGNATURES:
+        reader, file_format = read_tiff, 'TIFF'
+    elif data[:4] == EXR_SIGNATURE:
+        reader, file_format = read_exr, 'OPEN_EXR'
+    elif extension == ".tga":
+        # TGA files don't start with a signature
+        reader, file_format = read_tga, 'TARGA'
+    elif extension in FORMAT_EXTENSIONS:
+        raise ValueError(f"Not a {FORMAT_NAMES[FORMAT_EXTENSIONS[extension]]} file")
+    else:
+        return None
+
+    try:
+        info = reader(data)
+    except (struct.error, IndexError):
+        raise ValueError(f"Truncated {FORMAT_NAMES[file_format]} header") from None
+    if info.width <= 0 or info.height <= 0:
+        raise ValueError(f"Invalid {FORMAT_NAMES[file_format]} image size")
+    return info
+
+
+def probe_image(file_path):
+    """
+    Return the ImageInfo of the image file at file_path, or None when it isn't a PNG,
+    JPEG, TIFF, TGA or OpenEXR file.
+
+    The file is mapped instead of read, so only the pages holding its header are
+    loaded. Raises ValueError when the header is damaged and OSError when the file
+    can't be opened. Nothing is shared between calls, so files can be probed in
+    parallel on a thread pool.
+    """
+    extension = path.splitext(file_path)[1].lower()
+    with open(file_path, "rb") as image_file:
+        # Empty files can't be mapped
+        if os.fstat(image_file.fileno()).st_size == 0:
+            return read_header(b"", extension)
+        with mmap.mmap(image_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return read_header(data, extension)
+
+
+def probe_file(file_path):
+    try:
+        return probe_image(file_path), None
+    except OSError as error:
+        return None, error.strerror or str(error)
+    except ValueError as error:
+        return None, str(error)
+
+
+def probe_images(file_paths, executor=None):
+    """
+    Probe the headers of file_paths, with executor.map() when an executor is given.
+
+    Returns {file path: ImageInfo or None} for the files that can be used, None
+    for the ones in other formats, and {file path: error message} for the others.
+    """
+    map_files = executor.map if executor is not None else map
+    infos = {}
+    errors = {}
+    file_paths = list(file_paths)
+    for file_path, (info, error) in zip(file_paths, map_files(probe_file, file_paths)):
+        if error is None:
+            infos[file_path] = info
+        else:
+            errors[file_path] = error
+    return infos, errors
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import struct
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+import numpy as np
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == "__main__":
+    from image_probe import probe_image, probe_images
+    from image_writers import EXR_MAGIC, encode_exr, encode_png, exr_attribute
+else:
+    from .image_probe import probe_image, probe_images
+    from .image_writers import EXR_MAGIC, encode_exr, encode_png, exr_attribute
+
+
+def jpeg_fixture(width, height, components):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\0\1\1\0\0\1\0\1\0\0"
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 8 + 3 * components, 8, height, width, components)
+    return b"\xff\xd8" + app0 + b"\xff\xff" + sof0 + b"\0" * 3 * components + b"\xff\xd9"
+
+
+def tiff_fixture(order, width, height, bits):
+    entries = [(256, 4, 1, width), (257, 4, 1, height), (277, 3, 1, len(bits))]
+    # Three or more bits per sample don't fit in the entry
+    bits_offset = 8 + 2 + 12 * (len(entries) + 1) + 4
+    entries.append((258, 3, len(bits), bits_offset if len(bits) > 2 else bits[0]))
+    header = (b"II*\0" if order == "<" else b"MM\0*") + struct.pack(order + "I", 8)
+    ifd = struct.pack(order + "H", len(entries))
+    for tag, field_type, count, value in sorted(entries):
+        value_bytes = struct.pack(order + ("H" if field_type == 3 and count == 1 else "I"), value)
+        ifd += struct.pack(order + "HHI", tag, field_type, count) + value_bytes.ljust(4, b"\0")
+    return header + ifd + b"\0\0\0\0" + struct.pack(f"{order}{len(bits)}H", *bits)
+
+
+def multilayer_exr_fixture():
+    channels = b"".join(name.encode() + b"\0" + struct.pack("<iB3xii", 1, 0, 1, 1) for name in (
+        "Combined.A", "Combined.B", "Combined.G", "Combined.R", "Depth.V")) + b"\0"
+    return struct.pack("<ii", EXR_MAGIC, 2) + b"".join((
+        exr_attribute("channels", "chlist", channels),
+        exr_attribute("compression", "compression", b"\0"),
+        exr_attribute("dataWindow", "box2i", struct.pack("<iiii", 0, 0, 1919, 1079)),
+    )) + b"\0"
+
+
+def multipart_exr_fixture():
+    def part(name, channel_names):
+        channels = b"".join(channel.encode() + b"\0" + struct.pack("<iB3xii", 2, 0, 1, 1)
+                            for channel in channel_names) + b"\0"
+        return b"".join((
+            exr_attribute("channels", "chlist", channels),
+            exr_attribute("dataWindow", "box2i", struct.pack("<iiii", 0, 0, 63, 31)),
+            # The name is followed by other attributes, its string isn't null terminated
+            exr_attribute("name", "string", name.encode()),
+            exr_attribute("type", "string", b"scanlineimage"),
+        )) + b"\0"
+
+    # Version 2 with the multipart flag, an empty header ends the headers
+    return struct.pack("<ii", EXR_MAGIC, 2 | 0x1000) + part("diffuse", "BGR") + part("specular", "G") + b"\0"
+
+
+class ProbeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, fname, data):
+        file_path = path.join(self.directory.name, fname)
+        with open(file_path, "wb") as image_file:
+            image_file.write(data)
+        return file_path
+
+    def probe(self, fname, data):
+        return probe_image(self.write(fname, data))
+
+
+class TestProbeImage(ProbeTestCase):
+    def test_png(self):
+        pixels = np.zeros(3 * 2 * 4, dtype=np.float32)
+        info = self.probe("color.png", encode_png(pixels, 3, 2, depth=16))
+        self.assertEqual((info.file_format, info.width, info.height), ('PNG', 3, 2))
+        self.assertEqual((info.channels, info.bit_depth, info.is_float), (4, 16, False))
+        self.assertTrue(info.has_alpha)
+        # 16 bit images are loaded as floats
+        self.assertEqual(info.memory_size(), 3 * 2 * 4 * 4)
+
+    def test_jpeg(self):
+        info = self.probe("photo.jpg", jpeg_fixture(640, 480, 1))
+        self.assertEqual((info.file_format, info.width, info.height), ('JPEG', 640, 480))
+        self.assertEqual((info.channels, info.bit_depth), (1, 8))
+        self.assertTrue(info.is_grayscale)
+
+    def test_tiff(self):
+        for order in "<>":
+            with self.subTest(order=order):
+                info = self.probe("scan.tif", tiff_fixture(order, 300, 200, (16, 16, 16)))
+                self.assertEqual((info.file_format, info.width, info.height), ('TIFF', 300, 200))
+                self.assertEqual((info.channels, info.bit_depth), (3, 16))
+                self.assertFalse(info.is_grayscale)
+
+    def test_tga(self):
+        header = struct.pack("<BBBHHBHHHHBB", 0, 0, 2, 0, 0, 0, 0, 0, 64, 32, 32, 8)
+        info = self.probe("sprite.tga", header + b"\0" * 64 * 32 * 4)
+        self.assertEqual((info.file_format, info.width, info.height), ('TARGA', 64, 32))
+        self.assertEqual((info.channels, info.bit_depth), (4, 8))
+
+    def test_exr(self):
+        pixels = np.zeros(4 * 4 * 4, dtype=np.float32)
+        info = self.probe("render.exr", encode_exr(pixels, 4, 4, half=False))
+        self.assertEqual((info.file_format, info.width, info.height), ('OPEN_EXR', 4, 4))
+        self.assertEqual((info.bit_depth, info.is_float), (32, True))
+        self.assertEqual(info.channel_names, ("A", "B", "G", "R"))
+        self.assertFalse(info.is_multilayer)
+
+    def test_multilayer_exr(self):
+        info = self.probe("passes.exr", multilayer_exr_fixture())
+        self.assertEqual((info.width, info.height, info.channels), (1920, 1080, 5))
+        self.assertTrue(info.is_multilayer)
+        self.assertEqual(info.layers(), {"Combined": ("A", "B", "G", "R"), "Depth": ("V",)})
+        self.assertEqual(info.describe(), "1920x1080 OpenEXR, 2 layers, 5 channels, 16 bit float")
+
+    def test_multipart_exr(self):
+        info = self.probe("parts.exr", multipart_exr_fixture())
+        self.assertEqual((info.width, info.height, info.bit_depth), (64, 32, 32))
+        self.assertEqual(info.channel_names, ("diffuse.B", "diffuse.G", "diffuse.R", "specular.G"))
+
+    def test_unknown_format(self):
+        self.assertIsNone(self.probe("notes.txt", b"Not an image"))
+        self.assertIsNone(self.probe("empty.hdr", b""))
+
+    def test_damaged(self):
+        png = encode_png(np.zeros(4, dtype=np.float32), 1, 1)
+        with self.assertRaisesRegex(ValueError, "Truncated PNG"):
+            self.probe("truncated.png", png[:20])
+        with self.assertRaisesRegex(ValueError, "Not a JPEG"):
+            self.probe("page.jpg", b"<html></html>")
+        with self.assertRaisesRegex(ValueError, "Truncated TGA"):
+            self.probe("empty.tga", b"")
+
+
+class TestProbeImages(ProbeTestCase):
+    def test_probe_images(self):
+        valid = self.write("valid.jpg", jpeg_fixture(8, 8, 3))
+        other = self.write("other.webp", b"RIFF")
+        damaged = self.write("damaged.exr", struct.pack("<ii", EXR_MAGIC, 2))
+        missing = path.join(self.directory.name, "missing.png")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            infos, errors = probe_images([valid, other, damaged, missing], executor)
+        self.assertEqual(list(infos), [valid, other])
+        self.assertEqual(infos[valid].channels, 3)
+        self.assertIsNone(infos[other])
+        self.assertEqual(errors, {damaged: "Truncated OpenEXR header", missing: "No such file or directory"})
+
+
+if __name__ == "__main__":
+    unittest.main()
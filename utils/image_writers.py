@@ -0,0 +1,155 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import os
+import struct
+import zlib
+
+import numpy as np
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+EXR_MAGIC = 20000630
+# Scanlines per chunk of ZIP compressed OpenEXR files
+EXR_ZIP_LINES = 16
+EXR_NO_COMPRESSION = 0
+EXR_ZIP_COMPRESSION = 3
+EXR_HALF = 1
+EXR_FLOAT = 2
+
+
+def to_rows(pixels, width, height):
+    """Turn Blender's flat, bottom to top RGBA pixels into top to bottom rows."""
+    return np.asarray(pixels, dtype=np.float32).reshape(height, width, 4)[::-1]
+
+
+def linear_to_srgb(values):
+    """Apply the sRGB transfer function to linear values, clipped to 0..1."""
+    values = np.clip(values, 0.0, 1.0)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * np.power(values, 1 / 2.4) - 0.055)
+
+
+def png_chunk(chunk_type, data):
+    return (struct.pack(">I", len(data)) + chunk_type + data +
+            struct.pack(">I", zlib.crc32(chunk_type + data) & 0xFFFFFFFF))
+
+
+def encode_png(pixels, width, height, depth=8):
+    """
+    Encode premultiplied linear RGBA float pixels as an sRGB PNG with straight alpha.
+
+    The scene view transform isn't applied, only the standard sRGB transfer function.
+    """
+    rows = to_rows(pixels, width, height)
+    alpha = rows[..., 3:4]
+    color = np.divide(rows[..., :3], alpha, out=np.zeros_like(rows[..., :3]), where=alpha > 0)
+    rgba = np.concatenate((linear_to_srgb(color), np.clip(alpha, 0.0, 1.0)), axis=2)
+
+    max_value = (1 << depth) - 1
+    dtype = np.uint16 if depth == 16 else np.uint8
+    return encode_png_data(np.rint(rgba * max_value).astype(dtype))
+
+
+def encode_png_data(data):
+    """
+    Encode top to bottom rows of RGB or RGBA values as a PNG, as they are.
+
+    data has the shape (height, width, channels), uint8 for 8 bit files or uint16 for 16 bit ones.
+    """
+    height, width, channels = data.shape
+    depth = data.dtype.itemsize * 8
+    rows = data.astype(data.dtype.newbyteorder(">"), copy=False).view(np.uint8).reshape(height, -1)
+    # Every scanline starts with its filter type, 0 for none
+    raw = np.hstack((np.zeros((height, 1), dtype=np.uint8), rows)).tobytes()
+
+    color_type = 6 if channels == 4 else 2
+    header = struct.pack(">IIBBBBB", width, height, depth, color_type, 0, 0, 0)
+    return (PNG_SIGNATURE + png_chunk(b"IHDR", header) +
+            png_chunk(b"IDAT", zlib.compress(raw, 6)) + png_chunk(b"IEND", b""))
+
+
+def exr_attribute(name, attribute_type, data):
+    return name.encode() + b"\0" + attribute_type.encode() + b"\0" + struct.pack("<i", len(data)) + data
+
+
+def exr_zip(data):
+    """Compress a chunk the way OpenEXR ZIP compression expects it."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    # Even bytes first, then odd bytes, followed by a delta predictor
+    interleaved = np.concatenate((raw[0::2], raw[1::2]))
+    predicted = interleaved.copy()
+    predicted[1:] = (interleaved[1:].astype(np.int16) - interleaved[:-1] + 128) & 0xFF
+    return zlib.compress(predicted.tobytes(), 6)
+
+
+def encode_exr(pixels, width, height, half=True, compress=True):
+    """Encode linear RGBA float pixels as a scanline OpenEXR file, unchanged."""
+    rows = to_rows(pixels, width, height)
+    dtype = np.dtype("<f2") if half else np.dtype("<f4")
+    pixel_type = EXR_HALF if half else EXR_FLOAT
+    # Channels are stored in alphabetical order
+    planar = rows[..., [3, 2, 1, 0]].astype(dtype).transpose(0, 2, 1)
+
+    channels = b"".join(
+        name.encode() + b"\0" + struct.pack("<iB3xii", pixel_type, 0, 1, 1) for name in "ABGR") + b"\0"
+    box = struct.pack("<iiii", 0, 0, width - 1, height - 1)
+    header = struct.pack("<ii", EXR_MAGIC, 2) + b"".join((
+        exr_attribute("channels", "chlist", channels),
+        exr_attribute("compression", "compression",
+                      bytes((EXR_ZIP_COMPRESSION if compress else EXR_NO_COMPRESSION,))),
+        exr_attribute("dataWindow", "box2i", box),
+        exr_attribute("displayWindow", "box2i", box),
+        exr_attribute("lineOrder", "lineOrder", b"\0"),
+        exr_attribute("pixelAspectRatio", "float", struct.pack("<f", 1.0)),
+        exr_attribute("screenWindowCenter", "v2f", struct.pack("<ff", 0.0, 0.0)),
+        exr_attribute("screenWindowWidth", "float", struct.pack("<f", 1.0)),
+    )) + b"\0"
+
+    lines_per_chunk = EXR_ZIP_LINES if compress else 1
+    chunks = []
+    for y in range(0, height, lines_per_chunk):
+        data = planar[y:y + lines_per_chunk].tobytes()
+        if compress:
+            packed = exr_zip(data)
+            # Chunks that don't get smaller are stored as they are
+            if len(packed) < len(data):
+                data = packed
+        chunks.append(struct.pack("<ii", y, len(data)) + data)
+
+    offset = len(header) + 8 * len(chunks)
+    offsets = []
+    for chunk in chunks:
+        offsets.append(offset)
+        offset += len(chunk)
+    return header + struct.pack(f"<{len(offsets)}Q", *offsets) + b"".join(chunks)
+
+
+ENCODERS = {
+    ".png": encode_png,
+    ".exr": encode_exr,
+}
+
+
+def write_image(filepath, pixels, width, height, **options):
+    """
+    Encode and write pixels to filepath, in the format of its extension.
+
+    Meant to run on a worker thread. The file is written next to its final path first,
+    so a file being replaced is never seen half written.
+    """
+    encoder = ENCODERS[os.path.splitext(filepath)[1].lower()]
+    return write_file(filepath, encoder(pixels, width, height, **options))
+
+
+def write_file(filepath, data):
+    """Write the encoded data to filepath, through a temporary file next to it."""
+    temp_path = filepath + ".tmp"
+    try:
+        with open(temp_path, "wb") as image_file:
+            image_file.write(data)
+        os.replace(temp_path, filepath)
+    except OSError:
+        # Don't leave a half written file behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return filepath
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from os import path
+
+import numpy as np
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == "__main__":
+    from image_writers import EXR_MAGIC, encode_exr, encode_png, write_image
+else:
+    from .image_writers import EXR_MAGIC, encode_exr, encode_png, write_image
+
+
+WIDTH, HEIGHT = 5, 40
+
+
+def pixels_fixture():
+    """Bottom row red, the rest half transparent linear gray."""
+    pixels = np.full((HEIGHT, WIDTH, 4), 0.25, dtype=np.float32)
+    pixels[..., 3] = 0.5
+    pixels[0] = (1.0, 0.0, 0.0, 1.0)
+    return pixels.ravel()
+
+
+def decode_png(data):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position = 8
+    chunks = {}
+    while position < len(data):
+        length, = struct.unpack(">I", data[position:position + 4])
+        chunk_type = data[position + 4:position + 8]
+        chunk = data[position + 8:position + 8 + length]
+        crc, = struct.unpack(">I", data[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(chunk_type + chunk)
+        chunks[chunk_type] = chunks.get(chunk_type, b"") + chunk
+        position += 12 + length
+
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, -1)
+    assert not raw[:, 0].any()
+    dtype = ">u2" if depth == 16 else np.uint8
+    return width, height, color_type, raw[:, 1:].copy().view(dtype).reshape(height, width, 4)
+
+
+def decode_exr(data):
+    magic, version = struct.unpack("<ii", data[:8])
+    assert (magic, version) == (EXR_MAGIC, 2)
+    position = 8
+    attributes = {}
+    while data[position] != 0:
+        name_end = data.index(b"\0", position)
+        type_end = data.index(b"\0", name_end + 1)
+        size, = struct.unpack("<i", data[type_end + 1:type_end + 5])
+        attributes[data[position:name_end].decode()] = data[type_end + 5:type_end + 5 + size]
+        position = type_end + 5 + size
+    position += 1
+
+    _x_min, _y_min, x_max, y_max = struct.unpack("<iiii", attributes["dataWindow"])
+    width, height = x_max + 1, y_max + 1
+    compression = attributes["compression"][0]
+    pixel_type, = struct.unpack("<i", attributes["channels"][2:6])
+    dtype = np.dtype("<f2") if pixel_type == 1 else np.dtype("<f4")
+    lines = 16 if compression == 3 else 1
+
+    chunk_count = -(-height // lines)
+    offsets = struct.unpack(f"<{chunk_count}Q", data[position:position + 8 * chunk_count])
+    rows = []
+    for offset in offsets:
+        y, size = struct.unpack("<ii", data[offset:offset + 8])
+        chunk = data[offset + 8:offset + 8 + size]
+        block_lines = min(lines, height - y)
+        expected = block_lines * 4 * width * dtype.itemsize
+        if size < expected:
+            predicted = np.frombuffer(zlib.decompress(chunk), dtype=np.uint8)
+            deltas = np.concatenate(([predicted[0]], predicted[1:].astype(np.int64) - 128))
+            interleaved = (np.cumsum(deltas) & 0xFF).astype(np.uint8)
+            half = (len(interleaved) + 1) // 2
+            raw = np.empty_like(interleaved)
+            raw[0::2] = interleaved[:half]
+            raw[1::2] = interleaved[half:]
+            chunk = raw.tobytes()
+        rows.append(np.frombuffer(chunk, dtype=dtype).reshape(block_lines, 4, width))
+    # Back to RGBA, top to bottom
+    return width, height, np.concatenate(rows).transpose(0, 2, 1)[..., [3, 2, 1, 0]]
+
+
+class TestEncodePNG(unittest.TestCase):
+    def test_8_bit(self):
+        width, height, color_type, pixels = decode_png(encode_png(pixels_fixture(), WIDTH, HEIGHT))
+        self.assertEqual((width, height, color_type), (WIDTH, HEIGHT, 6))
+        # The bottom row is the last one in the file
+        self.assertEqual(pixels[-1, 0].tolist(), [255, 0, 0, 255])
+        # 0.25 linear, premultiplied by 0.5 alpha, is 0.5 straight, 188 in sRGB
+        self.assertEqual(pixels[0, 0].tolist(), [188, 188, 188, 128])
+
+    def test_16_bit(self):
+        _width, _height, _color_type, pixels = decode_png(
+            encode_png(pixels_fixture(), WIDTH, HEIGHT, depth=16))
+        self.assertEqual(pixels[-1, 0].tolist(), [65535, 0, 0, 65535])
+
+
+class TestEncodeEXR(unittest.TestCase):
+    def test_half_zip(self):
+        width, height, pixels = decode_exr(encode_exr(pixels_fixture(), WIDTH, HEIGHT))
+        self.assertEqual((width, height), (WIDTH, HEIGHT))
+        expected = pixels_fixture().reshape(HEIGHT, WIDTH, 4)[::-1]
+        np.testing.assert_array_equal(pixels.astype(np.float32), expected)
+
+    def test_float_uncompressed(self):
+        _width, _height, pixels = decode_exr(
+            encode_exr(pixels_fixture(), WIDTH, HEIGHT, half=False, compress=False))
+        expected = pixels_fixture().reshape(HEIGHT, WIDTH, 4)[::-1]
+        np.testing.assert_array_equal(pixels, expected)
+
+
+class TestWriteImage(unittest.TestCase):
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = path.join(directory, "viewer.exr")
+            self.assertEqual(write_image(filepath, pixels_fixture(), WIDTH, HEIGHT), filepath)
+            self.assertTrue(path.isfile(filepath))
+            self.assertFalse(path.exists(filepath + ".tmp"))
+
+    def test_failed_write_cleaned_up(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # A directory can't be replaced by the written file
+            filepath = path.join(directory, "viewer.png")
+            os.mkdir(filepath)
+            with self.assertRaises(OSError):
+                write_image(filepath, pixels_fixture(), WIDTH, HEIGHT)
+            self.assertFalse(path.exists(filepath + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
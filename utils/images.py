@@ -0,0 +1,254 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import os
+from os import path
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .sequences import udim_token_path
+
+
+# (normalized file path, source, is_data) -> (image name, library file path or None)
+image_index = {}
+# Number of images in the file when the index was built, new images rebuild it
+indexed_image_count = None
+# (image name, library file path or None) -> (mtime in ns, size) of its file when it was last read
+image_file_stats = {}
+
+
+def normalized_path(filepath, library=None):
+    """Return filepath as an absolute path, so different spellings of the same file compare equal."""
+    return path.normcase(path.normpath(bpy.path.abspath(filepath, library=library)))
+
+
+def image_file_path(image):
+    """Return the normalized path of the file an image is read from, or None if it isn't read from a file."""
+    if image.source not in {'FILE', 'SEQUENCE', 'TILED', 'MOVIE'} or not image.filepath or image.packed_file:
+        return None
+    return normalized_path(image.filepath, library=image.library)
+
+
+def image_key(image):
+    filepath = image_file_path(image)
+    if filepath is None:
+        return None
+    if image.source == 'TILED':
+        # Tiled images can still point at the file of one of their tiles
+        filepath = normalized_path(udim_token_path(image.filepath), library=image.library)
+    return filepath, image.source, image.colorspace_settings.is_data
+
+
+def image_id(image):
+    return image.name, image.library.filepath if image.library else None
+
+
+def index_image(image):
+    key = image_key(image)
+    if key is not None:
+        image_index.setdefault(key, image_id(image))
+
+
+def refresh_image_index():
+    global indexed_image_count
+    if indexed_image_count == len(bpy.data.images):
+        return
+    image_index.clear()
+    for image in bpy.data.images:
+        index_image(image)
+    indexed_image_count = len(bpy.data.images)
+
+
+def find_image(filepath, source='FILE', is_data=False):
+    """Return the image already using the file at filepath in the same way, or None."""
+    refresh_image_index()
+    if source == 'TILED':
+        filepath = udim_token_path(filepath)
+    key = normalized_path(filepath), source, is_data
+    entry = image_index.get(key)
+    if entry is None:
+        return None
+
+    image = bpy.data.images.get(entry)
+    if image is None or image_key(image) != key:
+        # Renamed, or pointed at another file since it was indexed
+        clear_image_index()
+        refresh_image_index()
+        entry = image_index.get(key)
+        image = bpy.data.images.get(entry) if entry else None
+    return image
+
+
+def load_image(filepath, source='FILE', is_data=False):
+    """
+    Return an image for the file at filepath, only loading it when no image uses it yet.
+
+    Images are shared when they read the same file, however its path is spelled, with
+    the same source and color data setting. Otherwise a new image is loaded and set up.
+    """
+    image = find_image(filepath, source, is_data)
+    if image is not None:
+        return image
+
+    global indexed_image_count
+    image = bpy.data.images.load(filepath)
+    if source != 'FILE':
+        image.source = source
+    if is_data:
+        image.colorspace_settings.is_data = True
+    index_image(image)
+    indexed_image_count = len(bpy.data.images)
+    record_file_stat(image)
+    return image
+
+
+def load_tiled_image(filepath, tiles, is_data=False):
+    """
+    Return a tiled image for the UDIM tiles numbered tiles, filepath being the file of
+    one of them. Images are shared like with load_image().
+    """
+    image = load_image(filepath, source='TILED', is_data=is_data)
+    # Blender looks for the tiles next to the file when the source changes, add the ones it missed
+    numbers = {tile.number for tile in image.tiles}
+    for tile in tiles:
+        if tile not in numbers:
+            image.tiles.new(tile_number=tile)
+    return image
+
+
+def file_stat(image):
+    """Return (mtime in ns, size) of the file of a single file image, or None."""
+    if image.source != 'FILE':
+        return None
+    filepath = image_file_path(image)
+    if filepath is None:
+        return None
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def record_file_stat(image):
+    stat = file_stat(image)
+    if stat is not None:
+        image_file_stats[image_id(image)] = stat
+
+
+def file_changed(image):
+    """
+    Return whether the file of an image changed since it was last read.
+
+    Sequences, movies and UDIM tiles read several files and always count as changed.
+    Images without a file, packed ones and the ones whose file is missing never do.
+    """
+    if image.source in {'SEQUENCE', 'MOVIE', 'TILED'}:
+        return image_file_path(image) is not None
+    stat = file_stat(image)
+    return stat is not None and stat != image_file_stats.get(image_id(image))
+
+
+def reload_images(images, force=False):
+    """
+    Reload each of the images whose file changed once, or all of them when force is set.
+
+    Returns the list of reloaded images.
+    """
+    reloaded = []
+    seen = set()
+    for image in images:
+        key = image_id(image)
+        if key in seen:
+            continue
+        seen.add(key)
+        if force or file_changed(image):
+            image.reload()
+            record_file_stat(image)
+            reloaded.append(image)
+    return reloaded
+
+
+def node_images(nodes):
+    """Yield the images used by image nodes and image texture nodes, once per node."""
+    for node in nodes:
+        if node.type == "TEXTURE":
+            texture = node.texture
+            if texture and texture.type in {'IMAGE', 'ENVIRONMENT_MAP'} and texture.image:
+                yield texture.image
+        elif node.type in {"IMAGE", "TEX_IMAGE", "TEX_ENVIRONMENT"}:
+            if node.image:
+                yield node.image
+
+
+def all_node_trees():
+    """Yield every node tree of the file: node groups and the trees embedded in other datablocks."""
+    yield from bpy.data.node_groups
+    for datablocks in (bpy.data.materials, bpy.data.worlds, bpy.data.lights, bpy.data.scenes, bpy.data.textures):
+        for datablock in datablocks:
+            node_tree = getattr(datablock, "node_tree", None)
+            if node_tree is not None:
+                yield node_tree
+
+
+def duplicate_images():
+    """
+    Return lists of local images that read the same file with the same settings.
+
+    The first image of each list is the one that is kept when merging, it is the one
+    with the most users.
+    """
+    groups = {}
+    for image in bpy.data.images:
+        if image.library is not None or image.is_dirty:
+            continue
+        key = image_key(image)
+        if key is None:
+            continue
+        key += (image.colorspace_settings.name, image.alpha_mode)
+        groups.setdefault(key, []).append(image)
+
+    return [
+        sorted(images, key=lambda image: (-image.users, image.name))
+        for images in groups.values() if len(images) > 1]
+
+
+def merge_duplicate_images():
+    """Point all users of duplicate images to a single one and remove the others, returns how many were removed."""
+    removed = 0
+    for keep, *duplicates in duplicate_images():
+        for duplicate in duplicates:
+            duplicate.user_remap(keep)
+            bpy.data.images.remove(duplicate)
+            removed += 1
+    clear_image_index()
+    return removed
+
+
+@persistent
+def clear_image_index(*args):
+    global indexed_image_count
+    image_index.clear()
+    indexed_image_count = None
+
+
+@persistent
+def clear_file_stats(*args):
+    # Image names only identify images within one file, undo keeps them valid
+    image_file_stats.clear()
+
+
+def register():
+    bpy.app.handlers.load_post.append(clear_image_index)
+    bpy.app.handlers.load_post.append(clear_file_stats)
+    bpy.app.handlers.undo_post.append(clear_image_index)
+    bpy.app.handlers.redo_post.append(clear_image_index)
+
+
+def unregister():
+    bpy.app.handlers.load_post.remove(clear_image_index)
+    bpy.app.handlers.load_post.remove(clear_file_stats)
+    bpy.app.handlers.undo_post.remove(clear_image_index)
+    bpy.app.handlers.redo_post.remove(clear_image_index)
+    clear_image_index()
+    clear_file_stats()
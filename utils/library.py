@@ -0,0 +1,258 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from collections import namedtuple
+import json
+import os
+from os import path
+
+# XXX Not really nice, but that hack is needed to allow execution of the tests
+#     from the utils folder, where this module isn't part of a package.
+if __package__:
+    from .paths import COMPONENT_BOUNDARY, DIGITS, match_files_to_socket_names, split_into_components
+    from .sequences import find_tile_sets
+else:
+    from paths import COMPONENT_BOUNDARY, DIGITS, match_files_to_socket_names, split_into_components
+    from sequences import find_tile_sets
+
+
+# Bumped whenever the layout of the stored index changes, older indices are rebuilt
+INDEX_VERSION = 2
+
+IMAGE_EXTENSIONS = {
+    ".bmp", ".cin", ".dds", ".dpx", ".exr", ".hdr", ".j2c", ".jp2", ".jpeg", ".jpg",
+    ".png", ".psd", ".rgb", ".sgi", ".tga", ".tif", ".tiff", ".webp",
+}
+
+# Normal map flavours, they are part of the map name and not of the set name
+NORMAL_VARIANTS = {"gl", "dx", "directx", "opengl"}
+
+# Same interface as the files of an ImportHelper, for match_files_to_socket_names()
+LibraryFile = namedtuple('LibraryFile', ['name'])
+
+
+def set_name(fname, all_tags):
+    """
+    Return the name of the texture set fname belongs to, or None if it matches no tag.
+
+    The set name is the file name without its extension and without the last run of
+    tags, which names the map. Digits are kept, so numbered variations and
+    resolutions stay separate sets.
+    'Wood_Floor_nor_gl_2k.exr' -> 'wood floor 2k'
+    """
+    if all_tags.isdisjoint(split_into_components(fname)):
+        return None
+
+    words = COMPONENT_BOUNDARY.sub(" ", path.splitext(fname)[0]).lower().split(" ")
+    is_tag = [DIGITS.sub("", word) in all_tags or word in NORMAL_VARIANTS for word in words]
+
+    end = len(words)
+    while end and not is_tag[end - 1]:
+        end -= 1
+    start = end
+    while start and is_tag[start - 1]:
+        start -= 1
+
+    return " ".join(word for word in words[:start] + words[end:] if word)
+
+
+def group_texture_sets(file_names, sockets, allow_directx=False):
+    """
+    Group the image files of a single directory into texture sets.
+
+    Sockets and allow_directx are used like by match_files_to_socket_names(). Returns a mapping
+    from set names to {socket name: file name}, sets without any matched socket are
+    left out. UDIM tile sets are matched by their first file, like the Principled
+    Texture Setup does, and named without their tile number.
+    """
+    all_tags = set()
+    for socket in sockets:
+        all_tags.update(socket[1])
+
+    file_names = list(file_names)
+    tile_names = {}
+    for tile_set in find_tile_sets(file_names):
+        tile_names[tile_set.files[0]] = tile_set.prefix + tile_set.extension
+        tile_names.update((fname, None) for fname in tile_set.files[1:])
+
+    groups = {}
+    for fname in file_names:
+        if fname in tile_names:
+            if tile_names[fname] is None:
+                continue
+            name = set_name(tile_names[fname], all_tags)
+        else:
+            name = set_name(fname, all_tags)
+        if name is not None:
+            groups.setdefault(name, []).append(LibraryFile(fname))
+
+    texture_sets = {}
+    for name, files in groups.items():
+        set_sockets = [[socket[0], socket[1], None] for socket in sockets]
+        match_files_to_socket_names(files, set_sockets, allow_directx)
+        matched = {socket[0]: socket[2] for socket in set_sockets if socket[2]}
+        if matched:
+            texture_sets[name] = matched
+    return texture_sets
+
+
+class TextureLibrary:
+    """
+    Index of the texture sets found anywhere below a root directory.
+
+    Each directory is stored with its modification time, the image files it contains
+    and the texture sets made out of them. scan() only lists directories whose
+    modification time has changed, which happens when files are added, removed or
+    renamed in them. The index is kept as JSON at index_path between sessions.
+    """
+
+    def __init__(self, root, sockets, index_path=None):
+        self.root = path.normpath(root)
+        self.sockets = [[socket[0], list(socket[1])] for socket in sockets]
+        self.index_path = index_path
+        # relative directory -> {"mtime_ns", "subdirs", "files", "sets"}
+        self.directories = {}
+
+    def load(self):
+        """Read the stored index, returns False when there is none for this root."""
+        if not self.index_path or not path.isfile(self.index_path):
+            return False
+        try:
+            with open(self.index_path, encoding="utf-8") as index_file:
+                data = json.load(index_file)
+        except (OSError, ValueError) as error:
+            print(f"Ignoring texture library index {self.index_path}: {error}")
+            return False
+
+        if data.get("version") != INDEX_VERSION or data.get("root") != self.root:
+            return False
+
+        self.directories = data["directories"]
+        if data["sockets"] != self.sockets:
+            # The tags changed, the file lists are still valid but the sets aren't
+            for entry in self.directories.values():
+                entry["sets"] = group_texture_sets(entry["files"], self.sockets)
+            self.save()
+        return True
+
+    def save(self):
+        if not self.index_path:
+            return
+        os.makedirs(path.dirname(self.index_path), exist_ok=True)
+        data = {
+            "version": INDEX_VERSION,
+            "root": self.root,
+            "sockets": self.sockets,
+            "directories": self.directories,
+        }
+        # Written next to the index first, so an interrupted save keeps the old one
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as index_file:
+            json.dump(data, index_file, separators=(",", ":"))
+        os.replace(temp_path, self.index_path)
+
+    def read_directory(self, directory, mtime_ns):
+        subdirs = []
+        files = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                    files.append(entry.name)
+        subdirs.sort()
+        files.sort()
+        return {
+            "mtime_ns": mtime_ns,
+            "subdirs": subdirs,
+            "files": files,
+            "sets": group_texture_sets(files, self.sockets),
+        }
+
+    def update_directory(self, relative):
+        """
+        Return (entry, whether it was read again) for a directory, or None if it is gone.
+
+        Only reads the index, so it can run for several directories at once.
+        """
+        directory = path.join(self.root, relative) if relative else self.root
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+        entry = self.directories.get(relative)
+        if entry is not None and entry["mtime_ns"] == mtime_ns:
+            return entry, False
+        try:
+            return self.read_directory(directory, mtime_ns), True
+        except OSError as error:
+            print(f"Skipping {directory}: {error}")
+            return None
+
+    def scan(self, executor=None):
+        """
+        Bring the index up to date with the directories below root.
+
+        The directories of each level of the tree are updated with executor.map()
+        when an executor is given, so listing and classifying them happens off the
+        calling thread. Returns the number of directories that were read again or removed.
+        """
+        map_directories = executor.map if executor is not None else map
+        directories = {}
+        changed = 0
+        level = [""]
+        while level:
+            next_level = []
+            for relative, result in zip(level, map_directories(self.update_directory, level)):
+                if result is None:
+                    continue
+                entry, was_read = result
+                changed += was_read
+                directories[relative] = entry
+                next_level.extend(path.join(relative, subdir) for subdir in entry["subdirs"])
+            level = next_level
+
+        # Directories that weren't reached anymore were removed
+        changed += len(self.directories.keys() - directories.keys())
+        if changed:
+            self.directories = directories
+            self.save()
+        return changed
+
+    def texture_sets(self):
+        """Yield (relative directory, set name, {socket name: file name}) for every set."""
+        for relative, entry in self.directories.items():
+            for name, sockets in entry["sets"].items():
+                yield relative, name, sockets
+
+    @staticmethod
+    def set_key(relative, name):
+        return path.join(relative, name) if relative else name
+
+    def tile_sets(self, relative):
+        """Return {first file: TileSet} of the UDIM tile sets in a directory."""
+        entry = self.directories.get(relative)
+        if entry is None:
+            return {}
+        return {tile_set.files[0]: tile_set for tile_set in find_tile_sets(entry["files"])}
+
+    def get(self, key, allow_directx=False):
+        """
+        Return (absolute directory, {socket name: file name}, {first file: TileSet}) of a set, or None.
+
+        The index holds the sets without DirectX normal maps, with allow_directx the
+        files of the directory are matched again to fall back on them.
+        """
+        relative, name = path.split(key)
+        entry = self.directories.get(relative)
+        if entry is None:
+            return None
+        sets = group_texture_sets(entry["files"], self.sockets, allow_directx) if allow_directx else entry["sets"]
+        if name not in sets:
+            return None
+        set_files = sets[name]
+        tile_sets = {fname: tile_set for fname, tile_set in self.tile_sets(relative).items()
+                     if fname in set_files.values()}
+        return path.join(self.root, relative), set_files, tile_sets
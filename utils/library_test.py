@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == "__main__":
+    from library import TextureLibrary, group_texture_sets, set_name
+else:
+    from .library import TextureLibrary, group_texture_sets, set_name
+
+
+# From NWPrincipledPreferences, as in paths_test.py
+def sockets_fixture():
+    return [
+        ["Displacement", "displacement displace disp dsp height heightmap".split(" "), None],
+        ["Base Color", "diffuse diff albedo base col color basecolor".split(" "), None],
+        ["Metallic", "metallic metalness metal mtl".split(" "), None],
+        ["Specular IOR Level", "specularity specular spec spc".split(" "), None],
+        ["Roughness", "roughness rough rgh gloss glossy glossiness".split(" "), None],
+        ["Normal", "normal nor nrm nrml norm bump bmp".split(" "), None],
+        ["Transmission Weight", "transmission transparency".split(" "), None],
+        ["Emission Color", "emission emissive emit".split(" "), None],
+        ["Alpha", "alpha opacity".split(" "), None],
+        ["Ambient Occlusion", "ao ambient occlusion".split(" "), None],
+    ]
+
+
+ALL_TAGS = {tag for socket in sockets_fixture() for tag in socket[1]}
+
+
+def touch(*parts):
+    file_path = path.join(*parts)
+    os.makedirs(path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8"):
+        pass
+
+
+class TestSetName(unittest.TestCase):
+    def test_map_tag_removed(self):
+        self.assertEqual(set_name("Wood_Floor_diff_2k.jpg", ALL_TAGS), "wood floor 2k")
+        self.assertEqual(set_name("Wood_Floor_nor_gl_2k.exr", ALL_TAGS), "wood floor 2k")
+        self.assertEqual(set_name("WoodFloorRoughness.png", ALL_TAGS), "wood floor")
+
+    def test_tags_in_set_name(self):
+        self.assertEqual(set_name("metal_plate_diff.png", ALL_TAGS), "metal plate")
+        self.assertEqual(set_name("metal_plate_ambient_occlusion.png", ALL_TAGS), "metal plate")
+
+    def test_untagged(self):
+        self.assertIsNone(set_name("preview.jpg", ALL_TAGS))
+
+
+class TestGroupTextureSets(unittest.TestCase):
+    def test_two_sets(self):
+        files = [
+            "bricks_diff_1k.jpg",
+            "bricks_rough_1k.jpg",
+            "bricks_nor_gl_1k.jpg",
+            "bricks_nor_dx_1k.jpg",
+            "planks_diff_1k.jpg",
+            "planks_disp_1k.png",
+            "render.jpg",
+        ]
+        sets = group_texture_sets(files, sockets_fixture())
+        self.assertEqual(sets, {
+            "bricks 1k": {
+                "Base Color": "bricks_diff_1k.jpg",
+                "Roughness": "bricks_rough_1k.jpg",
+                "Normal": "bricks_nor_gl_1k.jpg",
+            },
+            "planks 1k": {
+                "Base Color": "planks_diff_1k.jpg",
+                "Displacement": "planks_disp_1k.png",
+            },
+        })
+
+    def test_udim_tiles(self):
+        files = [f"rock_{name}.{tile}.exr" for name in ("albedo", "nrm") for tile in (1001, 1002)]
+        self.assertEqual(group_texture_sets(files, sockets_fixture()), {
+            "rock": {"Base Color": "rock_albedo.1001.exr", "Normal": "rock_nrm.1001.exr"},
+        })
+
+
+class TestTextureLibrary(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = path.join(self.temp_dir.name, "library")
+        self.index_path = path.join(self.temp_dir.name, "index", "library.json")
+        touch(self.root, "bricks", "bricks_diff.png")
+        touch(self.root, "bricks", "bricks_rough.png")
+        touch(self.root, "wood", "oak", "oak_albedo.jpg")
+        touch(self.root, "wood", "oak", "oak_normal.jpg")
+        touch(self.root, "wood", "pine", "pine_diffuse.jpg")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def library(self):
+        return TextureLibrary(self.root, sockets_fixture(), self.index_path)
+
+    def test_scan(self):
+        library = self.library()
+        self.assertEqual(library.scan(), 5)
+        self.assertEqual(
+            sorted((relative, name) for relative, name, _sockets in library.texture_sets()),
+            [("bricks", "bricks"), (path.join("wood", "oak"), "oak"), (path.join("wood", "pine"), "pine")])
+
+        directory, sockets, tile_sets = library.get(path.join("wood", "oak", "oak"))
+        self.assertEqual(directory, path.join(self.root, "wood", "oak"))
+        self.assertEqual(sockets, {"Base Color": "oak_albedo.jpg", "Normal": "oak_normal.jpg"})
+        self.assertEqual(tile_sets, {})
+        self.assertIsNone(library.get("missing"))
+
+    def test_scan_with_executor(self):
+        library = self.library()
+        library.scan()
+
+        threaded = TextureLibrary(self.root, sockets_fixture())
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.assertEqual(threaded.scan(executor), 5)
+        self.assertEqual(threaded.directories, library.directories)
+
+    def test_rescan_unchanged(self):
+        self.library().scan()
+
+        library = self.library()
+        self.assertTrue(library.load())
+        self.assertEqual(library.scan(), 0)
+        self.assertEqual(len(list(library.texture_sets())), 3)
+
+    def test_rescan_changed_directory(self):
+        self.library().scan()
+        touch(self.root, "wood", "pine", "pine_rough.jpg")
+        directory = path.join(self.root, "wood", "pine")
+        # Make sure the change is visible on file systems with coarse timestamps
+        stat = os.stat(directory)
+        os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        library = self.library()
+        library.load()
+        self.assertEqual(library.scan(), 1)
+        _directory, sockets, _tile_sets = library.get(path.join("wood", "pine", "pine"))
+        self.assertEqual(sockets, {"Base Color": "pine_diffuse.jpg", "Roughness": "pine_rough.jpg"})
+
+    def test_removed_directory(self):
+        self.library().scan()
+        for name in os.listdir(path.join(self.root, "bricks")):
+            os.remove(path.join(self.root, "bricks", name))
+        os.rmdir(path.join(self.root, "bricks"))
+
+        library = self.library()
+        library.load()
+        library.scan()
+        self.assertIsNone(library.get(path.join("bricks", "bricks")))
+        self.assertEqual(len(list(library.texture_sets())), 2)
+
+    def test_changed_tags(self):
+        self.library().scan()
+
+        sockets = [socket for socket in sockets_fixture() if socket[0] != "Normal"]
+        library = TextureLibrary(self.root, sockets, self.index_path)
+        self.assertTrue(library.load())
+        self.assertEqual(library.scan(), 0)
+        _directory, sockets, _tile_sets = library.get(path.join("wood", "oak", "oak"))
+        self.assertEqual(sockets, {"Base Color": "oak_albedo.jpg"})
+
+    def test_allow_directx(self):
+        touch(self.root, "bricks", "bricks_nor_dx.png")
+        library = self.library()
+        library.scan()
+        _directory, sockets, _tile_sets = library.get(path.join("bricks", "bricks"))
+        self.assertNotIn("Normal", sockets)
+        _directory, sockets, _tile_sets = library.get(path.join("bricks", "bricks"), allow_directx=True)
+        self.assertEqual(sockets["Normal"], "bricks_nor_dx.png")
+
+    def test_udim_tiles(self):
+        for tile in (1001, 1002, 1011):
+            touch(self.root, "statue", f"statue_diff.{tile}.png")
+            touch(self.root, "statue", f"statue_rough.{tile}.png")
+
+        library = self.library()
+        library.scan()
+        self.assertIsNone(library.get(path.join("statue", "statue 1002")))
+        _directory, sockets, tile_sets = library.get(path.join("statue", "statue"))
+        self.assertEqual(sockets, {"Base Color": "statue_diff.1001.png", "Roughness": "statue_rough.1001.png"})
+        self.assertEqual(sorted(tile_sets), ["statue_diff.1001.png", "statue_rough.1001.png"])
+        self.assertEqual(tile_sets["statue_diff.1001.png"].tiles, (1001, 1002, 1011))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,8 @@
 import bpy
 from math import hypot
 from itertools import zip_longest, filterfalse
-from .constants import valid_sim_sockets
+from collections import namedtuple
+from .constants import valid_sim_sockets, socket_types
 
 def n_wise_iter(iterable, n):
     "s -> (s0,s1,s2,...sn-1), (sn,sn+1,sn+2,...s2n-1), (s2n,s2n+1,s2n+2,...s3n-1), ..."
@@ -79,22 +80,141 @@ def get_zone_output_node(node):
     else:
         return node
 
-def create_from_virtual(source, node, container_name):
-    #if output_node.type in ('SIMULATION_INPUT', 'SIMULATION_OUTPUT') and is_virtual_socket(input):
-    #Simulation nodes call float types 'FLOAT' while other parts of the API call it 'VALUE'
-    source_type = source.type
-    if source_type == "VALUE":
-        source_type = "FLOAT"
-    
-    items = getattr(get_zone_output_node(node), container_name)
-    items.new(source_type, source.name)
+def _virtual_socket_container(socket, source):
+    """
+    Find where the item backing a virtual socket has to be created when linking it to source.
+
+    Returns a (key, kind, owner) tuple, where kind is the name of the zone item collection or
+    the in_out value of the interface socket, or None if no socket can be created for source.
+    """
+    node = socket.node
+
+    # Simulation nodes call float types 'FLOAT' while other parts of the API call it 'VALUE'
+    source_type = "FLOAT" if source.type == "VALUE" else source.type
+
+    if node.type in ('SIMULATION_INPUT', 'SIMULATION_OUTPUT'):
+        if source_type not in valid_sim_sockets:
+            return None
+        owner = get_zone_output_node(node)
+        return ("state_items", owner.as_pointer()), "state_items", owner
+
+    if node.type in ('REPEAT_INPUT', 'REPEAT_OUTPUT'):
+        owner = get_zone_output_node(node)
+        return ("repeat_items", owner.as_pointer()), "repeat_items", owner
+
+    if node.type == 'GROUP_OUTPUT' and not socket.is_output:
+        owner = node.id_data
+        return ("OUTPUT", owner.as_pointer()), "OUTPUT", owner
+
+    if node.type == 'GROUP_INPUT' and socket.is_output:
+        owner = node.id_data
+        return ("INPUT", owner.as_pointer()), "INPUT", owner
+
+    return None
+
+
+def materialize_virtual_sockets(pairs):
+    """
+    Replace the virtual sockets in a batch of (from_socket, to_socket) pairs by real ones.
+
+    All the zone items and group interface sockets needed by the batch are created
+    before any of the new sockets are looked up, so zones and interfaces are read
+    back once per batch instead of once per link.
+
+    Returns a list of (from_socket, to_socket) pairs in the same order. A virtual
+    socket that could not be backed by a new socket is replaced by None.
+    """
+    result = [list(pair) for pair in pairs]
+
+    # key -> (kind, owner, [(pair index, side, node, source socket)])
+    containers = {}
+    for index, pair in enumerate(pairs):
+        for side, socket in enumerate(pair):
+            if not is_virtual_socket(socket):
+                continue
+
+            source = pair[1 - side]
+            container = _virtual_socket_container(socket, source)
+            if container is None:
+                result[index][side] = None
+                continue
+
+            key, kind, owner = container
+            containers.setdefault(key, (kind, owner, []))[2].append((index, side, socket.node, source))
+
+    for kind, owner, entries in containers.values():
+        if kind in ('INPUT', 'OUTPUT'):
+            identifiers = [
+                owner.interface.new_socket(name=source.name, socket_type=type(source).__name__, in_out=kind).identifier
+                for index, side, node, source in entries]
+
+            node_sockets = {}
+            for (index, side, node, source), identifier in zip(entries, identifiers):
+                sockets = node_sockets.get(node.as_pointer())
+                if sockets is None:
+                    sockets = {s.identifier: s for s in (node.outputs if side == 0 else node.inputs)}
+                    node_sockets[node.as_pointer()] = sockets
+                result[index][side] = sockets.get(identifier)
+        else:
+            items = getattr(owner, kind)
+            for index, side, node, source in entries:
+                source_type = "FLOAT" if source.type == "VALUE" else source.type
+                items.new(source_type, source.name)
+
+            # Item sockets sit right before the virtual socket, in the same order as the items
+            item_count = len(items)
+            for offset, (index, side, node, source) in enumerate(entries):
+                sockets = node.outputs if side == 0 else node.inputs
+                position = item_count - len(entries) + offset
+                result[index][side] = sockets[len(sockets) - 1 - (item_count - position)]
+
+    return [tuple(pair) for pair in result]
+
+
+def _socket_type_error(from_type, to_type):
+    if from_type == to_type:
+        return None
+    if 'GEOMETRY' in (from_type, to_type):
+        return "Cannot connect geometry and non-geometry socket together"
+    if from_type == 'SHADER':
+        return "Cannot connect shader output to not shader input"
+    return None
+
+
+# (from_type, to_type) -> reason the link is invalid, or None if it can be made
+socket_compatibility = {
+    (from_type, to_type): _socket_type_error(from_type, to_type)
+    for from_type in socket_types for to_type in socket_types
+}
+
+
+def get_link_error(from_socket, to_socket):
+    """
+    Check whether a link can be made from from_socket to to_socket.
+
+    Returns a string describing why the link is invalid, or None if it is valid.
+    """
+    from_node = from_socket.node
+    to_node = to_socket.node
+
+    if from_node.id_data is not to_node.id_data:
+        return "Sockets do not belong to the same node tree"
+
+    if is_virtual_socket(sockets=(from_socket, to_socket)):
+        return "Cannot connect two virtual sockets together"
+
+    if is_virtual_socket(from_socket) or is_virtual_socket(to_socket):
+        return None
+
+    if "REROUTE" in (from_node.type, to_node.type) and not to_socket.is_linked:
+        return None
+
+    # An unlinked reroute only gets its type once something is connected to it
+    if from_node.type == "REROUTE" and not from_node.inputs[0].is_linked:
+        return None
+
+    return socket_compatibility.get((from_socket.type, to_socket.type))
 
-    #Right now, this isn't necessary, as zone inputs/outputs are tied together
-    #But it's still good form to distinguish whether what we are returning is an input/output
-    if source.is_output:
-        return node.inputs[-2]
-    else:
-        return node.outputs[-2]
 
 def connect_sockets(input, output):
     """
@@ -113,49 +233,114 @@ def connect_sockets(input, output):
         input, output = output, input
 
     input_node = output.node
-    output_node = input.node
 
-    if input_node.id_data is not output_node.id_data:
-        #print("Sockets do not belong to the same node tree")
+    if get_link_error(output, input) is not None:
         return
 
-    if is_virtual_socket(sockets=(input, output)):
-        #print("Cannot connect two virtual sockets together")
-        return
-    
-    if input.type != output.type and not (is_virtual_socket(input) or is_virtual_socket(output)):
-        if not ("REROUTE" in (input_node.type, output_node.type) and not input.is_linked):
-            if 'GEOMETRY' in (input.type, output.type):
-                #print("Cannot connect geometry and non-geometry socket together")
-                return 
+    if is_virtual_socket(output) or is_virtual_socket(input):
+        (output, input), = materialize_virtual_sockets([(output, input)])
+        if output is None or input is None:
+            return
 
-            if ('SHADER' == output.type) and ('SHADER' != input.type):
-                #print("Cannot connect shader output to not shader input")
-                return 
+    return input_node.id_data.links.new(input, output)
 
-    if output_node.type in ('SIMULATION_INPUT', 'SIMULATION_OUTPUT') and is_virtual_socket(input):
-        if output.type in valid_sim_sockets:
-            input = create_from_virtual(source=output, node=output_node, container_name="state_items")
 
-    if input_node.type in ('SIMULATION_INPUT', 'SIMULATION_OUTPUT') and is_virtual_socket(output):
-        if input.type in valid_sim_sockets:
-            output = create_from_virtual(source=input, node=input_node, container_name="state_items")
+LinkFailure = namedtuple('LinkFailure', ['from_socket', 'to_socket', 'reason'])
 
-    if output_node.type in ('REPEAT_INPUT', 'REPEAT_OUTPUT') and is_virtual_socket(input):
-        input = create_from_virtual(source=output, node=output_node, container_name="repeat_items")
 
-    if input_node.type in ('REPEAT_INPUT', 'REPEAT_OUTPUT') and is_virtual_socket(output):
-        output = create_from_virtual(source=input, node=input_node, container_name="repeat_items")
+def socket_label(socket):
+    return f"{socket.node.name}:{socket.name}"
 
-    if output_node.type in ('GROUP_OUTPUT',) and is_virtual_socket(input):
-        output_node.id_data.interface.new_socket(name=output.name, socket_type=type(output).__name__, in_out='OUTPUT')
-        input = output_node.inputs[-2]
 
-    if input_node.type in ('GROUP_INPUT',) and is_virtual_socket(output):
-        input_node.id_data.interface.new_socket(name=input.name, socket_type=type(input).__name__, in_out='INPUT')
-        output = input_node.outputs[-2]
+class LinkBuilder:
+    """
+    Collects link requests and creates them in a single pass.
 
-    return input_node.id_data.links.new(input, output)
+    Requests are validated against socket_compatibility when the links are
+    built, and the tree is tagged for update once afterwards instead of once
+    per link. Zone items and group sockets needed by links to virtual sockets
+    are all created before linking, see materialize_virtual_sockets().
+    Links that could not be made are kept in `failures`.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.requests = []
+        self.failures = []
+        self.pending_targets = set()
+
+    def add(self, from_socket, to_socket):
+        # Accept sockets in any order, like connect_sockets does
+        if to_socket.is_output and not from_socket.is_output:
+            from_socket, to_socket = to_socket, from_socket
+
+        self.requests.append((from_socket, to_socket))
+        # Every link to a virtual socket gets a socket of its own
+        if not is_virtual_socket(to_socket):
+            self.pending_targets.add(to_socket.as_pointer())
+
+    def is_pending(self, socket):
+        """Whether a link to the socket has been requested but not built yet."""
+        return socket.as_pointer() in self.pending_targets
+
+    def is_linked(self, socket):
+        """Whether the socket is linked, or will be once the pending links are built."""
+        return socket.is_linked or self.is_pending(socket)
+
+    def build(self, update=True):
+        links = self.tree.links
+        new_links = []
+
+        valid_requests = []
+        for from_socket, to_socket in self.requests:
+            reason = get_link_error(from_socket, to_socket)
+            if reason is not None:
+                self.failures.append(LinkFailure(socket_label(from_socket), socket_label(to_socket), reason))
+            else:
+                valid_requests.append((from_socket, to_socket))
+
+        # A link to an input that isn't multi-input replaces the previous one,
+        # so only the last request for such an input needs to be made.
+        def is_replacing(socket):
+            return not socket.is_multi_input and not is_virtual_socket(socket)
+
+        last_request = {}
+        for index, (from_socket, to_socket) in enumerate(valid_requests):
+            if is_replacing(to_socket):
+                last_request[to_socket.as_pointer()] = index
+
+        valid_requests = [
+            (from_socket, to_socket) for index, (from_socket, to_socket) in enumerate(valid_requests)
+            if not is_replacing(to_socket) or last_request[to_socket.as_pointer()] == index]
+
+        # Create the sockets behind every virtual socket in one go before linking anything
+        virtual_indices = [index for index, pair in enumerate(valid_requests)
+                           if is_virtual_socket(pair[0]) or is_virtual_socket(pair[1])]
+        materialized = materialize_virtual_sockets([valid_requests[i] for i in virtual_indices])
+        for index, pair in zip(virtual_indices, materialized):
+            valid_requests[index] = pair
+
+        for from_socket, to_socket in valid_requests:
+            if from_socket is None or to_socket is None:
+                labels = [socket_label(s) if s is not None else "(virtual socket)" for s in (from_socket, to_socket)]
+                self.failures.append(LinkFailure(*labels, "Could not create socket for link"))
+                continue
+
+            new_links.append(links.new(from_socket, to_socket))
+
+        self.requests.clear()
+        self.pending_targets.clear()
+
+        if update:
+            self.tree.update_tag()
+        return new_links
+
+    def report(self, operator):
+        if not self.failures:
+            return
+
+        for from_socket, to_socket, reason in self.failures:
+            print(f"Could not link {from_socket} to {to_socket} ({reason})")
+        operator.report({'WARNING'}, f"{len(self.failures)} link(s) could not be made, see console for details")
 
 
 def force_update(context):
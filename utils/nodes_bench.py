@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+"""
+Benchmark for linking many sockets to virtual sockets of zones and group interfaces.
+
+Needs Blender, run it with:
+    blender --background --factory-startup --python utils/nodes_bench.py
+
+For each socket count, the same links are made one at a time with connect_sockets()
+and in one batch with LinkBuilder. The time per socket of the batch should stay flat
+as the socket count grows.
+"""
+
+import sys
+import time
+from os import path
+
+import bpy
+
+# Import the utils folder as a package, so its relative imports resolve
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+from utils.nodes import connect_sockets, LinkBuilder  # noqa: E402
+
+
+SOCKET_COUNTS = (8, 16, 32, 64, 128)
+
+
+def new_tree(socket_count):
+    tree = bpy.data.node_groups.new("NW Bench", 'GeometryNodeTree')
+    values = [tree.nodes.new('ShaderNodeValue') for _ in range(socket_count)]
+    maths = [tree.nodes.new('ShaderNodeMath') for _ in range(socket_count)]
+    repeat_input = tree.nodes.new('GeometryNodeRepeatInput')
+    repeat_output = tree.nodes.new('GeometryNodeRepeatOutput')
+    repeat_input.pair_with_output(repeat_output)
+    group_input = tree.nodes.new('NodeGroupInput')
+    return tree, values, maths, repeat_input, group_input
+
+
+def link_requests(socket_count):
+    tree, values, maths, repeat_input, group_input = new_tree(socket_count)
+    requests = [(value.outputs[0], repeat_input.inputs[-1]) for value in values]
+    requests += [(group_input.outputs[-1], math.inputs[0]) for math in maths]
+    return tree, requests
+
+
+def bench_one_by_one(socket_count):
+    tree, requests = link_requests(socket_count)
+    start = time.perf_counter()
+    for from_socket, to_socket in requests:
+        connect_sockets(from_socket, to_socket)
+        tree.update_tag()
+    elapsed = time.perf_counter() - start
+    bpy.data.node_groups.remove(tree)
+    return elapsed
+
+
+def bench_batch(socket_count):
+    tree, requests = link_requests(socket_count)
+    start = time.perf_counter()
+    builder = LinkBuilder(tree)
+    for from_socket, to_socket in requests:
+        builder.add(from_socket, to_socket)
+    builder.build()
+    elapsed = time.perf_counter() - start
+    assert not builder.failures, builder.failures
+    bpy.data.node_groups.remove(tree)
+    return elapsed
+
+
+def main():
+    print(f"{'sockets':>8} {'one by one':>12} {'batch':>12} {'per socket':>12}")
+    for socket_count in SOCKET_COUNTS:
+        one_by_one = bench_one_by_one(socket_count)
+        batch = bench_batch(socket_count)
+        links = 2 * socket_count
+        print(f"{links:>8} {one_by_one * 1000:>10.2f}ms {batch * 1000:>10.2f}ms "
+              f"{batch / links * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from os import path
+
+# XXX Not really nice, but that hack is needed to allow execution of the tests
+#     from the utils folder, where this module isn't part of a package.
+if __package__:
+    from .corrections import CHUNK_ROWS, quantize_into
+else:
+    from corrections import CHUNK_ROWS, quantize_into
+
+# Channel of packed maps for each socket, the layout of ORM maps plus alpha
+PACKED_CHANNELS = {
+    'Ambient Occlusion': 0,
+    'Roughness': 1,
+    'Metallic': 2,
+    'Alpha': 3,
+}
+# Names of the channels without a known socket, and shorter ones for labels
+CHANNEL_NAMES = ('Red', 'Green', 'Blue', 'Alpha')
+LABEL_NAMES = {'Ambient Occlusion': 'AO'}
+
+
+def assign_channels(roles):
+    """
+    Return the packed channel of each source, given the socket each one feeds or None.
+
+    Sources go to the channel of their socket when it is still free, the others fill
+    the free channels in order. Returns None when there are more than four sources.
+    ['Roughness', None, 'Metallic'] -> [1, 0, 2]
+    """
+    if len(roles) > len(PACKED_CHANNELS):
+        return None
+    channels = [None] * len(roles)
+    used = set()
+    for i, role in enumerate(roles):
+        channel = PACKED_CHANNELS.get(role)
+        if channel is not None and channel not in used:
+            channels[i] = channel
+            used.add(channel)
+    free = (channel for channel in range(len(PACKED_CHANNELS)) if channel not in used)
+    return [channel if channel is not None else next(free) for channel in channels]
+
+
+def pack_channel(pixels, packed, channel, chunk_rows=CHUNK_ROWS):
+    """
+    Quantize the red channel of pixels, flat RGBA floats like Blender's image pixels,
+    into channel of packed, see quantize_into().
+    """
+    quantize_into(pixels, packed, 0, channel, chunk_rows)
+
+
+def packed_label(roles, channels):
+    """
+    Return the label of a packed map, the sockets or channel names of its channels in order
+    ['Metallic', 'Roughness', 'Ambient Occlusion'], [2, 1, 0] -> 'AO Roughness Metallic'
+    """
+    return " ".join(LABEL_NAMES.get(role, role) if role else CHANNEL_NAMES[channel]
+                    for channel, role in sorted(zip(channels, roles)))
+
+
+def packed_file_name(file_names, suffix="orm", extension=".png"):
+    """
+    Return the name of the packed map of file_names, from what their names have in common
+    ['wood_rough_2k.png', 'wood_metal_2k.png'] -> 'wood_orm.png'
+    """
+    stems = [path.splitext(path.basename(fname))[0] for fname in file_names]
+    prefix = path.commonprefix(stems).rstrip("_.- ")
+    return f"{prefix}_{suffix}{extension}" if prefix else suffix + extension
+
+
+def unused_file_path(directory, fname, is_taken=path.exists):
+    """
+    Return the path of fname in directory, numbered when is_taken() says that path is used already
+    'wood_orm.png' -> 'wood_orm_2.png'
+    """
+    stem, extension = path.splitext(fname)
+    file_path = path.join(directory, fname)
+    number = 1
+    while is_taken(file_path):
+        number += 1
+        file_path = path.join(directory, f"{stem}_{number}{extension}")
+    return file_path
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import tempfile
+import unittest
+from os import path
+
+import numpy as np
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == "__main__":
+    from packing import assign_channels, pack_channel, packed_file_name, packed_label, unused_file_path
+else:
+    from .packing import assign_channels, pack_channel, packed_file_name, packed_label, unused_file_path
+
+
+def gradient_fixture(width, height):
+    """Grayscale RGBA pixels, bottom to top, brighter with every row."""
+    values = np.repeat(np.linspace(0.0, 1.0, height, dtype=np.float32), width)
+    return np.repeat(values, 4)
+
+
+class TestAssignChannels(unittest.TestCase):
+    def test_roles(self):
+        self.assertEqual(assign_channels(['Metallic', 'Roughness', 'Ambient Occlusion']), [2, 1, 0])
+
+    def test_unknown_and_duplicate_roles(self):
+        self.assertEqual(assign_channels(['Roughness', None, 'Roughness']), [1, 0, 2])
+
+    def test_too_many(self):
+        self.assertIsNone(assign_channels([None] * 5))
+
+
+class TestPackChannel(unittest.TestCase):
+    def test_chunks(self):
+        width, height = 3, 7
+        packed = np.zeros((height, width, 3), dtype=np.uint8)
+        pack_channel(gradient_fixture(width, height), packed, 1, chunk_rows=3)
+        # The brightest row ends up at the top
+        self.assertEqual(packed[:, 0, 1].tolist(), [255, 212, 170, 128, 85, 42, 0])
+        self.assertFalse(packed[..., [0, 2]].any())
+
+    def test_16_bit_clipped(self):
+        pixels = np.array([-0.5, 0, 0, 1, 2.0, 0, 0, 1], dtype=np.float32)
+        packed = np.zeros((2, 1, 4), dtype=np.uint16)
+        pack_channel(pixels, packed, 3)
+        self.assertEqual(packed[:, 0, 3].tolist(), [65535, 0])
+
+
+class TestPackedLabel(unittest.TestCase):
+    def test_orm(self):
+        self.assertEqual(packed_label(['Metallic', 'Roughness', 'Ambient Occlusion'], [2, 1, 0]),
+                         "AO Roughness Metallic")
+
+    def test_unknown_roles(self):
+        self.assertEqual(packed_label(['Alpha', None, 'Roughness'], [3, 0, 1]), "Red Roughness Alpha")
+
+
+class TestPackedFileName(unittest.TestCase):
+    def test_common_prefix(self):
+        self.assertEqual(packed_file_name(["/tex/wood_rough_2k.png", "/tex/wood_metal_2k.jpg"]), "wood_orm.png")
+
+    def test_nothing_in_common(self):
+        self.assertEqual(packed_file_name(["rough.png", "metal.png"]), "orm.png")
+
+
+class TestUnusedFilePath(unittest.TestCase):
+    def test_numbered(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertEqual(unused_file_path(directory, "wood_orm.png"), path.join(directory, "wood_orm.png"))
+            for fname in ("wood_orm.png", "wood_orm_2.png"):
+                open(path.join(directory, fname), "wb").close()
+            self.assertEqual(unused_file_path(directory, "wood_orm.png"), path.join(directory, "wood_orm_3.png"))
+
+    def test_is_taken(self):
+        taken = {path.join("tex", "orm.png")}
+        self.assertEqual(unused_file_path("tex", "orm.png", taken.__contains__), path.join("tex", "orm_2.png"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,76 +4,116 @@ from os import path
 import re
 
 
+# Compiled once, split_into_components() runs for every file in a texture folder
+DIGITS = re.compile(r"\d+")
+# Separators, and the boundaries inside CamelCase words
+COMPONENT_BOUNDARY = re.compile(r"[_.\-# ]|(?<=[a-z])(?=[A-Z])")
+SEPARATORS = "_.-# "
+# Blender wants GL normals, not DX (DirectX) ones:
+# https://www.reddit.com/r/blender/comments/rbuaua/texture_contains_normaldx_and_normalgl_files/
+DIRECTX_TAGS = frozenset(('dx', 'directx'))
+
+
 def split_into_components(fname):
     """
     Split filename into components
     'WallTexture_diff_2k.002.jpg' -> ['Wall', 'Texture', 'diff', 'k']
     """
-    # Remove extension
-    fname = path.splitext(fname)[0]
-    # Remove digits
-    fname = "".join(i for i in fname if not i.isdigit())
-    # Separate CamelCase by space
-    fname = re.sub(r"([a-z])([A-Z])", r"\g<1> \g<2>", fname)
-    # Replace common separators with SPACE
-    separators = ["_", ".", "-", "__", "--", "#"]
-    for sep in separators:
-        fname = fname.replace(sep, " ")
-
-    components = fname.split(" ")
-    components = [c.lower() for c in components]
-    return components
-
-
-def remove_common_prefix(names_to_tag_lists):
-    """
-    Accepts a mapping of file names to tag lists that should be used for socket
-    matching.
+    # Remove extension and digits
+    fname = DIGITS.sub("", path.splitext(fname)[0])
+    # Split on common separators and CamelCase in a single pass
+    return COMPONENT_BOUNDARY.sub(" ", fname).lower().split(" ")
+
 
-    This function modifies the provided mapping so that any common prefix
-    between all the tag lists is removed.
+def is_component_at(stem, start, end):
+    """Return whether stem[start:end] is a whole component of stem, as split_into_components() splits it."""
+    before = stem[start - 1] if start > 0 else ""
+    after = stem[end] if end < len(stem) else ""
+    starts = not before or before in SEPARATORS or before.isdigit() or (before.islower() and stem[start].isupper())
+    ends = not after or after in SEPARATORS or after.isdigit() or (after.isupper() and stem[end - 1].islower())
+    return starts and ends
 
-    Returns true if some prefix was removed, false otherwise.
+
+def replace_component(fname, old_tags, new_tag, extension=None):
     """
-    if not names_to_tag_lists:
-        return False
-    sample_tags = next(iter(names_to_tag_lists.values()))
-    if not sample_tags:
-        return False
+    Return fname with its first component found in old_tags replaced by new_tag,
+    in the same case. Without such component new_tag is appended.
+    'Wood_Gloss_2k.jpg', ['gloss'], 'rough' -> 'Wood_Rough_2k.jpg'
+    """
+    stem, old_extension = path.splitext(fname)
+    extension = old_extension if extension is None else extension
+    lower_stem = stem.lower()
+    for tag in sorted(old_tags, key=len, reverse=True):
+        start = lower_stem.find(tag)
+        while start >= 0:
+            end = start + len(tag)
+            if is_component_at(stem, start, end):
+                old = stem[start:end]
+                if old.isupper() and len(old) > 1:
+                    new = new_tag.upper()
+                elif old[0].isupper():
+                    new = new_tag.capitalize()
+                else:
+                    new = new_tag
+                return stem[:start] + new + stem[end:] + extension
+            start = lower_stem.find(tag, start + 1)
+    return f"{stem}_{new_tag}{extension}"
+
+
+def is_directx(fname):
+    return not DIRECTX_TAGS.isdisjoint(split_into_components(fname))
+
+
+def common_prefix_length(tag_lists):
+    """
+    Return how many leading tags all tag lists have in common
+    [['a', 'b', 'c'], ['a', 'b', 'd']] -> 2
+    """
+    shortest = min(tag_lists, key=len)
+    for i, tag in enumerate(shortest):
+        if any(tag_list[i] != tag for tag_list in tag_lists):
+            return i
+    return len(shortest)
 
-    common_prefix = sample_tags[0]
-    for tag_list in names_to_tag_lists.values():
-        if tag_list[0] != common_prefix:
-            return False
 
-    for name, tag_list in names_to_tag_lists.items():
-        names_to_tag_lists[name] = tag_list[1:]
-    return True
+def common_suffix_length(tag_lists):
+    """
+    Return how many trailing tags all tag lists have in common
+    [['a', 'c', 'd'], ['b', 'c', 'd']] -> 2
+    """
+    shortest = min(tag_lists, key=len)
+    for i, tag in enumerate(reversed(shortest), 1):
+        if any(tag_list[-i] != tag for tag_list in tag_lists):
+            return i - 1
+    return len(shortest)
 
 
-def remove_common_suffix(names_to_tag_lists):
+def remove_common_affixes(names_to_tag_lists):
     """
     Accepts a mapping of file names to tag lists that should be used for socket
     matching.
 
-    This function modifies the provided mapping so that any common suffix
-    between all the tag lists is removed.
+    This function modifies the provided mapping so that the longest common prefix
+    and then the longest common suffix of all the tag lists are removed, in one pass.
 
-    Returns true if some suffix was removed, false otherwise.
+    Returns true if something was removed, false otherwise.
     """
     if not names_to_tag_lists:
         return False
-    sample_tags = next(iter(names_to_tag_lists.values()))
-    if not sample_tags:
-        return False
 
-    common_suffix = sample_tags[-1]
-    for tag_list in names_to_tag_lists.values():
-        if tag_list[-1] != common_suffix:
-            return False
+    tag_lists = list(names_to_tag_lists.values())
+    prefix = common_prefix_length(tag_lists)
+    if prefix:
+        tag_lists = [tag_list[prefix:] for tag_list in tag_lists]
+    suffix = common_suffix_length(tag_lists)
+    if suffix:
+        tag_lists = [tag_list[:-suffix] for tag_list in tag_lists]
+
+    if not prefix and not suffix:
+        return False
 
-    for name, tag_list in names_to_tag_lists.items():
-        names_to_tag_lists[name] = tag_list[:-1]
+    for name, tag_list in zip(names_to_tag_lists, tag_lists):
+        names_to_tag_lists[name] = tag_list
     return True
 
 
@@ -102,36 +142,27 @@ def files_to_clean_file_names_for_sockets(files, sockets):
         all_tags.update(socket_tags)
 
     while len(names_to_tag_lists) > 1:
-        something_changed = False
-
         # Common prefixes / suffixes provide zero information about what file
         # should go to which socket, but they can confuse the mapping. So we get
         # rid of them here.
-        something_changed |= remove_common_prefix(names_to_tag_lists)
-        something_changed |= remove_common_suffix(names_to_tag_lists)
+        remove_common_affixes(names_to_tag_lists)
 
-        # Names matching zero tags provide no value, remove those
-        names_to_remove = set()
-        for name, tag_list in names_to_tag_lists.items():
-            match_found = False
-            for tag in tag_list:
-                if tag in all_tags:
-                    match_found = True
-
-            if not match_found:
-                names_to_remove.add(name)
+        # Names matching zero tags provide no value, remove those. Removing names
+        # can make the prefixes or suffixes of the remaining ones common.
+        names_to_remove = [
+            name for name, tag_list in names_to_tag_lists.items()
+            if all_tags.isdisjoint(tag_list)]
 
         for name_to_remove in names_to_remove:
             del names_to_tag_lists[name_to_remove]
-            something_changed = True
 
-        if not something_changed:
+        if not names_to_remove:
             break
 
     return names_to_tag_lists
 
 
-def match_files_to_socket_names(files, sockets):
+def match_files_to_socket_names(files, sockets, allow_directx=False):
     """
     Given a list of files and a list of sockets, match file names to sockets.
 
@@ -147,21 +178,43 @@ def match_files_to_socket_names(files, sockets):
             socket_name, [tags], Optional[file_name]
         ]
     ]
+
+    DirectX normal maps are only used for the Normal socket when allow_directx is
+    set and no other normal map is found.
     """
 
     names_to_tag_lists = files_to_clean_file_names_for_sockets(files, sockets)
+    names = list(names_to_tag_lists)
+
+    # Inverted index from tag to the positions of the files having it, in file order
+    all_tags = set()
+    for socket in sockets:
+        all_tags.update(socket[1])
+
+    tag_to_files = {}
+    directx_files = set()
+    for index, tag_list in enumerate(names_to_tag_lists.values()):
+        for tag in all_tags.intersection(tag_list):
+            tag_to_files.setdefault(tag, []).append(index)
+        if not DIRECTX_TAGS.isdisjoint(tag_list):
+            directx_files.add(index)
 
     for sname in sockets:
-        for name, tag_list in names_to_tag_lists.items():
-            if sname[0] == "Normal":
-                # Blender wants GL normals, not DX (DirectX) ones:
-                # https://www.reddit.com/r/blender/comments/rbuaua/texture_contains_normaldx_and_normalgl_files/
-                if 'dx' in tag_list:
-                    continue
-                if 'directx' in tag_list:
-                    continue
+        skip = directx_files if sname[0] == "Normal" else ()
 
-            matches = set(sname[1]).intersection(set(tag_list))
-            if matches:
-                sname[2] = name
+        # The first file having any of the socket tags wins
+        first = None
+        for tag in sname[1]:
+            for index in tag_to_files.get(tag, ()):
+                if index in skip:
+                    continue
+                if first is None or index < first:
+                    first = index
                 break
+
+        if first is None and skip and allow_directx:
+            first = min((index for tag in sname[1] for index in tag_to_files.get(tag, ()) if index in skip),
+                        default=None)
+
+        if first is not None:
+            sname[2] = names[first]
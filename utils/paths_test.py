@@ -4,15 +4,16 @@
 # pylint: disable=missing-function-docstring
 # pylint: disable=missing-class-docstring
 
+import time
 import unittest
 from dataclasses import dataclass
 
 # XXX Not really nice, but that hack is needed to allow execution of that test
 #     from both automated CTest and by directly running the file manually.
 if __name__ == "__main__":
-    from paths import match_files_to_socket_names
+    from paths import match_files_to_socket_names, replace_component
 else:
-    from .paths import match_files_to_socket_names
+    from .paths import match_files_to_socket_names, replace_component
 
 
 # From NWPrincipledPreferences 2023-01-06
@@ -28,6 +29,8 @@ TAGS_TRANSMISSION = "transmission transparency".split(" ")
 TAGS_EMISSION = "emission emissive emit".split(" ")
 TAGS_ALPHA = "alpha opacity".split(" ")
 TAGS_AMBIENT_OCCLUSION = "ao ambient occlusion".split(" ")
+# Packed maps, added later
+TAGS_AO_ROUGH_METAL = "orm arm".split(" ")
 
 
 @dataclass
@@ -223,6 +226,45 @@ class TestPutFileNamesInSockets(unittest.TestCase):
             },
         )
 
+    def test_packed_ao_rough_metal(self):
+        files = [
+            MockFile("Rock_Cliff_BaseColor.png"),
+            MockFile("Rock_Cliff_Normal.png"),
+            MockFile("Rock_Cliff_ORM.png"),
+        ]
+        sockets = sockets_fixture() + [["AO Roughness Metallic", TAGS_AO_ROUGH_METAL, None]]
+        match_files_to_socket_names(files, sockets)
+
+        assert_sockets(
+            self,
+            sockets,
+            {
+                "Base Color": "Rock_Cliff_BaseColor.png",
+                "Normal": "Rock_Cliff_Normal.png",
+                "AO Roughness Metallic": "Rock_Cliff_ORM.png",
+            },
+        )
+
+    def test_directx_only(self):
+        files = [
+            MockFile("rusty_metal_02_diff_1k.jpg"),
+            MockFile("rusty_metal_02_nor_dx_1k.exr"),
+        ]
+        sockets = sockets_fixture()
+        match_files_to_socket_names(files, sockets)
+        assert_sockets(self, sockets, {"Base Color": "rusty_metal_02_diff_1k.jpg"})
+
+        sockets = sockets_fixture()
+        match_files_to_socket_names(files, sockets, allow_directx=True)
+        assert_sockets(
+            self,
+            sockets,
+            {
+                "Base Color": "rusty_metal_02_diff_1k.jpg",
+                "Normal": "rusty_metal_02_nor_dx_1k.exr",
+            },
+        )
+
     def test_texturecan(self):
         """Texture from: https://www.texturecan.com/details/67/"""
 
@@ -284,5 +326,96 @@ class TestPutFileNamesInSockets(unittest.TestCase):
         )
 
 
+class BenchmarkMatchFilesToSocketNames(unittest.TestCase):
+    """
+    Texture library sized folders, these check the results and print the time taken.
+    """
+
+    MAPS = ["color", "roughness", "normal_gl", "normal_dx", "metalness", "height", "ao"]
+
+    def bench(self, label, files):
+        sockets = sockets_fixture()
+        start = time.perf_counter()
+        match_files_to_socket_names(files, sockets)
+        elapsed = time.perf_counter() - start
+        print(f"\n{label}: {len(files)} files in {elapsed * 1000:.1f}ms", end=" ")
+        return sockets
+
+    def test_one_set_among_renders(self):
+        files = [MockFile(f"render_{i:05d}.exr") for i in range(10000)]
+        files += [MockFile(f"Bricks_{name}_2k.jpg") for name in self.MAPS]
+        sockets = self.bench("one set among renders", files)
+
+        assert_sockets(
+            self,
+            sockets,
+            {
+                "Ambient Occlusion": "Bricks_ao_2k.jpg",
+                "Base Color": "Bricks_color_2k.jpg",
+                "Displacement": "Bricks_height_2k.jpg",
+                "Metallic": "Bricks_metalness_2k.jpg",
+                "Normal": "Bricks_normal_gl_2k.jpg",
+                "Roughness": "Bricks_roughness_2k.jpg",
+            },
+        )
+
+    def test_many_sets(self):
+        files = [
+            MockFile(f"Library_Set{i:05d}_{name}_2k.jpg")
+            for i in range(1500)
+            for name in self.MAPS
+        ]
+        sockets = self.bench("many sets", files)
+
+        # The first file with a matching tag wins
+        assert_sockets(
+            self,
+            sockets,
+            {
+                "Ambient Occlusion": "Library_Set00000_ao_2k.jpg",
+                "Base Color": "Library_Set00000_color_2k.jpg",
+                "Displacement": "Library_Set00000_height_2k.jpg",
+                "Metallic": "Library_Set00000_metalness_2k.jpg",
+                "Normal": "Library_Set00000_normal_gl_2k.jpg",
+                "Roughness": "Library_Set00000_roughness_2k.jpg",
+            },
+        )
+
+    def test_long_common_affixes(self):
+        prefix = "studio_library_materials_wood_oak_planks"
+        suffix = "final_approved_version_4k"
+        files = [MockFile(f"{prefix}_{name}_{suffix}.png") for name in self.MAPS]
+        files += [MockFile(f"{prefix}_preview_{i:05d}_{suffix}.png") for i in range(10000)]
+        sockets = self.bench("long common affixes", files)
+
+        assert_sockets(
+            self,
+            sockets,
+            {
+                "Ambient Occlusion": f"{prefix}_ao_{suffix}.png",
+                "Base Color": f"{prefix}_color_{suffix}.png",
+                "Displacement": f"{prefix}_height_{suffix}.png",
+                "Metallic": f"{prefix}_metalness_{suffix}.png",
+                "Normal": f"{prefix}_normal_gl_{suffix}.png",
+                "Roughness": f"{prefix}_roughness_{suffix}.png",
+            },
+        )
+
+
+class TestReplaceComponent(unittest.TestCase):
+    def test_replace(self):
+        self.assertEqual(replace_component("Wood_Gloss_2k.jpg", ["gloss"], "roughness"), "Wood_Roughness_2k.jpg")
+        self.assertEqual(replace_component("wood_nor_dx_1k.exr", ["dx", "directx"], "gl"), "wood_nor_gl_1k.exr")
+        self.assertEqual(replace_component("WoodNormalDX.png", ["dx"], "gl"), "WoodNormalGL.png")
+        self.assertEqual(replace_component("WoodGlossiness.png", ["gloss", "glossiness"], "rough"), "WoodRough.png")
+
+    def test_whole_components_only(self):
+        # 'gloss' inside 'glossy' isn't a component of its own
+        self.assertEqual(replace_component("glossy.png", ["gloss"], "rough"), "glossy_rough.png")
+
+    def test_extension(self):
+        self.assertEqual(replace_component("a_gloss.png", ["gloss"], "rough", extension=".exr"), "a_rough.exr")
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+import os
+
+
+# Size of the buffer reused while reading a file
+READ_CHUNK_SIZE = 1 << 20
+
+
+def warm_file(file_path):
+    """
+    Get the file at file_path into the OS page cache, returns its size.
+
+    The file is read sequentially into a small reused buffer, so no memory is kept per
+    file. It is really read rather than only advised with posix_fadvise(), which returns
+    at once, so the file is in the page cache when this returns.
+    """
+    with open(file_path, "rb", buffering=0) as file:
+        size = os.fstat(file.fileno()).st_size
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        buffer = bytearray(READ_CHUNK_SIZE)
+        while file.readinto(buffer):
+            pass
+    return size
+
+
+def is_read(future):
+    return future.done() and not future.cancelled() and future.exception() is None
+
+
+class SequencePrefetcher:
+    """
+    Reads the next frames of an image sequence ahead of the current one.
+
+    frame_files maps frame numbers to file paths. advance() is called with the frame
+    about to be shown. It counts a hit when the whole file of that frame had been
+    read ahead by then, so it was in the page cache, and a miss when its read hadn't
+    finished or wasn't queued. It then queues the reads of up to frames_ahead
+    following frames on the executor. Frames behind the current one are forgotten.
+    The frames read ahead and not shown yet never add up to more than budget bytes.
+    """
+
+    def __init__(self, frame_files, executor, frames_ahead=8, budget=512 << 20):
+        self.frame_files = frame_files
+        self.executor = executor
+        self.frames_ahead = frames_ahead
+        self.budget = budget
+        # frame -> Future returning the size of its file
+        self.reads = {}
+        # Size of the last file read, used to estimate the size of the next ones
+        self.frame_size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def read_bytes(self):
+        """Return the bytes read ahead, or estimated for reads that haven't finished."""
+        total = 0
+        for future in self.reads.values():
+            if is_read(future):
+                total += future.result()
+            else:
+                total += self.frame_size
+        return total
+
+    def read_frame(self, file_path):
+        size = warm_file(file_path)
+        self.frame_size = size
+        return size
+
+    def advance(self, frame):
+        if frame in self.frame_files:
+            future = self.reads.get(frame)
+            if future is not None and is_read(future):
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        for ahead in list(self.reads):
+            if not frame < ahead <= frame + self.frames_ahead:
+                self.reads.pop(ahead).cancel()
+
+        used = self.read_bytes()
+        for next_frame in range(frame + 1, frame + self.frames_ahead + 1):
+            file_path = self.frame_files.get(next_frame)
+            if file_path is None or next_frame in self.reads:
+                continue
+            if used + self.frame_size > self.budget:
+                break
+            self.reads[next_frame] = self.executor.submit(self.read_frame, file_path)
+            used += self.frame_size
+
+    def cancel(self):
+        for future in self.reads.values():
+            future.cancel()
+        self.reads.clear()
+
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
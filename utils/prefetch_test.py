@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor, wait
+from os import path
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == "__main__":
+    from prefetch import SequencePrefetcher, warm_file
+else:
+    from .prefetch import SequencePrefetcher, warm_file
+
+
+FRAME_SIZE = 1000
+
+
+class TestSequencePrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.frame_files = {}
+        for frame in range(1, 21):
+            file_path = path.join(self.temp_dir.name, f"frame_{frame:04}.exr")
+            with open(file_path, "wb") as file:
+                file.write(bytes(FRAME_SIZE))
+            self.frame_files[frame] = file_path
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.temp_dir.cleanup()
+
+    def finish_reads(self, prefetcher):
+        wait(prefetcher.reads.values())
+
+    def test_warm_file(self):
+        self.assertEqual(warm_file(self.frame_files[1]), FRAME_SIZE)
+
+    def test_reads_ahead(self):
+        prefetcher = SequencePrefetcher(self.frame_files, self.executor, frames_ahead=3)
+        prefetcher.advance(1)
+        self.assertEqual(sorted(prefetcher.reads), [2, 3, 4])
+        self.assertEqual((prefetcher.hits, prefetcher.misses), (0, 1))
+
+        self.finish_reads(prefetcher)
+        prefetcher.advance(2)
+        self.assertEqual(sorted(prefetcher.reads), [3, 4, 5])
+        self.assertEqual((prefetcher.hits, prefetcher.misses), (1, 1))
+
+    def test_jump(self):
+        prefetcher = SequencePrefetcher(self.frame_files, self.executor, frames_ahead=3)
+        prefetcher.advance(1)
+        self.finish_reads(prefetcher)
+        prefetcher.advance(10)
+        self.assertEqual(sorted(prefetcher.reads), [11, 12, 13])
+        self.assertEqual(prefetcher.misses, 2)
+
+    def test_end_of_sequence(self):
+        prefetcher = SequencePrefetcher(self.frame_files, self.executor, frames_ahead=5)
+        prefetcher.advance(18)
+        self.assertEqual(sorted(prefetcher.reads), [19, 20])
+
+    def test_budget(self):
+        prefetcher = SequencePrefetcher(
+            self.frame_files, self.executor, frames_ahead=8, budget=3 * FRAME_SIZE)
+        prefetcher.advance(1)
+        self.finish_reads(prefetcher)
+        # The frame size is known after the first reads
+        prefetcher.advance(2)
+        self.finish_reads(prefetcher)
+        self.assertLessEqual(prefetcher.read_bytes(), 3 * FRAME_SIZE)
+        self.assertEqual(sorted(prefetcher.reads), [3, 4, 5])
+
+    def test_missing_file(self):
+        frame_files = {1: self.frame_files[1], 2: path.join(self.temp_dir.name, "missing.exr")}
+        prefetcher = SequencePrefetcher(frame_files, self.executor)
+        prefetcher.advance(1)
+        self.finish_reads(prefetcher)
+        prefetcher.advance(2)
+        self.assertEqual((prefetcher.hits, prefetcher.misses), (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
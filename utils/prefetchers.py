@@ -0,0 +1,122 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+import bpy
+from bpy.app.handlers import persistent
+
+from .prefetch import SequencePrefetcher
+from .sequences import scan_sequences, sequence_of
+
+
+MAX_WORKERS = 4
+
+executor = None
+# (data collection, datablock name, node name) -> SequencePrefetcher of that image node
+prefetchers = {}
+
+
+def node_owner(context, node):
+    """Return the key that finds node again later, without keeping a reference to it."""
+    tree = node.id_data
+    if not tree.is_embedded_data:
+        return "node_groups", tree.name, node.name
+    # Embedded trees are the root tree of the edited datablock, like a material
+    owner = context.space_data.id
+    return owner.id_type.lower() + "s", owner.name, node.name
+
+
+def find_node(key):
+    collection, name, node_name = key
+    datablock = getattr(bpy.data, collection).get(name)
+    if datablock is None:
+        return None
+    tree = datablock if collection == "node_groups" else getattr(datablock, "node_tree", None)
+    return tree.nodes.get(node_name) if tree is not None else None
+
+
+def node_image_user(node):
+    # Compositor image nodes hold the frame settings themselves
+    return node.image_user if hasattr(node, "image_user") else node
+
+
+def image_frame(node, scene_frame):
+    """Return the frame of the image sequence shown by node at scene_frame, like Blender picks it."""
+    image_user = node_image_user(node)
+    frame = scene_frame - image_user.frame_start + 1
+    if image_user.use_cyclic and image_user.frame_duration:
+        frame = (frame - 1) % image_user.frame_duration + 1
+    frame = min(max(frame, 1), max(image_user.frame_duration, 1))
+    return frame + image_user.frame_offset
+
+
+def sequence_frame_files(image):
+    """Return {frame: file path} for the sequence of an image, or None."""
+    file_path = bpy.path.abspath(image.filepath, library=image.library)
+    directory, fname = path.split(path.normpath(file_path))
+    try:
+        sequence = sequence_of(scan_sequences(directory), fname)
+    except OSError:
+        return None
+    if sequence is None:
+        return None
+    return {frame: path.join(directory, name) for frame, name in zip(sequence.frames, sequence.files)}
+
+
+def get_prefetcher(context, node):
+    return prefetchers.get(node_owner(context, node))
+
+
+def start_prefetching(context, node, frames_ahead, budget):
+    """Attach a prefetcher to an image sequence node, returns it or None if its files aren't found."""
+    global executor
+    frame_files = sequence_frame_files(node.image)
+    if not frame_files:
+        return None
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="NWPrefetch")
+
+    stop_prefetching(context, node)
+    prefetcher = SequencePrefetcher(frame_files, executor, frames_ahead, budget)
+    prefetchers[node_owner(context, node)] = prefetcher
+    prefetcher.advance(image_frame(node, context.scene.frame_current))
+    return prefetcher
+
+
+def stop_prefetching(context, node):
+    prefetcher = prefetchers.pop(node_owner(context, node), None)
+    if prefetcher is not None:
+        prefetcher.cancel()
+
+
+@persistent
+def follow_frame(scene, depsgraph=None):
+    for key, prefetcher in list(prefetchers.items()):
+        node = find_node(key)
+        if node is None or node.image is None or node.image.source != 'SEQUENCE':
+            prefetchers.pop(key).cancel()
+            continue
+        prefetcher.advance(image_frame(node, scene.frame_current))
+
+
+@persistent
+def clear_prefetchers(*args):
+    for prefetcher in prefetchers.values():
+        prefetcher.cancel()
+    prefetchers.clear()
+
+
+def register():
+    bpy.app.handlers.frame_change_post.append(follow_frame)
+    bpy.app.handlers.load_post.append(clear_prefetchers)
+
+
+def unregister():
+    global executor
+    bpy.app.handlers.frame_change_post.remove(follow_frame)
+    bpy.app.handlers.load_post.remove(clear_prefetchers)
+    clear_prefetchers()
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from collections import Counter, defaultdict
+import re
+
+
+WORD = re.compile(r"[a-z0-9]+")
+# Query words shorter than this are looked up by prefix instead of by trigrams
+TRIGRAM_LENGTH = 3
+# Fraction of the trigrams of a query word that an entry must share to match it
+MIN_TRIGRAM_RATIO = 0.6
+
+
+def split_words(text):
+    """
+    Split text into lowercase words
+    'Mix Color (RGB)' -> ['mix', 'color', 'rgb']
+    """
+    return WORD.findall(text.lower())
+
+
+def trigrams(word):
+    """
+    Return the trigrams of a word, the first one marks its start
+    'mix' -> [' mi', 'mix']
+    """
+    word = " " + word
+    return [word[i:i + TRIGRAM_LENGTH] for i in range(len(word) - TRIGRAM_LENGTH + 1)]
+
+
+def word_score(query_word, words):
+    """Return how well query_word matches the best of words, 0 if it doesn't."""
+    best = 0
+    for word in words:
+        if word == query_word:
+            return 4
+        if word.startswith(query_word):
+            best = max(best, 3)
+        elif query_word in word:
+            best = max(best, 2)
+    return best
+
+
+class SearchIndex:
+    """
+    Fuzzy search over a fixed list of entries, built once and queried many times.
+
+    Every entry has a label, extra keywords such as aliases or menu paths, and a value
+    that is returned by search(). Query words of three letters or more are matched by
+    shared trigrams, so small typos still match, shorter ones by word prefix.
+    """
+
+    def __init__(self, entries):
+        self.labels = []
+        self.values = []
+        self.label_words = []
+        self.keyword_words = []
+        self.prefixes = defaultdict(set)
+        self.trigrams = defaultdict(set)
+
+        for index, (label, keywords, value) in enumerate(entries):
+            label_words = split_words(label)
+            keyword_words = [w for keyword in keywords for w in split_words(keyword)]
+            self.labels.append(label)
+            self.values.append(value)
+            self.label_words.append(label_words)
+            self.keyword_words.append(keyword_words)
+
+            for word in set(label_words + keyword_words):
+                for length in range(1, min(len(word), TRIGRAM_LENGTH - 1) + 1):
+                    self.prefixes[word[:length]].add(index)
+                for trigram in trigrams(word):
+                    self.trigrams[trigram].add(index)
+
+    def __len__(self):
+        return len(self.values)
+
+    def matches(self, query_word):
+        """Return the indices of the entries matching a single query word."""
+        if len(query_word) < TRIGRAM_LENGTH:
+            return self.prefixes.get(query_word, set())
+
+        query_trigrams = set(trigrams(query_word))
+        hits = Counter()
+        for trigram in query_trigrams:
+            hits.update(self.trigrams.get(trigram, ()))
+
+        min_hits = max(1, round(len(query_trigrams) * MIN_TRIGRAM_RATIO))
+        return {index for index, count in hits.items() if count >= min_hits}
+
+    def score(self, index, query_words, query):
+        label = " ".join(self.label_words[index])
+        score = 0
+        if label == query:
+            score += 100
+        elif label.startswith(query):
+            score += 50
+
+        for query_word in query_words:
+            # Matches in the label count more than matches in the keywords
+            label_score = word_score(query_word, self.label_words[index])
+            keyword_score = word_score(query_word, self.keyword_words[index])
+            score += max(2 * label_score, keyword_score, 1)
+        return score
+
+    def search(self, query, limit=None):
+        """Return the values of the entries matching every word of query, best matches first."""
+        query_words = split_words(query)
+        if not query_words:
+            return self.values[:limit]
+
+        candidates = None
+        for query_word in query_words:
+            matches = self.matches(query_word)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        query = " ".join(query_words)
+        ranked = sorted(
+            candidates,
+            key=lambda index: (-self.score(index, query_words, query), len(self.labels[index]), index))
+        return [self.values[index] for index in ranked[:limit]]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import unittest
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == "__main__":
+    from search import SearchIndex, split_words, trigrams
+else:
+    from .search import SearchIndex, split_words, trigrams
+
+
+def index_fixture():
+    return SearchIndex([
+        ("Math", ["Utilities", "Math"], "math"),
+        ("Add", ["Utilities", "Math", "Math"], "math_add"),
+        ("Mix", ["Utilities", "Math"], "mix"),
+        ("Mix Color", ["Utilities", "Color", "Blend"], "mix_color"),
+        ("Mix Vector", ["Utilities", "Vector"], "mix_vector"),
+        ("Color Ramp", ["Utilities", "Color"], "color_ramp"),
+        ("Mesh Boolean", ["Mesh", "Operations"], "mesh_boolean"),
+        ("Boolean Math", ["Utilities", "Math"], "boolean_math"),
+        ("Set Position", ["Geometry", "Write"], "set_position"),
+    ])
+
+
+class TestHelpers(unittest.TestCase):
+    def test_split_words(self):
+        self.assertEqual(split_words("Mix Color (RGB)"), ["mix", "color", "rgb"])
+        self.assertEqual(split_words("  "), [])
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams("mix"), [" mi", "mix"])
+        self.assertEqual(trigrams("ab"), [" ab"])
+
+
+class TestSearchIndex(unittest.TestCase):
+    def test_empty_query_keeps_order(self):
+        index = index_fixture()
+        self.assertEqual(index.search("", limit=2), ["math", "math_add"])
+        self.assertEqual(len(index.search("")), len(index))
+
+    def test_exact_label_first(self):
+        index = index_fixture()
+        self.assertEqual(index.search("mix")[0], "mix")
+        self.assertEqual(index.search("math")[0], "math")
+
+    def test_all_words_must_match(self):
+        index = index_fixture()
+        self.assertEqual(index.search("mix color"), ["mix_color"])
+        self.assertEqual(index.search("mix vec"), ["mix_vector"])
+
+    def test_short_words_match_prefixes(self):
+        index = index_fixture()
+        self.assertIn("set_position", index.search("se po"))
+        self.assertEqual(index.search("zz"), [])
+
+    def test_typo(self):
+        index = index_fixture()
+        self.assertEqual(sorted(index.search("boolen")), ["boolean_math", "mesh_boolean"])
+        self.assertEqual(index.search("mix colr"), ["mix_color"])
+
+    def test_keywords(self):
+        index = index_fixture()
+        self.assertEqual(index.search("blend"), ["mix_color"])
+        # Label matches rank before keyword matches
+        self.assertEqual(index.search("color")[:2], ["color_ramp", "mix_color"])
+
+    def test_limit(self):
+        index = index_fixture()
+        self.assertEqual(len(index.search("utilities", limit=3)), 3)
+
+    def test_no_match(self):
+        index = index_fixture()
+        self.assertEqual(index.search("volume"), [])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
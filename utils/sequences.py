@@ -0,0 +1,246 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from dataclasses import dataclass
+import os
+from os import path
+import re
+
+
+# The frame number is the last run of digits before the extension
+FRAME_NUMBER = re.compile(r"(\d+)$")
+
+# Tiles are numbered from 1001, ten per row of the UV grid
+UDIM_FIRST = 1001
+UDIM_LAST = 1999
+UDIM_TOKEN = "<UDIM>"
+
+# directory -> (its modification time in ns, its sequences), only the last scanned one is kept
+scanned_directories = {}
+
+
+@dataclass(frozen=True, slots=True)
+class ImageSequence:
+    """Files that only differ in their frame number, sorted by frame."""
+    prefix: str
+    padding: int
+    extension: str
+    frames: tuple
+    files: tuple
+    # Frames that also exist with a different number of digits, like 'a_01.png' and 'a_001.png'
+    duplicate_frames: tuple = ()
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def first(self):
+        return self.frames[0]
+
+    @property
+    def last(self):
+        return self.frames[-1]
+
+    @property
+    def name_with_hashes(self):
+        """'render_###.png' for frames 'render_001.png' to 'render_250.png'"""
+        return self.prefix + "#" * self.padding + self.extension
+
+    def frame_ranges(self):
+        """
+        Return the runs of consecutive frames as (first, last) pairs
+        (1, 2, 3, 7, 8) -> [(1, 3), (7, 8)]
+        """
+        ranges = []
+        start = previous = self.frames[0]
+        for frame in self.frames[1:]:
+            if frame != previous + 1:
+                ranges.append((start, previous))
+                start = frame
+            previous = frame
+        ranges.append((start, previous))
+        return ranges
+
+    def gaps(self):
+        """
+        Return the runs of missing frames between the first and the last one as (first, last) pairs
+        (1, 2, 3, 7, 8) -> [(4, 6)]
+        """
+        ranges = self.frame_ranges()
+        return [(end + 1, start - 1) for (_start, end), (start, _end) in zip(ranges, ranges[1:])]
+
+    def describe(self):
+        """'render_###.png: 1-250 (248 frames), missing 17, 90-91'"""
+        text = f"{self.name_with_hashes}: {self.first}-{self.last} ({len(self)} frames)"
+        gaps = self.gaps()
+        if gaps:
+            text += ", missing " + ", ".join(
+                str(first) if first == last else f"{first}-{last}" for first, last in gaps)
+        return text
+
+
+@dataclass(frozen=True, slots=True)
+class TileSet:
+    """Files holding the UDIM tiles of one texture, sorted by tile number."""
+    prefix: str
+    extension: str
+    tiles: tuple
+    files: tuple
+
+    def __len__(self):
+        return len(self.tiles)
+
+    @property
+    def name_with_token(self):
+        """'albedo.<UDIM>.png' for tiles 'albedo.1001.png' to 'albedo.1004.png'"""
+        return self.prefix + UDIM_TOKEN + self.extension
+
+    def describe(self):
+        """'albedo.<UDIM>.png: 4 tiles, 1001-1004'"""
+        return f"{self.name_with_token}: {len(self)} tiles, {self.tiles[0]}-{self.tiles[-1]}"
+
+
+def split_frame_number(fname):
+    """
+    Return (prefix, frame number digits, extension) of a file name, or None without a frame number
+    'render_0042.png' -> ('render_', '0042', '.png')
+    """
+    stem, extension = path.splitext(fname)
+    match = FRAME_NUMBER.search(stem)
+    if match is None:
+        return None
+    return stem[:match.start()], match.group(1), extension
+
+
+def find_sequences(file_names, min_frames=1):
+    """
+    Group file names into image sequences by prefix, frame number padding and extension.
+
+    Each file name is looked at once. Returns the sequences with at least min_frames
+    frames, sorted by name.
+    """
+    groups = {}
+    for fname in file_names:
+        parts = split_frame_number(fname)
+        if parts is None:
+            continue
+        prefix, digits, extension = parts
+        groups.setdefault((prefix, len(digits), extension), []).append((int(digits), fname))
+
+    frame_sets = {key: {frame for frame, _fname in frames} for key, frames in groups.items()}
+    # Paddings used per (prefix, extension), to find the frames present with several of them
+    paddings = {}
+    for prefix, padding, extension in groups:
+        paddings.setdefault((prefix, extension), []).append(padding)
+
+    sequences = []
+    for (prefix, padding, extension), frames in groups.items():
+        if len(frames) < min_frames:
+            continue
+        frames.sort()
+        frame_set = frame_sets[prefix, padding, extension]
+        duplicates = set()
+        for other in paddings[prefix, extension]:
+            if other != padding:
+                duplicates |= frame_set & frame_sets[prefix, other, extension]
+        sequences.append(ImageSequence(
+            prefix=prefix,
+            padding=padding,
+            extension=extension,
+            frames=tuple(frame for frame, _fname in frames),
+            files=tuple(fname for _frame, fname in frames),
+            duplicate_frames=tuple(sorted(duplicates)),
+        ))
+
+    sequences.sort(key=lambda sequence: (sequence.prefix, sequence.extension, sequence.padding))
+    return sequences
+
+
+def split_udim_tile(fname):
+    """
+    Return (prefix, tile number, extension) of a file name, or None if it isn't a UDIM tile
+    'albedo.1002.png' -> ('albedo.', 1002, '.png')
+    """
+    parts = split_frame_number(fname)
+    if parts is None:
+        return None
+    prefix, digits, extension = parts
+    # The number must be set apart, 'albedo_1001.png' is a tile but 'v1001.png' isn't
+    if len(digits) != 4 or not prefix.endswith((".", "_")) or not UDIM_FIRST <= int(digits) <= UDIM_LAST:
+        return None
+    return prefix, int(digits), extension
+
+
+def find_tile_sets(file_names, min_tiles=2):
+    """
+    Group file names into UDIM tile sets by prefix and extension.
+
+    A single 'name.1001.png' file can't be told apart from other numbered files,
+    so sets need at least min_tiles tiles. Returns the sets sorted by name.
+    """
+    groups = {}
+    for fname in file_names:
+        parts = split_udim_tile(fname)
+        if parts is not None:
+            prefix, tile, extension = parts
+            groups.setdefault((prefix, extension), []).append((tile, fname))
+
+    tile_sets = []
+    for (prefix, extension), tiles in sorted(groups.items()):
+        if len(tiles) < min_tiles:
+            continue
+        tiles.sort()
+        tile_sets.append(TileSet(
+            prefix=prefix,
+            extension=extension,
+            tiles=tuple(tile for tile, _fname in tiles),
+            files=tuple(fname for _tile, fname in tiles),
+        ))
+    return tile_sets
+
+
+def udim_token_path(filepath):
+    """
+    Return filepath with its tile number replaced by the UDIM token, the way Blender
+    stores the path of tiled images
+    '//tex/albedo.1001.png' -> '//tex/albedo.<UDIM>.png'
+    """
+    directory, fname = path.split(filepath)
+    parts = split_udim_tile(fname)
+    if parts is None:
+        return filepath
+    prefix, _tile, extension = parts
+    return path.join(directory, prefix + UDIM_TOKEN + extension)
+
+
+def scan_sequences(directory, min_frames=1):
+    """Find the image sequences of a directory with a single os.scandir() pass."""
+    with os.scandir(directory) as entries:
+        file_names = [entry.name for entry in entries if entry.is_file()]
+    return find_sequences(file_names, min_frames)
+
+
+def sequence_of(sequences, fname):
+    """Return the sequence fname belongs to, or None."""
+    for sequence in sequences:
+        if fname in sequence.files:
+            return sequence
+    return None
+
+
+def directory_sequences(directory):
+    """
+    Return the image sequences of a directory, scanning it again only after it changed.
+
+    File browser sidebars call this on every redraw, while the user looks at one directory.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return []
+
+    scanned = scanned_directories.get(directory)
+    if scanned is None or scanned[0] != mtime_ns:
+        scanned_directories.clear()
+        scanned = mtime_ns, scan_sequences(directory)
+        scanned_directories[directory] = scanned
+    return scanned[1]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+# pylint: disable=missing-function-docstring
+# pylint: disable=missing-class-docstring
+
+import os
+import tempfile
+import time
+import unittest
+from os import path
+
+# XXX Not really nice, but that hack is needed to allow execution of that test
+#     from both automated CTest and by directly running the file manually.
+if __name__ == "__main__":
+    from sequences import (find_sequences, find_tile_sets, scan_sequences, sequence_of, split_frame_number,
+                           udim_token_path)
+else:
+    from .sequences import (find_sequences, find_tile_sets, scan_sequences, sequence_of, split_frame_number,
+                            udim_token_path)
+
+
+class TestSplitFrameNumber(unittest.TestCase):
+    def test_split(self):
+        self.assertEqual(split_frame_number("render_0042.png"), ("render_", "0042", ".png"))
+        self.assertEqual(split_frame_number("shot2.v3.0001.exr"), ("shot2.v3.", "0001", ".exr"))
+        self.assertEqual(split_frame_number("12.jpg"), ("", "12", ".jpg"))
+
+    def test_no_frame_number(self):
+        self.assertIsNone(split_frame_number("render.png"))
+        self.assertIsNone(split_frame_number("render_2k.png"))
+
+
+class TestFindSequences(unittest.TestCase):
+    def test_interleaved(self):
+        files = [f"beauty_{i:04}.exr" for i in range(1, 11)]
+        files += [f"depth_{i:04}.exr" for i in range(1, 6)]
+        files += [f"beauty_{i:04}.png" for i in range(3, 5)]
+        files += ["notes.txt", "thumbnail.png"]
+        files.reverse()
+
+        sequences = find_sequences(files)
+        self.assertEqual(
+            [(s.name_with_hashes, s.first, s.last, len(s)) for s in sequences],
+            [
+                ("beauty_####.exr", 1, 10, 10),
+                ("beauty_####.png", 3, 4, 2),
+                ("depth_####.exr", 1, 5, 5),
+            ])
+        self.assertEqual(sequences[0].files[0], "beauty_0001.exr")
+
+    def test_gaps(self):
+        files = [f"frame{i:03}.png" for i in (1, 2, 3, 7, 8, 10)]
+        sequence, = find_sequences(files)
+        self.assertEqual(sequence.frame_ranges(), [(1, 3), (7, 8), (10, 10)])
+        self.assertEqual(sequence.gaps(), [(4, 6), (9, 9)])
+        self.assertEqual(sequence.describe(), "frame###.png: 1-10 (6 frames), missing 4-6, 9")
+
+    def test_duplicate_padding(self):
+        files = ["a_01.png", "a_02.png", "a_001.png", "a_002.png", "a_003.png"]
+        short, long = find_sequences(files)
+        self.assertEqual((short.padding, short.duplicate_frames), (2, (1, 2)))
+        self.assertEqual((long.padding, long.duplicate_frames), (3, (1, 2)))
+
+    def test_min_frames(self):
+        files = ["shot_001.png", "shot_002.png", "logo_1.png"]
+        self.assertEqual([s.prefix for s in find_sequences(files, min_frames=2)], ["shot_"])
+
+    def test_sequence_of(self):
+        sequences = find_sequences(["a_1.png", "a_2.png", "b_1.png"])
+        self.assertEqual(sequence_of(sequences, "b_1.png").prefix, "b_")
+        self.assertIsNone(sequence_of(sequences, "c_1.png"))
+
+
+class TestFindTileSets(unittest.TestCase):
+    def test_tile_sets(self):
+        file_names = ["albedo.1002.png", "rough_1001.png", "albedo.1001.png", "rough_1011.png",
+                      "albedo.1001.exr", "render_1001.png", "v1001.png", "v1002.png", "scan.0999.png", "scan.1000.png"]
+        tile_sets = find_tile_sets(file_names)
+        self.assertEqual([t.name_with_token for t in tile_sets], ["albedo.<UDIM>.png", "rough_<UDIM>.png"])
+        self.assertEqual(tile_sets[0].files, ("albedo.1001.png", "albedo.1002.png"))
+        self.assertEqual(tile_sets[1].tiles, (1001, 1011))
+        self.assertEqual(tile_sets[1].describe(), "rough_<UDIM>.png: 2 tiles, 1001-1011")
+
+    def test_min_tiles(self):
+        self.assertEqual(len(find_tile_sets(["albedo.1001.png"], min_tiles=1)), 1)
+
+    def test_token_path(self):
+        self.assertEqual(udim_token_path(path.join("textures", "albedo.1003.png")),
+                         path.join("textures", "albedo.<UDIM>.png"))
+        self.assertEqual(udim_token_path("albedo.<UDIM>.png"), "albedo.<UDIM>.png")
+        self.assertEqual(udim_token_path("albedo_2k.png"), "albedo_2k.png")
+
+
+class TestScanSequences(unittest.TestCase):
+    def test_scan(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(1, 4):
+                with open(path.join(directory, f"shot_{i:03}.png"), "w", encoding="utf-8"):
+                    pass
+            os.mkdir(path.join(directory, "shot_004.png"))
+
+            sequence, = scan_sequences(directory)
+            self.assertEqual(sequence.frames, (1, 2, 3))
+
+
+class BenchmarkFindSequences(unittest.TestCase):
+    def test_interleaved_100k(self):
+        files = [f"{layer}_{i:05}.exr" for i in range(1, 25001) for layer in ("beauty", "depth", "normal", "mist")]
+
+        start = time.perf_counter()
+        sequences = find_sequences(files)
+        print(f"\n100k interleaved frames: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        self.assertEqual([len(s) for s in sequences], [25000] * 4)
+        self.assertEqual(sequences[0].gaps(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
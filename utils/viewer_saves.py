@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import bpy
+
+from .image_writers import write_image
+
+
+# Snapshots waiting to be written hold a full float copy of the viewer each
+MAX_QUEUED = 8
+
+# One worker, so snapshots are written in the order they were taken
+executor = None
+# (file path, Future) of the snapshots not reported yet
+pending = []
+# Message of the last snapshot that couldn't be written, shown until the next save
+last_error = None
+
+
+def uses_plain_srgb(scene):
+    """Return whether the scene shows images through the sRGB curve alone, like encode_png() writes them."""
+    view = scene.view_settings
+    return (scene.display_settings.display_device == 'sRGB' and view.view_transform == 'Standard'
+            and view.look == 'None' and view.exposure == 0.0 and view.gamma == 1.0 and not view.use_curve_mapping)
+
+
+def queue_save(filepath, pixels, width, height, **options):
+    """Write a copy of the viewer pixels to filepath on the worker thread."""
+    global executor, last_error
+    last_error = None
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="NWSaveViewer")
+    pending.append((filepath, executor.submit(write_image, filepath, pixels, width, height, **options)))
+    if not bpy.app.timers.is_registered(report_saves):
+        bpy.app.timers.register(report_saves, first_interval=0.2)
+
+
+def queued_count():
+    return len(pending)
+
+
+def report_saves():
+    """Timer callback reporting the snapshots written since the last call."""
+    global last_error
+    done = [(filepath, future) for filepath, future in pending if future.done()]
+    for filepath, future in done:
+        pending.remove((filepath, future))
+        error = future.exception()
+        if error is None:
+            print(f"Saved viewer image to {filepath}")
+        else:
+            last_error = f"Couldn't save {os.path.basename(filepath)}: {error}"
+            print(f"Saving viewer image to {filepath} failed: {error}")
+
+    if done:
+        for window in bpy.context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'NODE_EDITOR':
+                    area.tag_redraw()
+    return 0.2 if pending else None
+
+
+def unregister():
+    global executor, last_error
+    if executor is not None:
+        # Snapshots already taken are still written
+        executor.shutdown(wait=True)
+        executor = None
+    pending.clear()
+    last_error = None
+    if bpy.app.timers.is_registered(report_saves):
+        bpy.app.timers.unregister(report_saves)
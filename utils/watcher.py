@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from os import path
+
+import bpy
+
+from . import images
+
+
+# Threads running the stat calls, the main thread only compares their results
+MAX_WORKERS = 4
+
+executor = None
+# Futures of the directories being checked in the current round, None between rounds
+pending = None
+# Seconds between the end of a round and the start of the next one
+poll_interval = 1.0
+
+
+def stat_files(file_paths):
+    """Return {path: (mtime in ns, size)} for the files of one directory, missing ones are left out."""
+    stats = {}
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        stats[file_path] = stat.st_mtime_ns, stat.st_size
+    return stats
+
+
+def watched_images():
+    """Return {directory: {file path: [image ids]}} for the used single file images."""
+    directories = {}
+    for image in bpy.data.images:
+        if image.users == 0 or image.source != 'FILE' or image.is_dirty:
+            continue
+        file_path = images.image_file_path(image)
+        if file_path is None:
+            continue
+        files = directories.setdefault(path.dirname(file_path), {})
+        files.setdefault(file_path, []).append(images.image_id(image))
+    return directories
+
+
+def start_round():
+    global pending
+    # One task per directory, so hundreds of textures only need a few tasks
+    pending = [
+        (files, executor.submit(stat_files, list(files)))
+        for files in watched_images().values()]
+
+
+def finish_round():
+    """Reload the images whose files changed, returns them."""
+    global pending
+    changed = []
+    for files, future in pending:
+        for file_path, stat in future.result().items():
+            for key in files[file_path]:
+                image = bpy.data.images.get(key)
+                if image is None or image.is_dirty:
+                    continue
+                recorded = images.image_file_stats.get(key)
+                images.image_file_stats[key] = stat
+                # Images seen for the first time only get their state recorded
+                if recorded is not None and recorded != stat:
+                    changed.append(image)
+    pending = None
+
+    for image in changed:
+        image.reload()
+    return changed
+
+
+def tag_users(changed):
+    changed = set(image.as_pointer() for image in changed)
+    for tree in images.all_node_trees():
+        if any(image.as_pointer() in changed for image in images.node_images(tree.nodes)):
+            tree.update_tag()
+
+    for window in bpy.context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type in {'NODE_EDITOR', 'IMAGE_EDITOR', 'VIEW_3D'}:
+                area.tag_redraw()
+
+
+def poll_images():
+    """Timer callback, it never waits for the stat calls to finish."""
+    if executor is None:
+        return None
+
+    if pending is None:
+        start_round()
+        return 0.1
+    if not all(future.done() for _files, future in pending):
+        return 0.1
+
+    changed = finish_round()
+    if changed:
+        print(f"Reloaded {', '.join(image.name for image in changed)}")
+        tag_users(changed)
+    return poll_interval
+
+
+def is_running():
+    return executor is not None
+
+
+def start(interval):
+    global executor, poll_interval
+    poll_interval = interval
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="NWImageWatcher")
+        bpy.app.timers.register(poll_images, first_interval=interval, persistent=True)
+
+
+def stop():
+    global executor, pending
+    if executor is None:
+        return
+    if bpy.app.timers.is_registered(poll_images):
+        bpy.app.timers.unregister(poll_images)
+    executor.shutdown(wait=False, cancel_futures=True)
+    executor = None
+    pending = None